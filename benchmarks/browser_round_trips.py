@@ -0,0 +1,145 @@
+# benchmarks/browser_round_trips.py
+"""
+browser_round_trips.py
+
+WebDriver round trips per turn of the ChatGPT backend, counted against a
+stand-in driver that records every command it receives and simulates a page
+whose reply takes --generation seconds. Time runs on a virtual clock, so the
+fixed sleeps and polling of the element-by-element sequence cost nothing to
+measure.
+
+"element by element" replays the sequence every turn used to cost: locate
+the prompt, clear it, set its value, press Enter twice, sleep 3 s, poll for
+the turn action buttons, locate the reply and read its textContent. "composite
+scripts" runs the backend's own steps: SUBMIT_PROMPT_JS and AWAIT_RESPONSE_JS,
+one execute_async_script each. The reported time per turn adds --rtt per
+round trip to the time spent sleeping and waiting.
+
+Run from the project root:
+
+    python -m benchmarks.browser_round_trips --turns 20 --generation 5 --rtt 0.004
+"""
+import argparse
+import math
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from src.backends.backend_setup.chatgpt_scripts import AWAIT_RESPONSE_JS, SUBMIT_PROMPT_JS
+from src.backends.backend_setup.openai import ChatGPT, Element
+
+LEGACY_FIXED_SLEEP = 3.0  # retrieve_response slept this long before polling
+
+
+class VirtualClock:
+    """Stands in for the `time` module of WebDriverWait."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+class CountingDriver:
+    """A WebDriver stand-in that counts commands and finishes a reply `generation` seconds after it is submitted."""
+
+    def __init__(self, clock: VirtualClock, generation: float):
+        self.clock = clock
+        self.generation = generation
+        self.calls: Counter = Counter()
+        self.other_references = 0
+        self._done_at = math.inf
+
+    def submit(self):
+        self._done_at = self.clock.now + self.generation
+
+    def find_element(self, by, value):
+        self.calls["find_element"] += 1
+        if value == Element.TXT_RESPONSE_ITEMS.value and self.clock.now < self._done_at:
+            raise NoSuchElementException(value)
+        return CountingElement(self)
+
+    def execute_script(self, script, *args):
+        self.calls["execute_script"] += 1
+
+    def execute_async_script(self, script, *args):
+        self.calls["execute_async_script"] += 1
+        if script == SUBMIT_PROMPT_JS:
+            self.submit()
+            return {"ok": True}
+        if script == AWAIT_RESPONSE_JS:
+            self.clock.now = max(self.clock.now, self._done_at)  # the page calls back when the turn finishes
+            return {"text": "reply"}
+        raise ValueError("Unknown script")
+
+
+class CountingElement:
+    def __init__(self, driver: CountingDriver):
+        self.driver = driver
+
+    def clear(self):
+        self.driver.calls["clear"] += 1
+
+    def send_keys(self, keys):
+        self.driver.calls["send_keys"] += 1
+        if keys.endswith(Keys.ENTER):
+            self.driver.submit()
+
+    def get_attribute(self, name):
+        self.driver.calls["get_attribute"] += 1
+        return "reply"
+
+
+def element_by_element_turn(driver: CountingDriver, clock: VirtualClock, text: str) -> str:
+    prompt = WebDriverWait(driver, timeout=20).until(EC.presence_of_element_located((By.XPATH, Element.TXTFLD_PROMPT.value)))
+    prompt.clear()
+    driver.execute_script("arguments[0].value = arguments[1];", prompt, text)
+    prompt.send_keys(Keys.ENTER)
+    prompt.send_keys(Keys.ENTER)
+    clock.sleep(LEGACY_FIXED_SLEEP)
+    WebDriverWait(driver, timeout=100).until(EC.presence_of_element_located((By.XPATH, Element.TXT_RESPONSE_ITEMS.value)))
+    block = WebDriverWait(driver, timeout=100).until(EC.presence_of_element_located((By.XPATH, Element.TXT_RESPONSE_BLOCK.value)))
+    return block.get_attribute('textContent')
+
+
+def composite_turn(chatgpt: ChatGPT, driver: CountingDriver, text: str) -> str:
+    chatgpt._submit_prompt(driver, text)
+    return chatgpt._await_response(driver)
+
+
+def measure(name: str, turn, driver: CountingDriver, clock: VirtualClock, args):
+    start = clock.now
+    for i in range(args.turns):
+        turn(f"message {i}")
+    round_trips = sum(driver.calls.values()) / args.turns
+    seconds = (clock.now - start) / args.turns + round_trips * args.rtt
+    calls = ", ".join(f"{call} {count / args.turns:g}" for call, count in sorted(driver.calls.items()))
+    print(f"{name:<20} {round_trips:6.1f} round trips/turn  {seconds:7.3f} s/turn  ({calls})")
+
+
+def run(args):
+    clock = VirtualClock()
+    with patch("selenium.webdriver.support.wait.time", clock):
+        legacy = CountingDriver(clock, args.generation)
+        measure("element by element", lambda text: element_by_element_turn(legacy, clock, text), legacy, clock, args)
+        composite = CountingDriver(clock, args.generation)
+        chatgpt = ChatGPT(None, MagicMock(), driver=composite, path="chrome")
+        measure("composite scripts", lambda text: composite_turn(chatgpt, composite, text), composite, clock, args)
+    print(f"generation {args.generation:g} s, {args.rtt * 1000:g} ms per round trip")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Count WebDriver round trips per ChatGPT turn.")
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--generation", type=float, default=5.0, help="seconds the page takes to finish a reply")
+    parser.add_argument("--rtt", type=float, default=0.004, help="seconds per WebDriver round trip")
+    run(parser.parse_args())
@@ -0,0 +1,96 @@
+# benchmarks/chat_backend_benchmark.py
+"""
+chat_backend_benchmark.py
+
+Per-turn latency of the chat-completions backend against a local
+MockChatServer (or a real endpoint with --base-url): ChatCompletionsService
+over its pooled keep-alive session, against the same turns sent over a new
+connection each, and the time to the first token of streamed turns. Reports
+p50/p99 per turn next to the fixed sleep the Selenium ChatGPT backend spends
+in every turn before it even looks for the reply, which cannot be measured
+without a browser.
+
+Run from the project root:
+
+    python -m benchmarks.chat_backend_benchmark --turns 200 --latency 0.02 --token-delay 0.02
+"""
+import argparse
+import statistics
+import time
+from unittest.mock import MagicMock
+
+import requests
+
+from src.backends.chat_completions import ChatCompletionsService
+from src.mock_server.chat_server import MockChatServer
+
+SELENIUM_FIXED_SLEEP = 3.0  # ChatGPT.retrieve_response sleeps this long per turn
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(name: str, samples: list[float]):
+    print(f"{name:<18} n={len(samples):<5} p50={percentile(samples, 0.50) * 1000:8.2f} ms  "
+          f"p99={percentile(samples, 0.99) * 1000:8.2f} ms  mean={statistics.fmean(samples) * 1000:8.2f} ms")
+
+
+def timed(action) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def run(args):
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = MockChatServer(latency=args.latency, token_delay=args.token_delay)
+        base_url = server.start()
+    state = MagicMock()
+    state.is_state.return_value = False
+    service = ChatCompletionsService(MagicMock(), state, base_url=base_url, model=args.model,
+                                     api_key=args.api_key, max_history=args.history, stream=False)
+    try:
+        service.open()
+        pooled = [timed(lambda: service.query(f"message {i}")) for i in range(args.turns)]
+        service.stream = True
+        streamed, first_tokens = [], []
+        for i in range(args.turns):
+            streamed.append(timed(lambda: service.query(f"message {i}")))
+            first_tokens.append(service.first_token_latency)
+        headers = {"Connection": "close"}
+        if args.api_key:
+            headers["Authorization"] = f"Bearer {args.api_key}"
+
+        def fresh_turn(i: int):
+            body = {"model": args.model, "messages": [{"role": "user", "content": f"message {i}"}]}
+            requests.post(f"{base_url}/chat/completions", json=body, headers=headers, timeout=60).raise_for_status()
+
+        fresh = [timed(lambda: fresh_turn(i)) for i in range(args.turns)]
+        report("pooled session", pooled)
+        report("new connection", fresh)
+        report("streamed turn", streamed)
+        report("first token", first_tokens)
+        print(f"{'selenium floor':<18} {SELENIUM_FIXED_SLEEP * 1000:8.2f} ms of fixed sleep per turn, "
+              f"before WebDriver round trips")
+        if server is not None:
+            print(f"server accepted {server.stats()['connections']} connections")
+    finally:
+        service.close()
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the chat-completions backend per turn.")
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the mock server adds per completion")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between words the mock server streams")
+    parser.add_argument("--history", type=int, default=8, help="messages of history sent per turn")
+    parser.add_argument("--base-url", default=None, help="a real endpoint instead of the mock server")
+    parser.add_argument("--model", default="mock-gpt")
+    parser.add_argument("--api-key", default=None)
+    run(parser.parse_args())
@@ -0,0 +1,59 @@
+# benchmarks/sentiment_benchmark.py
+"""
+sentiment_benchmark.py
+
+Benchmark of the sentiment backends on a replayed transcript: nltk's VADER
+scoring message by message against the LexiconSentimentEngine scoring the
+whole transcript in one batch. Reports messages per second for each and the
+largest compound score difference.
+
+Run from the project root:
+
+    python -m benchmarks.sentiment_benchmark --messages 50000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.mediator_manager.lexicon_engine import LexiconSentimentEngine
+from src.mediator_manager.sentiment import load_vader
+
+PHRASES = [
+    "I love this", "this is not good", "you are really helpful", "I HATE waiting", "but the answer was great",
+    "kind of boring", "never so happy", "at least it works", "why would you say that??", "thanks!!",
+    "I don't think that's funny", "what a terrible day", "sure", "absolutely fantastic :)", "meh",
+]
+
+
+def transcript(rng: random.Random, count: int) -> list[str]:
+    return [" ".join(rng.choices(PHRASES, k=rng.randint(1, 4))) for _ in range(count)]
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    messages = transcript(rng, args.messages)
+    vader = load_vader()
+    start = time.perf_counter()
+    engine = LexiconSentimentEngine.from_vader(vader)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = np.array([vader.polarity_scores(message)["compound"] for message in messages])
+    vader_time = time.perf_counter() - start
+    start = time.perf_counter()
+    scores = engine.compound_batch(messages)
+    engine_time = time.perf_counter() - start
+
+    print(f"compile   {compile_time * 1000:8.1f} ms")
+    print(f"vader     {len(messages) / vader_time:10.0f} messages/s")
+    print(f"lexicon   {len(messages) / engine_time:10.0f} messages/s  ({vader_time / engine_time:.1f}x)")
+    print(f"max |compound difference| = {np.abs(scores - expected).max():.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the sentiment backends.")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    run(parser.parse_args())
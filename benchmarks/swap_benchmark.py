@@ -0,0 +1,106 @@
+# benchmarks/swap_benchmark.py
+"""
+swap_benchmark.py
+
+End-to-end benchmark of the mediator swap path: NetworkHandler fetches a
+mediator from a MockMediatorServer (or a real server with --endpoint), the
+MediatorManagementModule decodes and attaches it. Reports p50/p99 swap
+latency and swap throughput, plus the user data upload round trip.
+
+Run from the project root:
+
+    python -m benchmarks.swap_benchmark --swaps 200 --concurrency 4 --hidden-nodes 64 --latency 0.01
+    python -m benchmarks.swap_benchmark --json-only --no-cache   # old server, no conditional fetches
+"""
+import argparse
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from src.interfaces.data_models import UserData
+from src.mediator_manager.manager import MediatorManagementModule
+from src.mock_server.server import MockMediatorServer
+from src.network_handler.handler import NetworkHandler
+from src.signals.mediator_signal_manager import MediatorSignalManager
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(name: str, samples: list[float], elapsed: float):
+    print(f"{name:<12} n={len(samples):<6} p50={percentile(samples, 0.50) * 1000:8.2f} ms  "
+          f"p99={percentile(samples, 0.99) * 1000:8.2f} ms  "
+          f"mean={statistics.fmean(samples) * 1000:8.2f} ms  throughput={len(samples) / elapsed:8.1f}/s")
+
+
+def timed(action) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def run(args):
+    server = None
+    endpoint = args.endpoint
+    if endpoint is None:
+        server = MockMediatorServer(population=args.population, hidden_nodes=args.hidden_nodes,
+                                    latency=args.latency, binary_frames=not args.json_only)
+        endpoint = server.start()
+
+    handler = NetworkHandler()
+    handler.configure({
+        "endpoint": endpoint,
+        "max_workers": args.concurrency,
+        "mediator_cache": {"directory": args.cache_dir, "max_etags": 0 if args.no_cache else 16},
+    })
+    handler.start()
+    manager = MediatorManagementModule(SimpleNamespace(mediator_signals=MediatorSignalManager()))
+    manager.attach_mediator_cache(handler.mediator_cache)
+    user_data = UserData(genome_id=0, time_since_startup=0.0, user_rating=0)
+
+    def swap():
+        mediator_data = handler.fetch_mediator(user_data)
+        if mediator_data is None:
+            raise RuntimeError("Swap failed")
+        manager.set_mediator(manager.decode_mediator(mediator_data))
+
+    def upload():
+        handler.send_data(user_data.model_dump())
+
+    try:
+        for _ in range(args.warmup):
+            swap()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            start = time.perf_counter()
+            swaps = list(pool.map(lambda _: timed(swap), range(args.swaps)))
+            report("swap", swaps, time.perf_counter() - start)
+            start = time.perf_counter()
+            uploads = list(pool.map(lambda _: timed(upload), range(args.swaps)))
+            report("user_data", uploads, time.perf_counter() - start)
+        print(f"cache: {handler.mediator_cache.stats()}")
+        if server is not None:
+            print(f"server: {server.stats()}")
+    finally:
+        handler.stop()
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the mediator swap path.")
+    parser.add_argument("--endpoint", help="benchmark a running server instead of a local mock")
+    parser.add_argument("--swaps", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--population", type=int, default=8)
+    parser.add_argument("--hidden-nodes", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the mock server adds to every POST")
+    parser.add_argument("--json-only", action="store_true", help="mock an old server without binary frames")
+    parser.add_argument("--no-cache", action="store_true", help="never send If-None-Match")
+    parser.add_argument("--cache-dir", default="bench_mediator_cache")
+    logging.basicConfig(level=logging.WARNING)
+    run(parser.parse_args())
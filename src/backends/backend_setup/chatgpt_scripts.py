@@ -0,0 +1,96 @@
+# src/backends/backend_setup/chatgpt_scripts.py
+"""
+chatgpt_scripts.py
+
+This module contains the JavaScript the `ChatGPT` backend injects into the
+chat page, so that waiting for a reply is driven by the page instead of by
+fixed sleeps and WebDriver polling, and so that every logical step of a
+turn costs a single WebDriver round trip instead of one per element lookup,
+keystroke and attribute read.
+
+`RESPONSE_OBSERVER_JS` is run once per page load with `execute_script`. It
+installs `window.__mediatorResponses`, a MutationObserver on the page that
+re-checks, at most once per task, whether the assistant turn started after
+the last `arm()` has finished: a new assistant message exists and the turn
+action buttons, which ChatGPT only renders once generation stops, are
+present. `AWAIT_RESPONSE_JS` is run with `execute_async_script` and calls
+back with `{"text": ...}` the moment that happens, or with `{"error": ...}`
+when it times out or the observer is missing after a reload.
+
+`SUBMIT_PROMPT_JS` is the other half of a turn, also one
+`execute_async_script`: it waits in the page for the prompt field, sets its
+value the way React expects (native setter plus an `input` event), arms the
+observer and submits with the send button, or Enter if the button is
+missing or disabled.
+"""
+
+RESPONSE_OBSERVER_JS = """
+if (window.__mediatorResponses) { return false; }
+const messagesXPath = arguments[0], doneXPath = arguments[1];
+const evaluate = (xpath, type) => document.evaluate(xpath, document, null, type, null);
+const count = () => evaluate('count(' + messagesXPath + ')', XPathResult.NUMBER_TYPE).numberValue;
+const first = (xpath) => evaluate(xpath, XPathResult.FIRST_ORDERED_NODE_TYPE).singleNodeValue;
+const state = {baseline: count(), waiters: [], scheduled: false};
+
+function check() {
+    state.scheduled = false;
+    if (!state.waiters.length || count() <= state.baseline || !first(doneXPath)) { return; }
+    const text = first('(' + messagesXPath + ')[last()]').textContent.trim();
+    state.baseline = count();
+    state.waiters.splice(0).forEach((waiter) => waiter.resolve({text: text}));
+}
+
+new MutationObserver(() => {
+    if (!state.scheduled) { state.scheduled = true; setTimeout(check, 0); }
+}).observe(document.body, {childList: true, subtree: true, characterData: true});
+
+window.__mediatorResponses = {
+    arm: () => { state.baseline = count(); },
+    wait: (resolve, timeoutMs) => {
+        const waiter = {resolve: (result) => { clearTimeout(waiter.timer); resolve(result); }};
+        waiter.timer = setTimeout(() => {
+            state.waiters = state.waiters.filter((other) => other !== waiter);
+            resolve({error: 'Timeout while waiting for the response'});
+        }, timeoutMs);
+        state.waiters.push(waiter);
+        check();
+    }
+};
+return true;
+"""
+
+SUBMIT_PROMPT_JS = """
+const promptXPath = arguments[0], sendXPath = arguments[1], text = arguments[2], timeoutMs = arguments[3];
+const done = arguments[arguments.length - 1];
+const first = (xpath) => document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)
+    .singleNodeValue;
+
+function submit(prompt) {
+    const property = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(prompt), 'value');
+    if (property && property.set) { property.set.call(prompt, text); } else { prompt.textContent = text; }
+    prompt.dispatchEvent(new Event('input', {bubbles: true}));
+    if (window.__mediatorResponses) { window.__mediatorResponses.arm(); }
+    const send = first(sendXPath);
+    if (send && !send.disabled) {
+        send.click();
+    } else {
+        prompt.dispatchEvent(new KeyboardEvent('keydown', {key: 'Enter', code: 'Enter', keyCode: 13, bubbles: true}));
+    }
+    done({ok: true});
+}
+
+const prompt = first(promptXPath);
+if (prompt) { submit(prompt); return; }
+const observer = new MutationObserver(() => {
+    const found = first(promptXPath);
+    if (found) { observer.disconnect(); clearTimeout(timer); submit(found); }
+});
+const timer = setTimeout(() => { observer.disconnect(); done({error: 'Timeout while locating the prompt'}); }, timeoutMs);
+observer.observe(document.body, {childList: true, subtree: true});
+"""
+
+AWAIT_RESPONSE_JS = """
+const done = arguments[arguments.length - 1];
+if (!window.__mediatorResponses) { done({error: 'Response observer is not installed'}); return; }
+window.__mediatorResponses.wait(done, arguments[0]);
+"""
@@ -1,4 +1,5 @@
 from ..selenium_service import SeleniumService
+from ..browser_thread import BrowserCommand, BrowserCommandThread, CommandKind
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
@@ -13,10 +14,11 @@ import datetime
 import logging
 from typing import Optional, TYPE_CHECKING
 from selenium.webdriver.remote.webelement import WebElement
-from PyQt5.QtCore import QObject, pyqtSignal, QThread, pyqtSlot
+from PyQt5.QtCore import QObject, Qt, pyqtSlot
 import debugpy
 
 from src.signals.chat_signal_manager import ChatbotState
+from src.backends.backend_setup.chatgpt_scripts import RESPONSE_OBSERVER_JS, SUBMIT_PROMPT_JS, AWAIT_RESPONSE_JS
 
 if TYPE_CHECKING:
     from src.client.client import SignalManager
@@ -50,12 +52,17 @@ class Action(Enum):
     ENTER_TEXT = "enter text"
     ENTER_TEXT_BLOCK = "enter text block"
     RETRIEVE_TEXT = "retrieve text"
+    AWAIT_RESPONSE = "await response"
+
+PROMPT_TIMEOUT = 20  # seconds the prompt field may take to appear
+RESPONSE_TIMEOUT = 100  # seconds an assistant turn may take
 
 class Element(Enum):
     TXTFLD_PROMPT = "//textarea[@id='prompt-textarea']"
     BTN_SEND = "//button[@data-testid='fruitjuice-send-button']"
     TXT_RESPONSE_ITEMS = "((//div[contains(@class, 'agent-turn')])[last()]//button[contains(@class, 'text-token-text-secondary')])[last()]"
     TXT_RESPONSE_BLOCK = "(//div[@data-message-author-role='assistant' and contains(@class, 'text-message')])[last()]"
+    TXT_ASSISTANT_MESSAGES = "//div[@data-message-author-role='assistant' and contains(@class, 'text-message')]"
     BTN_PREFERENCES = "//button[contains(@class,'flex w-full')]"
     BTN_VERSION_SELECTOR = "//div[@aria-haspopup='menu']"
     BTN_NEW_CHAT = "//nav[@aria-label='Chat history']//button[contains(@class, 'h-10')]"
@@ -66,103 +73,6 @@ class JSClickException(Exception):
     """Exception raised when a JavaScript click fails."""
     pass
 
-class ElementLocatorWorker(QThread):
-    element_found = pyqtSignal(object, str, str)  # E.g., (WebElement, locator, extra)
-    error_occurred = pyqtSignal(str, str)  # E.g., (error_message, locator)
-
-    def __init__(self, _parent: 'ChatGPT', driver, locator: Enum, extra=None):
-        super().__init__()
-        self.driver = driver
-        self.locator = locator.value
-        self.extra = extra
-        self._parent = _parent
-        logging.info("\033[94mElementLocatorWorker INITIALIZED\033[0m")
-        logging.info(f"\033[94mlocator: {locator}\033[0m")
-
-    def run(self):
-        #debugpy.debug_this_thread()
-        logging.info(f"\033[92mRunning Locator for: {self.locator}\033[0m")
-        timeout = 100
-        if self.locator == "//textarea[@id='prompt-textarea']":
-            timeout = 20
-        try:
-            element = WebDriverWait(self.driver, timeout=timeout).until(
-                EC.presence_of_element_located((By.XPATH, self.locator))
-            )
-            logging.info(f"Element located with locator: {self.locator}")
-            #logging.info(f"Element: {element.get_attribute('outerHTML')}")
-            logging.info("\033[96mAbout to emit element found\033[0m")
-            self.element_found.emit(element, self.locator, self.extra)
-            logging.info("Signal emitted from element locator")
-        except TimeoutException:
-            logging.info("\033[96mAbout to emit error occured\033[0m")
-            self.error_occurred.emit("Timeout while locating element", self.locator)
-        except Exception as e:
-            logging.info("\033[96mAbout to emit error occured\033[0m")
-            logging.error(str(e))
-            self.error_occurred.emit(f"Exception: {str(e)}", self.locator)
-        finally: 
-            self.cleanup()
-
-    def cleanup(self):
-        # Disconnect all signals here
-        self.element_found.disconnect(self._parent.handle_element_found)
-        self.error_occurred.disconnect(self._parent.handle_error)
-        logging.info("SIGNALS DISCONNECTED: LOCATOR")
-
-
-class ActionExecutorWorker(QThread):
-    action_completed = pyqtSignal(object, str)  # E.g., (action enum, message)
-    error_occurred = pyqtSignal(str, str)  # E.g., (error_message, action)
-
-    def __init__(self, _parent: 'ChatGPT', driver, element, action, value=None):
-        super().__init__()
-        self.driver = driver
-        self.element = element
-        self.action = action
-        self.value = value
-        self._parent = _parent
-        logging.info("\033[94mActionExecutorWorker INITIALIZED\033[0m")
-
-    def run(self):
-        #debugpy.debug_this_thread()
-        logging.info(f"\033[92mRunning Action: {self.action}\033[0m")
-        self.success_msg = f"Action '{self.action}' completed successfully."
-        try:
-            if self.action == Action.CLICK:
-                self.element.click()
-            elif self.action == Action.ENTER_TEXT:
-                self.element : WebElement
-                self.element.clear()
-                self.element.send_keys(self.value + Keys.ENTER)
-            elif self.action == Action.ENTER_TEXT_BLOCK: 
-                self.element : WebElement
-                self.element.clear()
-                self.driver.execute_script("arguments[0].value = arguments[1];", self.element, self.value)
-                self.element.send_keys(Keys.ENTER)
-                self.element.send_keys(Keys.ENTER)
-            elif self.action == Action.RETRIEVE_TEXT:
-                #logging.info(f"element is {self.element.get_attribute('outerHTML')}")
-                text_content = self.element.get_attribute('textContent')
-                text_content.strip()  # Strip to remove any leading/trailing whitespace
-                self.success_msg = text_content
-            logging.info(f"Action '{self.action}' completed successfully.")
-            logging.info("\033[96mAbout to emit action completed\033[0m")
-            self.action_completed.emit(self.action,self.success_msg)
-            logging.info("Signal emitted from action worker")
-        except Exception as e:
-            logging.info("\033[96mAbout to emit error occured\033[0m")
-            logging.error(str(e))
-            self.error_occurred.emit(f"Exception: {str(e)}", self.action)
-        finally: 
-            self.cleanup()
-
-    def cleanup(self):
-        # Disconnect all signals here
-        self.action_completed.disconnect(self._parent.handle_action_completed)
-        self.error_occurred.disconnect(self._parent.handle_error)
-        logging.info("SIGNALS DISCONNECTED: ACTION")
-
 class ChatGPT(QObject, SeleniumService):
     TXTFLD_PROMPT = "//textarea[@id='prompt-textarea']"
     BTN_SEND = "//button[@data-testid='fruitjuice-send-button']"
@@ -185,7 +95,7 @@ class ChatGPT(QObject, SeleniumService):
         self.session_name = datetime.datetime.now().strftime("%Y.%m.%d.%H.%M")
         self.session_needs_renaming = False
         self.state_manager = state_manager
-        self.worker = None
+        self.browser : Optional[BrowserCommandThread] = None  # owns self.driver once open
         if signal_manager: 
             self.signals = signal_manager.api_signals
         logging.info("ChatGPT initialized")
@@ -203,9 +113,25 @@ class ChatGPT(QObject, SeleniumService):
             logging.error("Error opening ChatGPT")
 
     def open(self):
+        if self.browser is None:
+            self.browser = BrowserCommandThread(self.driver)
+            # slots run on the browser thread, whatever thread this object lives in
+            self.browser.command_completed.connect(self.handle_command_completed, Qt.DirectConnection)
+            self.browser.command_failed.connect(self.handle_command_failed, Qt.DirectConnection)
+            self.browser.start()
+        self.browser.submit(BrowserCommand(CommandKind.COMPOSITE, self._open_page)).result()
+        self.state_manager.update_state(ChatbotState.CONNECTED)
+
+    def _open_page(self, driver):
         self._load_page('https://chatgpt.com/?oai-dm=1&temporary-chat=true')
         self._wait_until_xpath(Element.BTN_SEND.value) # PREFS is last thing to load
-        self.state_manager.update_state(ChatbotState.CONNECTED)
+        self.install_response_observer()
+
+    def install_response_observer(self):
+        """Install the in-page observer that reports finished assistant turns; needed once per page load."""
+        self.driver.set_script_timeout(RESPONSE_TIMEOUT + 5)
+        self.driver.execute_script(RESPONSE_OBSERVER_JS, Element.TXT_ASSISTANT_MESSAGES.value,
+                                   Element.TXT_RESPONSE_ITEMS.value)
 
     def get_models(self) -> list[str]:
         return ['GPT-3.5', 'GPT-4o','GPT-4']
@@ -224,55 +150,41 @@ class ChatGPT(QObject, SeleniumService):
             logging.error(f"Error occurred in query: {e}")
 
     def enter_text(self, text):
-        try:
-            if self.worker is not None:
-                logging.info("Waiting for worker to be freed")
-                self.worker.wait()
-                logging.info(f"num of workers: {1 if self.worker else 0}")
-            self.worker = ElementLocatorWorker(self, self.driver, Element.TXTFLD_PROMPT, text)
-            self.worker.element_found.connect(self.handle_element_found)
-            self.worker.error_occurred.connect(self.handle_error)
-            self.worker.start()
-            logging.info("Waiting for input field to be located...")
-        except Exception as e:
-            logging.error(f"Error occurred in enter_text: {e}")
-    
-    def found_element_input_field(self, element, locator, text):
-        logging.info("\033[95mChatGPT found element input field\033[0")
-        try:
-            if self.worker is not None:
-                logging.info("Waiting for worker to be freed in input field located")
-                self.worker.wait()
-                logging.info(f"num of workers: {1 if self.worker else 0}")
-            logging.info("Input field located.")
-            cleansed_text = self.cleanse_input(text)
-            self.worker = ActionExecutorWorker(self, self.driver, element, Action.ENTER_TEXT_BLOCK, cleansed_text)
-            self.worker.action_completed.connect(self.handle_action_completed)
-            self.worker.error_occurred.connect(self.handle_error)
-            self.worker.start()
-        except Exception as e:
-            logging.error(f"Error occurred in handle_input_field_located: {e}")
-
-    @pyqtSlot(object, str)
-    def handle_action_completed(self, action, value):
-        logging.info("\033[90mChatGPT handle action completed\033[0m")
-        logging.info(f"Action '{action.value}' completed.")
-        if (action == Action.ENTER_TEXT_BLOCK) or (action == Action.ENTER_TEXT):
+        cleansed_text = self.cleanse_input(text)
+        self.browser.submit(BrowserCommand(CommandKind.COMPOSITE, lambda driver: self._submit_prompt(driver, cleansed_text),
+                                           Action.ENTER_TEXT_BLOCK))
+        logging.info("Queued prompt entry...")
+
+    # each step of a turn is one WebDriver round trip, see chatgpt_scripts
+    def _submit_prompt(self, driver, text) -> str:
+        result = driver.execute_async_script(SUBMIT_PROMPT_JS, Element.TXTFLD_PROMPT.value, Element.BTN_SEND.value,
+                                             text, PROMPT_TIMEOUT * 1000)
+        if "error" in result:
+            raise TimeoutException(result["error"])
+        return f"Action '{Action.ENTER_TEXT_BLOCK}' completed successfully."
+
+    def _await_response(self, driver) -> str:
+        result = driver.execute_async_script(AWAIT_RESPONSE_JS, RESPONSE_TIMEOUT * 1000)
+        if "error" in result:
+            raise TimeoutException(result["error"])
+        return result["text"]
+
+    @pyqtSlot(object, object)
+    def handle_command_completed(self, action, value):
+        logging.info("\033[90mChatGPT handle command completed\033[0m")
+        if action == Action.ENTER_TEXT_BLOCK:
             self.handle_text_entered(value)
-        elif action == Action.RETRIEVE_TEXT:
+        elif action == Action.AWAIT_RESPONSE:
             self.handle_text_retrieved(value)
 
     @pyqtSlot(object, str, str)
-    def handle_element_found(self, element, locator, extra):
-        logging.info("\033[90mChatGPT handle element found\033[0m")
-        logging.info(f"Element '{locator}' completed.")
-        if locator == Element.TXTFLD_PROMPT.value:
-            self.found_element_input_field(element, locator, extra)
-        elif locator == Element.TXT_RESPONSE_ITEMS.value:
-            self.found_element_response_items(element, locator, extra)
-        elif locator == Element.TXT_RESPONSE_BLOCK.value:
-            self.found_element_response(element, locator, extra)
-        
+    def handle_command_failed(self, action, error_type, message):
+        logging.info("\033[90mChatGPT handle command failed\033[0m")
+        self.handle_error(error_type, message)
+        if action in (Action.ENTER_TEXT_BLOCK, Action.AWAIT_RESPONSE):
+            logging.info("\033[96mAbout to emit api error\033[0m")
+            self.signals.api_error.emit(message)
+
     def handle_text_entered(self, message):   
         logging.info("\033[95mChatGPT handle text entered\033[0m")
         logging.info(message)     
@@ -286,50 +198,14 @@ class ChatGPT(QObject, SeleniumService):
         return text
     
     def retrieve_response(self):
-        if self.worker is not None:
-            logging.info("Waiting for worker to be freed to retrieve response")
-            self.worker.wait()
-            logging.info(f"num of workers: {1 if self.worker else 0}")
-        logging.info("Attempting to check for response...")
-        # first wait for one second
-        time.sleep(3)
-        self.worker = ElementLocatorWorker(self, self.driver, Element.TXT_RESPONSE_ITEMS)
-        self.worker.element_found.connect(self.handle_element_found)
-        self.worker.error_occurred.connect(self.handle_error)
-        self.worker.start()
-
-    def found_element_response_items(self, element, locator, extra):
-        logging.info("\033[95mChatGPT found element response items\033[0m")
-        if self.worker is not None:
-            logging.info("Waiting for worker to be freed after done writing")
-            self.worker.wait()
-        self.worker = ElementLocatorWorker(self, self.driver, Element.TXT_RESPONSE_BLOCK)
-        self.worker.element_found.connect(self.handle_element_found)
-        self.worker.error_occurred.connect(self.handle_error)
-        self.worker.start()
-
-    def found_element_response(self, element, locator, extra):
-        logging.info("\033[95mChatGPT found element response\033[0m")
-        if self.worker is not None:
-            logging.info("Waiting for worker to be freed after response located")
-            self.worker.wait()
-            logging.info(f"num of workers: {1 if self.worker else 0}")
-        self.worker = ActionExecutorWorker(self, self.driver, element, Action.RETRIEVE_TEXT)
-        self.worker.action_completed.connect(self.handle_action_completed)
-        self.worker.error_occurred.connect(self.handle_error)
-        self.worker.start()
+        logging.info("Waiting for the response to finish...")
+        self.browser.submit(BrowserCommand(CommandKind.READ, self._await_response, Action.AWAIT_RESPONSE))
 
     def handle_text_retrieved(self, message):
         logging.info("\033[95mChatGPT handle text retrieved\033[0m")
-        if self.worker is not None:
-            logging.info("Waiting for worker to be freed after text retrieved")
-            self.worker.wait()
-            logging.info(f"num of workers: {1 if self.worker else 0}")
-            logging.info("Worker freed after text retrieved")
         #logging.info(message)
         self.is_ready = True
         self.is_first_message = False
-        self.worker = None
         if not self.state_manager.is_state(ChatbotState.SENDING_INSTRUCTIONS):
             self.state_manager.update_state(ChatbotState.API_READY)
         logging.info("\033[96mAbout to emit response collected\033[0m")
@@ -337,10 +213,13 @@ class ChatGPT(QObject, SeleniumService):
 
     def refresh_and_retry(self):
         """Refresh the page and retry the operation."""
+        logging.warning('Encountered an error, refreshing and retrying...')
+        self.browser.submit(BrowserCommand(CommandKind.COMPOSITE, self._refresh_page))
+
+    def _refresh_page(self, driver):
         try:
-            logging.warning('Encountered an error, refreshing and retrying...')
-            self.driver.refresh()
-            self.open()  # Reopen the ChatGPT page to reset the state
+            driver.refresh()
+            self._open_page(driver)  # Reopen the ChatGPT page to reset the state
         except WebDriverException as e:
             logging.critical(f"Failed to refresh and retry: {e}")
             self.save_error_and_exit()
@@ -422,7 +301,7 @@ class ChatGPT(QObject, SeleniumService):
 
     def recover_from_error(self):
         """Handle recovery from errors by refreshing the chat interface."""
-        self.worker.refresh_chat()
+        self.refresh_and_retry()
 
     @pyqtSlot(str, str)
     def handle_error(self, error_type, message):
@@ -513,4 +392,8 @@ class ChatGPT(QObject, SeleniumService):
 
     def close(self):
         # cleanup
+        if self.browser is not None:
+            self.browser.stop()
+            self.browser.deleteLater()
+            self.browser = None
         SeleniumService.close(self)
\ No newline at end of file
@@ -0,0 +1,122 @@
+# src/backends/browser_thread.py
+"""
+browser_thread.py
+
+This module contains BrowserCommandThread, the one long-lived thread that
+talks to a Selenium backend's WebDriver. A WebDriver session must not be
+used from several threads at once, so instead of a QThread per step, every
+step is submitted as a BrowserCommand and runs on this thread in submission
+order.
+
+`submit` returns a `Future` for callers that block on the result, such as
+`open`. Every finished command is also reported on `command_completed` or
+`command_failed` together with its tag, for backends that chain steps from
+Qt slots.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class CommandKind(Enum):
+    LOCATE = "locate"
+    ACT = "act"
+    READ = "read"
+    COMPOSITE = "composite"
+
+
+class BrowserCommand:
+    """
+    One unit of browser work.
+
+    Args:
+        kind (CommandKind): What the command does, for logging.
+        run (Callable[[WebDriver], Any]): Called with the driver on the browser thread; returns the result.
+        tag (Any): Reported with the result so that slots can tell commands apart, e.g. an `Action`.
+
+    Attributes:
+        future (Future): Resolves with the result of `run`, or with the exception it raised.
+    """
+
+    def __init__(self, kind: CommandKind, run: Callable[[Any], Any], tag: Any = None):
+        self.kind = kind
+        self.run = run
+        self.tag = tag
+        self.future: Future = Future()
+
+
+class BrowserCommandThread(QThread):
+    """
+    Runs browser commands one at a time on a single thread that owns the driver.
+
+    Args:
+        driver (WebDriver): The driver; nothing else may use it while the thread runs.
+
+    Attributes:
+        executed (int): Number of commands run.
+    """
+    command_completed = pyqtSignal(object, object)  # (tag, result)
+    command_failed = pyqtSignal(object, str, str)  # (tag, error type, error message)
+
+    def __init__(self, driver):
+        super().__init__()
+        self.driver = driver
+        self.executed = 0
+        self._commands: queue.Queue[Optional[BrowserCommand]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    def submit(self, command: BrowserCommand) -> Future:
+        """
+        Queue a command behind the ones already submitted.
+
+        Returns:
+            Future: The future of the command; it fails with RuntimeError if the thread was stopped.
+        """
+        with self._lock:
+            if self._stopped:
+                command.future.set_exception(RuntimeError("Browser thread is stopped"))
+            else:
+                self._commands.put(command)
+        return command.future
+
+    def run(self):
+        logging.info("\033[92mBrowser command thread running\033[0m")
+        while True:
+            command = self._commands.get()
+            if command is None:
+                break
+            if not command.future.set_running_or_notify_cancel():
+                continue
+            logging.info(f"\033[92mRunning browser command: {command.kind.value} {command.tag}\033[0m")
+            try:
+                result = command.run(self.driver)
+            except Exception as e:
+                self.executed += 1
+                logging.error(f"Browser command {command.kind.value} {command.tag} failed: {e}")
+                logging.info("\033[96mAbout to emit command failed\033[0m")
+                self.command_failed.emit(command.tag, type(e).__name__, str(e))
+                command.future.set_exception(e)
+            else:
+                self.executed += 1
+                logging.info("\033[96mAbout to emit command completed\033[0m")
+                self.command_completed.emit(command.tag, result)
+                command.future.set_result(result)  # after the signal, so waiters see what its slots did
+
+    def stop(self):
+        """Finish the running command, cancel the queued ones and end the thread."""
+        with self._lock:
+            self._stopped = True
+            pending = []
+            while not self._commands.empty():
+                pending.append(self._commands.get_nowait())
+            self._commands.put(None)
+        for command in pending:
+            if command is not None:
+                command.future.cancel()
+        self.wait()
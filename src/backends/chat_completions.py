@@ -0,0 +1,197 @@
+# src/backends/chat_completions.py
+"""
+chat_completions.py
+
+This module contains ChatCompletionsService, a `BasicService` that talks to an
+OpenAI-compatible REST chat-completions endpoint instead of driving a browser.
+
+It plugs into ChatbotInterface exactly where the Selenium `ChatGPT` backend
+does: `open` connects and reports `CONNECTED`, `query` moves the state
+machine through `API_BUSY` and `API_READY`, and replies are emitted on
+`api_signals.chatbot_response_collected`. A turn is a single HTTP round trip
+over a pooled keep-alive session, without page loads, XPath lookups or fixed
+sleeps.
+
+With `stream` on, replies are requested as server-sent events and the text
+received so far is emitted on `api_signals.chatbot_partial_response` as it
+arrives, at most every `partial_interval` seconds after the first chunk, so
+the GUI shows the first words while the rest is generated. The complete reply
+is still emitted on `chatbot_response_collected`.
+
+The endpoint is stateless, so the service keeps the conversation history
+and sends it with every turn. `new_chat` starts over.
+"""
+import datetime
+import json
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.backends.basic_service import BasicService
+from src.signals.chat_signal_manager import ChatbotState
+
+if TYPE_CHECKING:
+    from src.client.client import SignalManager
+    from src.chatbot_interface.chat_state_manager import ChatStateManager
+
+
+class ChatCompletionsService(BasicService):
+    """
+    Chat backend for OpenAI-compatible `/chat/completions` endpoints.
+
+    Args:
+        signal_manager (SignalManager): Provides the API signals replies are emitted on.
+        state_manager (ChatStateManager): The chatbot state machine.
+        base_url (str): The API root, e.g. "https://api.openai.com/v1".
+        model (str): The model every turn is sent to.
+        api_key (Optional[str]): Sent as a bearer token if given.
+        timeout (tuple[float, float]): (connect, read) timeout of every request in seconds.
+        pool_maxsize (int): Connections kept alive to the endpoint.
+        max_history (int): Messages of history sent per turn; older ones are dropped, 0 keeps everything.
+        stream (bool): Stream replies and emit them on `chatbot_partial_response` as they arrive.
+        partial_interval (float): Minimum seconds between two partial responses.
+
+    Attributes:
+        messages (list[dict]): The conversation so far, in chat-completions format.
+        first_token_latency (Optional[float]): Seconds from sending the last streamed turn to its first text.
+    """
+
+    def __init__(self, signal_manager: 'SignalManager', state_manager: 'ChatStateManager',
+                 base_url: str = "http://127.0.0.1:8001/v1", model: str = "gpt-4o-mini",
+                 api_key: Optional[str] = None, timeout: tuple[float, float] = (3.05, 60.0),
+                 pool_maxsize: int = 2, max_history: int = 0, stream: bool = True,
+                 partial_interval: float = 0.05, **kwargs):
+        super().__init__(**kwargs)
+        self.session_name = datetime.datetime.now().strftime("%Y.%m.%d.%H.%M")
+        self.signals = signal_manager.api_signals if signal_manager else None
+        self.state_manager = state_manager
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.api_key = api_key
+        self.timeout = tuple(timeout)
+        self.pool_maxsize = pool_maxsize
+        self.max_history = max_history
+        self.stream = stream
+        self.partial_interval = partial_interval
+        self.first_token_latency: Optional[float] = None
+        self.messages: list[dict] = []
+        self.session: Optional[requests.Session] = None
+        self._lock = threading.Lock()  # one turn at a time keeps the history in order
+
+    @staticmethod
+    def get_service_name() -> str:
+        return "OpenAI-compatible chat completions"
+
+    def open(self):
+        """
+        Open the pooled session and check that the endpoint answers.
+
+        Raises:
+            ConnectionError: If the endpoint cannot be reached or refuses the API key.
+        """
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if self.api_key:
+            self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+        try:
+            models = self.get_models()  # also opens the first pooled connection
+        except requests.RequestException as e:
+            raise ConnectionError(f"Chat completions endpoint {self.base_url} is unreachable: {e}") from e
+        logging.info(f"Connected to {self.base_url}, models: {models}")
+        self.state_manager.update_state(ChatbotState.CONNECTED)
+
+    def get_models(self) -> list[str]:
+        """Return the model ids the endpoint offers."""
+        response = self.session.get(f"{self.base_url}/models", timeout=self.timeout)
+        response.raise_for_status()
+        return [model["id"] for model in response.json().get("data", [])]
+
+    def new_chat(self, session_name: str, model: Optional[str] = None):
+        """Start a new conversation, optionally with another model."""
+        with self._lock:
+            self.session_name = session_name
+            self.model = model or self.model
+            self.messages = []
+        logging.info(f"New chat {session_name} with model {self.model}")
+
+    def query(self, text: str) -> Optional[str]:
+        """
+        Send one turn and emit the reply on `chatbot_response_collected`, and
+        while it streams in, on `chatbot_partial_response`.
+
+        Blocks for the round trip, so it is meant to run on a worker thread, as
+        `ChatbotInterface._process_message_task` does. Failures are reported on `api_error`.
+
+        Returns:
+            Optional[str]: The reply, or None if the request failed.
+        """
+        sending_instructions = self.state_manager.is_state(ChatbotState.SENDING_INSTRUCTIONS)
+        if not sending_instructions:
+            self.state_manager.update_state(ChatbotState.API_BUSY)
+        try:
+            reply = self._complete(text)
+        except (requests.RequestException, KeyError, IndexError, ValueError) as e:
+            logging.error(f"Chat completion failed: {e}")
+            logging.info("\033[96mAbout to emit api error\033[0m")
+            self.signals.api_error.emit(str(e))
+            return None
+        if not sending_instructions:
+            self.state_manager.update_state(ChatbotState.API_READY)
+        logging.info("\033[96mAbout to emit response collected\033[0m")
+        self.signals.chatbot_response_collected.emit(reply)
+        return reply
+
+    def _complete(self, text: str) -> str:
+        with self._lock:
+            messages = self.messages + [{"role": "user", "content": text}]
+            if self.max_history:
+                messages = messages[-self.max_history:]
+            if self.stream:
+                reply = self._stream_completion(messages)
+            else:
+                response = self.session.post(f"{self.base_url}/chat/completions", timeout=self.timeout,
+                                             json={"model": self.model, "messages": messages})
+                response.raise_for_status()
+                reply = response.json()["choices"][0]["message"]["content"]
+            self.messages.extend([{"role": "user", "content": text}, {"role": "assistant", "content": reply}])
+        return reply
+
+    def _stream_completion(self, messages: list[dict]) -> str:
+        sent = time.perf_counter()
+        self.first_token_latency = None
+        parts, last_emit, emitted = [], 0.0, ""
+        with self.session.post(f"{self.base_url}/chat/completions", timeout=self.timeout, stream=True,
+                               json={"model": self.model, "messages": messages, "stream": True}) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue  # blank separators, comments and keep-alives
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    continue  # read on to the end of the body so the connection goes back to the pool
+                content = json.loads(data)["choices"][0]["delta"].get("content")
+                if not content:
+                    continue
+                parts.append(content)
+                now = time.perf_counter()
+                if self.first_token_latency is None:
+                    self.first_token_latency = now - sent
+                if now - last_emit >= self.partial_interval:
+                    last_emit, emitted = now, "".join(parts)
+                    self.signals.chatbot_partial_response.emit(emitted)
+        reply = "".join(parts)
+        if reply != emitted:
+            self.signals.chatbot_partial_response.emit(reply)
+        return reply
+
+    def close(self):
+        """Close the pooled connections."""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
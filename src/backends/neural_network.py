@@ -1,10 +1,10 @@
-import pickle
 import neat
+from src.mediator_manager.genome_schema import decode_genome
 
 def unpack_agent(serialized_agent):
-    # Deserialize the network
+    # Decode the network from the JSON genome schema; pickles from the server are never loaded
     print("deserializing...")
-    genome_key, network = pickle.loads(serialized_agent)
+    genome_key, network, _ = decode_genome(serialized_agent)
 
     return genome_key, network
 
@@ -13,7 +13,6 @@ from selenium.webdriver.support import expected_conditions as EC
 
 from .basic_service import BasicService
 import sys
-import time
 import os
 
 CURRENT_PATH = os.getcwd()
@@ -129,22 +128,20 @@ class SeleniumService(BasicService):
 
 
     def _load_page(s, url: str):
-        """driver.get(url) then driver.implicitly_wait()"""
+        """driver.get(url) then driver.implicitly_wait()
+        get already blocks until the load event; callers wait for the element they need next"""
         s.driver.get(url)
         s.driver.implicitly_wait(10)
-        time.sleep(3.0)
 
 
     # 2 flavors of finding & waiting css or xpath, pros & cons
     def _find_element_css(s, css: str):
         element = s.driver.find_element(By.CSS_SELECTOR,css)
-        time.sleep(0.1)
         return element
 
 
     def _find_element_xpath(s, xpath: str):
         element = s.driver.find_element(By.XPATH,xpath)
-        time.sleep(0.1)
         return element
 
 
@@ -155,7 +152,6 @@ class SeleniumService(BasicService):
         else:
             try:
                 element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, css)))
-                time.sleep(0.1)
             except:
                 print(error_msg + f" css: '{css}'")
                 sys.exit()
@@ -168,7 +164,6 @@ class SeleniumService(BasicService):
         else:
             try:
                 element = wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-                time.sleep(0.1)
             except:
                 print(error_msg + f" xpath: '{xpath}'")
                 sys.exit()
@@ -6,6 +6,7 @@ from src.chatbot_interface.chat_state_manager import ChatStateManager
 from src.backends.backend_setup.discover import get_chrome_version
 from src.backends.gemini_base import Bard
 from src.backends.backend_setup.openai import ChatGPT
+from src.backends.chat_completions import ChatCompletionsService
 from src.interfaces.i_system_module import ISystemModule
 from src.user_interface.workers import AddMessageWorker, MessageQueue, ProcessMessageWorker, ProcessResponseWorker
 from src.signals.chat_signal_manager import ChatbotState, MessageType
@@ -27,6 +28,8 @@ class ChatbotInterface(ISystemModule, IChatbotService):
         self.current_mode = MessageType.MEDIATOR_INTERNAL
         self.thread_pool = QThreadPool()
         self.message_queue = MessageQueue(self)
+        self.backend = "selenium"  # or "chat_completions", see configure()
+        self.backend_config = {}
         
     def initialize(self):
         self.is_running = False
@@ -34,6 +37,8 @@ class ChatbotInterface(ISystemModule, IChatbotService):
 
     def configure(self, config: dict):
         logging.info("Configuring ChatbotInterface module...")
+        self.backend = config.get("backend", self.backend)
+        self.backend_config = config.get(self.backend, self.backend_config)
 
     def start(self):
         logging.info("Starting ChatbotInterface module...")
@@ -47,7 +52,10 @@ class ChatbotInterface(ISystemModule, IChatbotService):
         logging.info("Initializing connection to the chatbot service...")
         try:
             # TODO: add logic for Bard too
-            self._initialize_chatgpt()
+            if self.backend == "chat_completions":
+                self._initialize_chat_completions()
+            else:
+                self._initialize_chatgpt()
             self._open_chatgpt_service()
             self._start_new_chat_session()
         except Exception as e:
@@ -59,6 +67,10 @@ class ChatbotInterface(ISystemModule, IChatbotService):
         self.bard = ChatGPT(self.signal_manager, self.state, path=self.chrome_path, driver_version=chrome_version)
         logging.info("ChatGPT initialized")
 
+    def _initialize_chat_completions(self):
+        self.bard = ChatCompletionsService(self.signal_manager, self.state, **self.backend_config)
+        logging.info(f"Chat completions backend initialized for {self.bard.base_url}")
+
     def _open_chatgpt_service(self):
         self.bard.open()
         if not self.state.is_state(ChatbotState.CONNECTED):
@@ -175,6 +187,16 @@ class ChatbotInterface(ISystemModule, IChatbotService):
         worker = ProcessResponseWorker(self, reply)
         self.thread_pool.start(worker)     
 
+    def process_partial_response(self, partial: str):
+        """
+        Forward a reply that is still streaming to the GUI, if the reply will be displayed.
+
+        Runs on the signal handler's thread: partials are small and frequent, and
+        the final reply still arrives through `process_response`.
+        """
+        if self._should_display():
+            self.signals.public_chatbot_partial_received.emit(self._format_reply(partial))
+
     def _process_response_task(self, reply):
         self._update_state_after_sending_instructions()
         formatted_reply = self._format_reply(reply)
@@ -194,9 +216,11 @@ class ChatbotInterface(ISystemModule, IChatbotService):
     def _create_reply_data(self, reply):
         return ReplyData(last_response=reply, last_response_time=time.time(), message_mode = self.get_mode().value)
 
+    def _should_display(self) -> bool:
+        return (self.get_mode() == MessageType.MEDIATOR_PUBLIC) or (self.get_mode() == MessageType.USER)
+
     def _emit_reply_signal(self, reply_data):
-        should_display = (self.get_mode() == MessageType.MEDIATOR_PUBLIC) or (self.get_mode() == MessageType.USER)
-        if should_display:
+        if self._should_display():
             self.signals.public_chatbot_msg_received.emit(reply_data.model_dump())
         else:
             self.signals.internal_chatbot_msg_received.emit(reply_data.model_dump())
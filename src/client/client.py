@@ -22,6 +22,7 @@ This module also imports necessary modules and classes from PyQt5 and other
 parts of the application. """
 
 import sys
+import time
 import logging
 from typing import List
 from PyQt5.QtWidgets import QApplication
@@ -31,6 +32,7 @@ from src.interfaces.i_system_module import ISystemModule
 from src.user_interface.ui import UserInterface
 from src.data_collection.collector import ClientDataCollector
 from src.mediator_manager.manager import MediatorManagementModule
+from src.mediator_manager.mediator_pool import MediatorPool
 from src.network_handler.handler import NetworkHandler
 from src.chatbot_interface.chatbot import ChatbotInterface
 from src.chatbot_interface.mock_chatbot import MockChatbot
@@ -161,6 +163,7 @@ class Client(ISystemModule):
         network_handler (NetworkHandler): The network handler module.
         background_handler (BackgroundTaskHandler): The background task handler module.
         network_endpoint (str): The endpoint for network communication.
+        startup_timings (dict[str, float]): Seconds spent constructing and initializing each component.
 
     Methods:
         initialize(): Initializes the client and its components.
@@ -172,23 +175,25 @@ class Client(ISystemModule):
         reset(): Resets all the components.
         update(): Updates all the components.
         status(): Returns the status of all the components.
+        startup_report(): Returns the startup timings as a table.
 
     """
 
     def __init__(self):
         super().__init__()
         self.mode = None  # "TEST"
-        self.app = QApplication(sys.argv)  # Initialize QApplication in the main thread
-        self.signal_manager = SignalManager()
-        self.ui = UserInterface(self.signal_manager, self.app)
-        self.ci = (
+        self.startup_timings: dict[str, float] = {}
+        self.app = self._timed("QApplication", lambda: QApplication(sys.argv))  # Initialize QApplication in the main thread
+        self.signal_manager = self._timed("SignalManager", SignalManager)
+        self.ui = self._timed("UserInterface", lambda: UserInterface(self.signal_manager, self.app))
+        self.ci = self._timed("ChatbotInterface", lambda: (
             MockChatbot(self.signal_manager)
             if self.mode == "TEST"
             else ChatbotInterface(self.signal_manager)
-        )
-        self.data_collector = ClientDataCollector(self.signal_manager)
-        self.mediator_manager = MediatorManagementModule(self.signal_manager)
-        self.network_handler = NetworkHandler()
+        ))
+        self.data_collector = self._timed("ClientDataCollector", lambda: ClientDataCollector(self.signal_manager))
+        self.mediator_manager = self._timed("MediatorManagementModule", lambda: MediatorManagementModule(self.signal_manager))
+        self.network_handler = self._timed("NetworkHandler", NetworkHandler)
         self.background_handler = BackgroundTaskHandler(
             self.data_collector, self.network_handler, self.mediator_manager
         )
@@ -200,12 +205,17 @@ class Client(ISystemModule):
         """
         for component in self.get_components():
             logging.info(f"Initializing {component}...")
-            component.initialize()
+            self._timed(f"{type(component).__name__}.initialize", component.initialize)
 
         # Dependency injection
         self.network_handler.set_mock_mode(self.mode == "TEST")
         self.data_collector.set_network_handler(self.network_handler)
         self.mediator_manager.attach_chatbot_state_manager(self.ci.state)
+        self.mediator_manager.attach_mediator_cache(self.network_handler.mediator_cache)
+        self.mediator_manager.attach_mediator_pool(MediatorPool(
+            fetch=self.network_handler.prefetch_mediator,
+            decode=self.mediator_manager.decode_mediator,
+        ))
         self.signal_manager.gui_signals.client_stop.connect(self.stop)
         self.signal_handler = SignalHandler(self.signal_manager)
         self.signal_handler.add_handler(CollectorSignalHandler, self.data_collector)
@@ -214,6 +224,26 @@ class Client(ISystemModule):
         self.signal_handler.add_handler(GUISignalHandler, self.ui.get_gui())
         self.signal_handler.add_handler(ClientSignalHandler, self)
         # self.signal_handler.connect_signals() # not needed, happens in the base constructors
+        logging.info(f"Client startup timings:\n{self.startup_report()}")
+
+    def _timed(self, name: str, build):
+        """Call `build`, record how long it took under `name` and return its result."""
+        start = time.perf_counter()
+        result = build()
+        self.startup_timings[name] = time.perf_counter() - start
+        return result
+
+    def startup_report(self) -> str:
+        """
+        Returns the startup timings as a table, most expensive first.
+
+        Returns:
+            str: One line per constructed or initialized component, plus the total.
+        """
+        lines = [f"{name:<40} {seconds * 1000:9.1f} ms"
+                 for name, seconds in sorted(self.startup_timings.items(), key=lambda item: -item[1])]
+        lines.append(f"{'total':<40} {sum(self.startup_timings.values()) * 1000:9.1f} ms")
+        return "\n".join(lines)
 
     def get_components(self) -> List[ISystemModule]:
         """
@@ -260,12 +290,17 @@ class Client(ISystemModule):
         """
         Configures the client with the given configuration.
 
+        Each component receives the section of `config` named after its 
+        attribute on the client, e.g. `config["mediator_manager"]`.
+
         Args:
             config (dict): The configuration dictionary.
 
         Returns:
             Any: The result of the configuration process.
         """
+        for name in ("ui", "ci", "data_collector", "mediator_manager", "network_handler"):
+            getattr(self, name).configure(config.get(name, {}))
         return super().configure(config)
 
     def reset(self):
@@ -289,7 +324,7 @@ class Client(ISystemModule):
         Returns:
             dict: The status of all the components.
         """
-        return {component.status() for component in self.get_components()}
+        return {type(component).__name__: component.status() for component in self.get_components()}
 
 
 if __name__ == "__main__":
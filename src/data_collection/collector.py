@@ -14,6 +14,17 @@ and get the status of the data collector. It also provides methods to get,
 update, and send the collected data. The data can be serialized to a 
 dictionary and deserialized from a dictionary to a UserData object.
 
+Mediator swaps are requested asynchronously: `request_mediator_swap` hands 
+the request to the network handler's worker pool and returns a `Future`, 
+so the Qt thread never waits on the server. Only one swap is in flight at 
+a time; further requests join it and get the pending future back 
+(single-flight). Each swap records which callers it served in 
+`swap_traces`, so coalesced requests stay traceable.
+
+Every successful update is also queued on the network handler's batch 
+uploader as a UserData snapshot (plus a rating event when the rating 
+changed), so telemetry reaches the server in a few compressed requests.
+
 Classes:
     - Recipient: An enumeration that represents the recipient of the data.
     - ClientDataCollector: A class that represents a client data collector.
@@ -23,7 +34,11 @@ Exceptions:
     or an unsupported recipient type is provided for sending data.
 """
 import logging
-from typing import TYPE_CHECKING, Union
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Optional, Union
 from enum import Enum
 
 from pydantic import BaseModel, ValidationError
@@ -31,7 +46,7 @@ from pydantic import BaseModel, ValidationError
 from src.interfaces.i_data_collector import IDataCollector
 from src.interfaces.i_serializable import ISerializable
 from src.interfaces.i_system_module import ISystemModule
-from src.interfaces.data_models import UserData
+from src.interfaces.data_models import MediatorData, UserData
 
 if TYPE_CHECKING:
     from src.network_handler.handler import NetworkHandler
@@ -63,6 +78,9 @@ class ClientDataCollector(ISystemModule, IDataCollector, ISerializable):
         network_handler (NetworkHandler): The network handler instance.
         signals (CollectorSignalManager): The signal manager for collector signals.
         is_running (bool): A flag indicating whether the collector is running or not.
+        pending_swap (Optional[Future]): The mediator swap currently in flight, if any.
+        swap_timeout (Optional[float]): Read timeout for swap requests (the connect timeout stays the 
+            network handler's), None for the network default.
     """
 
     def __init__(self, signal_manager: "SignalManager"):
@@ -71,6 +89,13 @@ class ClientDataCollector(ISystemModule, IDataCollector, ISerializable):
         self.network_handler: "NetworkHandler" = None  # type: ignore
         self.signals: "CollectorSignalManager" = signal_manager.collector_signals
         self.is_running = False
+        self.pending_swap: Optional[Future] = None
+        self.swap_timeout: Optional[float] = None
+        self._discarded_swaps: set[Future] = set()
+        self._swap_trace: dict[Future, dict] = {}  # callers of the swaps in flight
+        self.swap_traces: deque[dict] = deque(maxlen=50)  # finished swaps, oldest first
+        self.coalesced_swaps = 0
+        self._swap_lock = threading.Lock()  # pending_swap is touched from the Qt and network threads
 
     def initialize(self):
         """
@@ -89,6 +114,7 @@ class ClientDataCollector(ISystemModule, IDataCollector, ISerializable):
             network_handler (NetworkHandler): The network handler instance.
         """
         self.network_handler = network_handler
+        self.network_handler.set_push_listener(self._handle_pushed_mediator)
 
     def configure(self, config):
         """
@@ -98,6 +124,7 @@ class ClientDataCollector(ISystemModule, IDataCollector, ISerializable):
             config: The configuration for the collector.
         """
         super().configure(config)
+        self.swap_timeout = config.get("swap_timeout", self.swap_timeout)
         logging.info(f"Client Data Collector configured with {config}")
 
     def start(self):
@@ -110,6 +137,7 @@ class ClientDataCollector(ISystemModule, IDataCollector, ISerializable):
         """
         Stop the client data collector.
         """
+        self.cancel_mediator_swap()
         self._change_running_state(False, "stopped")
 
     def reset(self):
@@ -163,27 +191,94 @@ class ClientDataCollector(ISystemModule, IDataCollector, ISerializable):
             updated_data = self.data_store.model_copy(update=data_dict)
             self.data_store = updated_data
             logging.info(f"Data in storage: {self.data_store}")
+            self._queue_upload(data_dict)
             return True
         except (ValidationError, ValueError) as e:
             logging.warning(f"Failed to update data store: {e}")
             return False
 
-    def send_data(self, recipient: Recipient):
+    def send_data(self, recipient: Recipient, requested_by: str = "unknown"):
         """
         Send the current data store to the specified recipient.
 
+        Sending to the NETWORK requests a mediator swap without blocking; the 
+        new mediator arrives later through `new_mediator_fetched`.
+
         Args:
             recipient (Recipient): The recipient type, either MEDIATOR or NETWORK.
+            requested_by (str): Who asked for the swap, recorded in the swap trace.
         """
         if recipient == Recipient.MEDIATOR:
             user_data_dict = self.to_dict(self.data_store)
             self.signals.data_ready_for_mediator.emit(user_data_dict)
         elif recipient == Recipient.NETWORK:
-            response = self.network_handler.request_mediator_swap(self.data_store)
-            self._handle_mediator_response(response)
+            self.request_mediator_swap(requested_by=requested_by)
         else:
             raise ValueError("Unsupported recipient type")
 
+    def report_user_data(self) -> Future:
+        """
+        Upload the current data store to the server without waiting for the reply.
+
+        Used when a mediator is swapped out locally, so the server still gets 
+        the final data for the outgoing genome.
+
+        Returns:
+            Future: Resolves to the server response.
+        """
+        return self.network_handler.send_data_async(self.to_dict(self.data_store))
+
+    def request_mediator_swap(self, timeout: Optional[float] = None, requested_by: str = "unknown") -> Future:
+        """
+        Request a new mediator from the server without blocking the caller.
+
+        If a swap is already in flight the caller joins it: its future is 
+        returned instead of starting a second request, and the caller is 
+        added to that swap's trace.
+
+        Args:
+            timeout (Optional[float]): Read timeout for this request, defaults to `swap_timeout`. 
+                The connect timeout stays the one configured on the network handler.
+            requested_by (str): Who asked for the swap, recorded in the swap trace.
+
+        Returns:
+            Future: Resolves to the server response once the swap completes.
+        """
+        with self._swap_lock:
+            if self.pending_swap is not None and not self.pending_swap.done():
+                callers = self._swap_trace[self.pending_swap]["callers"]
+                callers.append(requested_by)
+                self.coalesced_swaps += 1
+                logging.info(f"Mediator swap already in flight, {requested_by} joins {callers[0]}")
+                return self.pending_swap
+            future = self.network_handler.request_mediator_swap_async(
+                self.data_store, timeout if timeout is not None else self.swap_timeout
+            )
+            self.pending_swap = future
+            self._swap_trace[future] = {"started_at": time.time(), "callers": [requested_by]}
+        future.add_done_callback(self._handle_swap_done)
+        return future
+
+    def cancel_mediator_swap(self) -> bool:
+        """
+        Cancel the mediator swap in flight.
+
+        A request that has not started yet is cancelled outright; one that is 
+        already on the wire is left to finish but its result is discarded.
+
+        Returns:
+            bool: True if there was a pending swap to cancel, False otherwise.
+        """
+        with self._swap_lock:
+            future = self.pending_swap
+            if future is None or future.done():
+                return False
+            self.pending_swap = None
+            if not future.cancel():
+                self._discarded_swaps.add(future)
+        logging.info("Mediator swap cancelled")
+        return True
+
     def to_dict(self, data: BaseModel) -> dict:
         """
         Serialize the given data object to a dictionary.
@@ -221,6 +316,69 @@ class ClientDataCollector(ISystemModule, IDataCollector, ISerializable):
         self.is_running = state
         logging.info(f"Client Data Collector {action}")
 
+    def _queue_upload(self, data_dict: dict):
+        """
+        Queue the updated data store, and a rating event if the rating changed, for batched upload.
+
+        Args:
+            data_dict (dict): The update that was just applied.
+        """
+        if self.network_handler is None:
+            return
+        now = time.time()
+        snapshot = self.to_dict(self.data_store)
+        self.network_handler.enqueue_upload({"type": "user_data", "recorded_at": now, "data": snapshot})
+        if "user_rating" in data_dict:
+            self.network_handler.enqueue_upload({
+                "type": "rating",
+                "recorded_at": now,
+                "genome_id": snapshot["genome_id"],
+                "user_rating": snapshot["user_rating"],
+            })
+
+    def _handle_swap_done(self, future: Future):
+        """
+        Handle a finished mediator swap. Runs on the network worker thread.
+
+        Args:
+            future (Future): The completed swap request.
+        """
+        with self._swap_lock:
+            if self.pending_swap is future:
+                self.pending_swap = None
+            discarded = future.cancelled() or future in self._discarded_swaps
+            self._discarded_swaps.discard(future)
+            trace = self._swap_trace.pop(future, {"callers": []})
+        trace["finished_at"] = time.time()
+        if discarded:
+            self._finish_trace(trace, "cancelled")
+            logging.info("Discarding result of cancelled mediator swap")
+            return
+        try:
+            response = future.result()
+        except Exception as e:
+            self._finish_trace(trace, "failed")
+            logging.error(f"Mediator swap failed: {e}")
+            self.signals.collector_error.emit(str(e))
+            return
+        self._finish_trace(trace, "completed")
+        self._handle_mediator_response(response)
+
+    def _finish_trace(self, trace: dict, outcome: str):
+        trace["outcome"] = outcome
+        self.swap_traces.append(trace)
+        logging.info(f"Mediator swap {outcome}, served {len(trace['callers'])} callers: {trace['callers']}")
+
+    def _handle_pushed_mediator(self, mediator_data: MediatorData):
+        """
+        Hand a mediator the server pushed to the same flow as a fetched one. Runs on the push channel thread.
+
+        Args:
+            mediator_data (MediatorData): The pushed mediator.
+        """
+        logging.info("About to emit new mediator fetched (pushed)")
+        self.signals.new_mediator_fetched.emit(mediator_data.model_dump())
+
     def _handle_mediator_response(self, response):
         """
         Handle the response from the mediator.
@@ -228,9 +386,22 @@ class ClientDataCollector(ISystemModule, IDataCollector, ISerializable):
         Args:
             response: The response from the mediator.
         """
-        if response.status_code == 200:
+        if isinstance(response, dict):
+            if response.get("status_code") == "error":
+                logging.info(f"Failed to send data to server: {response.get('message')}")
+                self.signals.collector_error.emit(str(response.get("message")))
+            else:
+                # a status dict without an error carries no mediator
+                logging.info(f"Status response, no mediator to attach: {response}")
+        elif response.status_code in (200, 304):
             logging.info("FETCHED IN COLLECTOR")
             logging.info("About to emit new mediator fetched")
-            self.signals.new_mediator_fetched.emit(response.json())
+            try:
+                mediator_data = self.network_handler.parse_mediator_response(response)
+            except ValueError as e:
+                logging.error(f"Server sent an unreadable mediator: {e}")
+                self.signals.collector_error.emit(str(e))
+                return
+            self.signals.new_mediator_fetched.emit(mediator_data.model_dump())
         else:
             logging.info(f"Failed to send data to server: {response.status_code}")
@@ -49,11 +49,17 @@ class MediatorData(BaseModel):
     Represents the data model for receiving a new mediator over the network.
 
     Attributes:
-        new_mediator (str): The new mediator, serialized.
+        new_mediator (str): The legacy base64 pickle of old servers. It is no longer decoded. Defaults to "".
         message (str): The message associated with the mediator.
+        frame (Optional[bytes], optional): The mediator as a binary frame (see `genome_codec`). Defaults to None.
+        genome (Optional[dict], optional): The mediator in the JSON genome schema (see `genome_schema`). Defaults to None.
+        etag (Optional[str], optional): The mediator cache entry holding this payload. Defaults to None.
     """
-    new_mediator: str
+    new_mediator: str = ""
     message: str
+    frame: Optional[bytes] = None
+    genome: Optional[dict] = None
+    etag: Optional[str] = None
 
 class ReplyData(BaseModel):
     """
@@ -0,0 +1,349 @@
+# src/mediator_manager/compiled_network.py
+"""
+compiled_network.py
+
+This module contains the CompiledNetwork class, an array-backed evaluator
+built once from a neat-python `FeedForwardNetwork`.
+
+`FeedForwardNetwork.activate` walks its node tuples in Python for every
+input. Compiling groups the nodes into topological layers (a node sits one
+layer above the deepest node it reads from), so all nodes of a layer are
+evaluated together:
+
+    values     float32 matrix with one column per node, one row per input vector
+    sum        one matrix product against the layer's float32 weight matrix
+    others     the layer's links gathered into padded (nodes, links) arrays and reduced with NumPy
+    activate   bias + response * aggregate, then the activation in NumPy, per activation group
+
+Every built-in neat activation and aggregation is supported with the same
+clamping as neat's scalar versions. Networks using anything else, or reading
+a node before it is evaluated (which makes neat's output depend on the
+previous call), raise CompileError and should keep using `activate`.
+Results match `FeedForwardNetwork.activate` to float32 precision. The fixed
+NumPy overhead per layer makes tiny genomes no faster than neat; from a few
+dozen nodes on, see benchmarks/evaluator_benchmark.py, it wins by a wide margin.
+
+`CompiledNetworkCache` keeps recently decoded networks and their compiled
+evaluators by genome id, so reassigning a recent genome skips decoding and
+compiling altogether.
+"""
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Callable, Optional, Sequence, Union
+
+import numpy as np
+from neat.activations import ActivationFunctionSet
+from neat.aggregations import AggregationFunctionSet
+from neat.nn import FeedForwardNetwork
+
+from src.mediator_manager.genome_codec import ACTIVATIONS, AGGREGATIONS
+
+Array = np.ndarray
+
+
+def _clamp(z: Array, low: float, high: float) -> Array:
+    # np.clip carries enough Python overhead to dominate small layers
+    return np.minimum(np.maximum(z, low), high)
+
+
+def _sigmoid(z: Array) -> Array:
+    return 1.0 / (1.0 + np.exp(-_clamp(5.0 * z, -60.0, 60.0)))
+
+
+def _inv(z: Array) -> Array:
+    with np.errstate(divide="ignore", over="ignore"):
+        return np.where(z != 0.0, 1.0 / np.where(z != 0.0, z, 1.0), 0.0)
+
+
+_SELU_LAMBDA = 1.0507009873554804934193349852946
+_SELU_ALPHA = 1.6732632423543772848170429916717
+
+# vectorized equivalents of neat.activations, clamped the same way
+NUMPY_ACTIVATIONS: dict[str, Callable[[Array], Array]] = {
+    "sigmoid": _sigmoid,
+    "tanh": lambda z: np.tanh(_clamp(2.5 * z, -60.0, 60.0)),
+    "sin": lambda z: np.sin(_clamp(5.0 * z, -60.0, 60.0)),
+    "gauss": lambda z: np.exp(-5.0 * _clamp(z, -3.4, 3.4) ** 2),
+    "relu": lambda z: np.where(z > 0.0, z, 0.0),
+    "elu": lambda z: np.where(z > 0.0, z, np.expm1(np.minimum(z, 0.0))),
+    "lelu": lambda z: np.where(z > 0.0, z, 0.005 * z),
+    "selu": lambda z: np.where(z > 0.0, _SELU_LAMBDA * z, _SELU_LAMBDA * _SELU_ALPHA * np.expm1(np.minimum(z, 0.0))),
+    "softplus": lambda z: 0.2 * np.log1p(np.exp(_clamp(5.0 * z, -60.0, 60.0))),
+    "identity": lambda z: z,
+    "clamped": lambda z: _clamp(z, -1.0, 1.0),
+    "inv": _inv,
+    "log": lambda z: np.log(np.maximum(z, 1e-7)),
+    "exp": lambda z: np.exp(_clamp(z, -60.0, 60.0)),
+    "abs": np.abs,
+    "hat": lambda z: np.maximum(0.0, 1.0 - np.abs(z)),
+    "square": np.square,
+    "cube": lambda z: z ** 3,
+}
+
+_activation_set = ActivationFunctionSet()
+_aggregation_set = AggregationFunctionSet()
+_activation_names = {_activation_set.get(name): name for name in ACTIVATIONS}
+_aggregation_names = {_aggregation_set.get(name): name for name in AGGREGATIONS}
+
+
+class CompileError(ValueError):
+    """Raised for networks the compiled evaluator cannot reproduce exactly."""
+
+
+class _Layer:
+    """The nodes of one topological layer and the arrays needed to evaluate them together."""
+
+    def __init__(self, slots: list[int], biases: list[float], responses: list[float]):
+        self.slots = np.asarray(slots, dtype=np.intp)
+        self.bias = np.asarray(biases, dtype=np.float32)
+        self.response = np.asarray(responses, dtype=np.float32)
+        self.aggregations: list[tuple[str, Union[slice, Array], tuple]] = []
+        self.activations: list[tuple[Callable[[Array], Array], Union[slice, Array]]] = []
+
+    def evaluate(self, values: Array):
+        if len(self.aggregations) == 1:
+            name, _, arrays = self.aggregations[0]
+            aggregated = _aggregate(name, values, arrays)
+        else:
+            aggregated = np.empty((values.shape[0], len(self.slots)), dtype=np.float32)
+            for name, positions, arrays in self.aggregations:
+                aggregated[:, positions] = _aggregate(name, values, arrays)
+        z = self.bias + self.response * aggregated
+        if len(self.activations) == 1:
+            values[:, self.slots] = self.activations[0][0](z)
+        else:
+            for function, positions in self.activations:
+                values[:, self.slots[positions]] = function(z[:, positions])
+
+
+def _aggregate(name: str, values: Array, arrays: tuple) -> Array:
+    if name == "sum":
+        sources, weights = arrays
+        return values[:, sources] @ weights
+    sources, weights, mask = arrays
+    products = values[:, sources] * weights  # (rows, nodes, padded links)
+    if name == "product":
+        return np.where(mask, products, 1.0).prod(axis=-1)
+    if name == "mean":
+        counts = mask.sum(axis=-1)
+        return np.where(mask, products, 0.0).sum(axis=-1) / np.maximum(counts, 1)
+    if name in ("max", "min"):
+        reduce = np.max if name == "max" else np.min
+        filler = -np.inf if name == "max" else np.inf
+        result = reduce(np.where(mask, products, filler), axis=-1, initial=filler)
+        return np.where(mask.any(axis=-1), result, 0.0)
+    if name == "maxabs":
+        masked = np.where(mask, products, 0.0)
+        index = np.abs(masked).argmax(axis=-1)[..., None]
+        return np.take_along_axis(masked, index, axis=-1)[..., 0]
+    # median: the padding is NaN so nanmedian ignores it, nodes without links stay 0
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nan_to_num(np.nanmedian(np.where(mask, products, np.nan), axis=-1), nan=0.0)
+
+
+def _positions(members: list[int], size: int) -> Union[slice, Array]:
+    return slice(None) if len(members) == size else np.asarray(members, dtype=np.intp)
+
+
+class CompiledNetwork:
+    """
+    A feed-forward network compiled into layered float32 arrays.
+
+    Use `CompiledNetwork.compile` to build one from a neat network.
+
+    Attributes:
+        input_nodes (list[int]): The input node keys, in input order.
+        output_nodes (list[int]): The output node keys, in output order.
+        layers (int): The number of topological layers.
+    """
+
+    def __init__(self, input_nodes: list[int], output_nodes: list[int], slot_count: int,
+                 input_slots: Array, output_slots: Array, layers: list[_Layer]):
+        self.input_nodes = input_nodes
+        self.output_nodes = output_nodes
+        self._slot_count = slot_count
+        self._input_slots = input_slots
+        self._output_slots = output_slots
+        self._layers = layers
+        self.layers = len(layers)
+
+    @classmethod
+    def compile(cls, network: FeedForwardNetwork) -> 'CompiledNetwork':
+        """
+        Compile a neat-python feed-forward network.
+
+        Args:
+            network (FeedForwardNetwork): The network to compile.
+
+        Returns:
+            CompiledNetwork: An evaluator with the same outputs.
+
+        Raises:
+            CompileError: If the network uses a function without a NumPy equivalent, or reads a node
+                before evaluating it.
+        """
+        slots: dict[int, int] = {}
+        for key in list(network.input_nodes) + list(network.output_nodes):
+            slots.setdefault(key, len(slots))
+        for node, *_ in network.node_evals:
+            slots.setdefault(node, len(slots))
+
+        # inputs and outputs that are never evaluated read as constants (the input or 0.0) in layer 0
+        depth = {key: 0 for key in slots}
+        nodes = {node for node, *_ in network.node_evals}
+        evaluated: set[int] = set()
+        by_layer: dict[int, list[tuple]] = {}
+        for node_eval in network.node_evals:
+            node, act, agg, _, _, links = node_eval
+            if act not in _activation_names or agg not in _aggregation_names:
+                raise CompileError(f"Node {node} uses a function without a NumPy equivalent")
+            if node in evaluated:
+                raise CompileError(f"Node {node} is evaluated twice")
+            for source, _ in links:
+                if source not in slots:
+                    raise CompileError(f"Node {node} reads unknown node {source}")
+                if source in nodes and source not in evaluated:
+                    raise CompileError(f"Node {node} reads node {source} before it is evaluated")
+            depth[node] = 1 + max((depth[source] for source, _ in links), default=0)
+            evaluated.add(node)
+            by_layer.setdefault(depth[node], []).append(node_eval)
+
+        layers = [cls._build_layer(by_layer[level], slots) for level in sorted(by_layer)]
+        return cls(
+            list(network.input_nodes), list(network.output_nodes), len(slots),
+            np.asarray([slots[key] for key in network.input_nodes], dtype=np.intp),
+            np.asarray([slots[key] for key in network.output_nodes], dtype=np.intp),
+            layers,
+        )
+
+    @staticmethod
+    def _build_layer(node_evals: list[tuple], slots: dict[int, int]) -> _Layer:
+        layer = _Layer([slots[node_eval[0]] for node_eval in node_evals],
+                       [node_eval[3] for node_eval in node_evals],
+                       [node_eval[4] for node_eval in node_evals])
+        size = len(node_evals)
+        groups: dict[str, list[int]] = {}
+        for position, node_eval in enumerate(node_evals):
+            groups.setdefault(_aggregation_names[node_eval[2]], []).append(position)
+        for name, members in groups.items():
+            links = [node_evals[position][5] for position in members]
+            if name == "sum":
+                sources = sorted({slots[source] for node_links in links for source, _ in node_links})
+                column = {slot: i for i, slot in enumerate(sources)}
+                weights = np.zeros((len(sources), len(members)), dtype=np.float32)
+                for j, node_links in enumerate(links):
+                    for source, weight in node_links:
+                        weights[column[slots[source]], j] += weight
+                arrays = (np.asarray(sources, dtype=np.intp), weights)
+            else:
+                # padded per-node link tables keep duplicate links and their order, which max/median rely on
+                width = max([1] + [len(node_links) for node_links in links])  # reductions need one column
+                sources = np.zeros((len(members), width), dtype=np.intp)
+                weights = np.zeros((len(members), width), dtype=np.float32)
+                mask = np.zeros((len(members), width), dtype=bool)
+                for j, node_links in enumerate(links):
+                    for k, (source, weight) in enumerate(node_links):
+                        sources[j, k], weights[j, k], mask[j, k] = slots[source], weight, True
+                arrays = (sources, weights, mask)
+            layer.aggregations.append((name, _positions(members, size), arrays))
+        activations: dict[str, list[int]] = {}
+        for position, node_eval in enumerate(node_evals):
+            activations.setdefault(_activation_names[node_eval[1]], []).append(position)
+        for name, members in activations.items():
+            layer.activations.append((NUMPY_ACTIVATIONS[name], _positions(members, size)))
+        return layer
+
+    def activate(self, inputs: Sequence[float]) -> Array:
+        """
+        Evaluate the network for one input vector.
+
+        Returns:
+            np.ndarray: The float32 output vector.
+        """
+        return self.activate_batch(np.asarray(inputs, dtype=np.float32).reshape(1, -1))[0]
+
+    def activate_batch(self, inputs: Array) -> Array:
+        """
+        Evaluate the network for many input vectors at once.
+
+        Args:
+            inputs (np.ndarray): An (N, inputs) array, one input vector per row.
+
+        Returns:
+            np.ndarray: An (N, outputs) float32 array.
+
+        Raises:
+            ValueError: If the rows do not have one column per input node.
+        """
+        inputs = np.asarray(inputs, dtype=np.float32)
+        if inputs.ndim != 2 or inputs.shape[1] != len(self._input_slots):
+            raise ValueError(f"Expected an (N, {len(self._input_slots)}) array, got {inputs.shape}")
+        values = np.zeros((inputs.shape[0], self._slot_count), dtype=np.float32)
+        values[:, self._input_slots] = inputs
+        with np.errstate(over="ignore", invalid="ignore"):
+            for layer in self._layers:
+                layer.evaluate(values)
+        return values[:, self._output_slots]
+
+
+class CompiledNetworkCache:
+    """
+    An LRU of decoded networks and their compiled evaluators, keyed by genome id.
+
+    Genome ids identify a genome for the lifetime of the server's population, so a hit is 
+    the same network the payload would decode to.
+
+    Args:
+        max_entries (int): Number of genomes kept.
+
+    Attributes:
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that had to decode.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, tuple[FeedForwardNetwork, Optional[CompiledNetwork]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, config: dict):
+        """Apply `max_entries` from the given configuration."""
+        with self._lock:
+            self.max_entries = config.get("max_entries", self.max_entries)
+            self._trim()
+
+    def get(self, genome_id: int) -> Optional[tuple[FeedForwardNetwork, Optional[CompiledNetwork]]]:
+        """Return the network and compiled evaluator of `genome_id`, or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(genome_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(genome_id)
+            self.hits += 1
+            return entry
+
+    def put(self, genome_id: int, network: FeedForwardNetwork, compiled: Optional[CompiledNetwork]):
+        """Keep a decoded network; `compiled` is None for networks that could not be compiled."""
+        with self._lock:
+            self._entries[genome_id] = (network, compiled)
+            self._entries.move_to_end(genome_id)
+            self._trim()
+
+    def discard(self, genome_id: int):
+        """Forget `genome_id`, e.g. after the server invalidated it."""
+        with self._lock:
+            self._entries.pop(genome_id, None)
+
+    def stats(self) -> dict:
+        """Return the cache size and hit counts."""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _trim(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,120 @@
+# src/mediator_manager/feature_store.py
+"""
+feature_store.py
+
+This module contains the FeatureStore class, a fixed-capacity ring buffer of
+per-message features the mediator can aggregate over.
+
+Every user message is stored as one row across preallocated NumPy arrays:
+
+    timestamps   float64  when the message was sent
+    sentiments   float64  its compound sentiment score
+    latencies    float64  seconds since the chatbot's previous message, NaN if there was none
+    unanswered   int32    chatbot messages it answered, i.e. the unanswered count before it
+
+Appending writes one slot and advances the head, overwriting the oldest row
+once the store is full. Window aggregates read the last K rows as a view of
+the arrays, so they only allocate when the window wraps around the end.
+"""
+import time
+from typing import Optional
+
+import numpy as np
+
+
+class FeatureStore:
+    """
+    A ring buffer of per-message mediator features with vectorized window aggregates.
+
+    Args:
+        capacity (int): Number of messages kept; older ones are overwritten.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.sentiments = np.zeros(capacity, dtype=np.float64)
+        self.latencies = np.full(capacity, np.nan, dtype=np.float64)
+        self.unanswered = np.zeros(capacity, dtype=np.int32)
+        self._head = 0  # the slot written next
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, sentiment: float, latency: Optional[float] = None, unanswered: int = 0):
+        """
+        Store one message, overwriting the oldest once the store is full.
+
+        Args:
+            timestamp (float): When the message was sent.
+            sentiment (float): Its compound sentiment score.
+            latency (Optional[float]): Seconds since the chatbot's previous message, if there was one.
+            unanswered (int): The unanswered count before the message.
+        """
+        slot = self._head
+        self.timestamps[slot] = timestamp
+        self.sentiments[slot] = sentiment
+        self.latencies[slot] = np.nan if latency is None else latency
+        self.unanswered[slot] = unanswered
+        self._head = (slot + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def clear(self):
+        """Forget every message; the arrays are reused."""
+        self._head = 0
+        self._count = 0
+
+    def window(self, array: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+        """
+        Return the last `k` rows of one of the store's arrays, oldest first.
+
+        Args:
+            array (np.ndarray): One of `timestamps`, `sentiments`, `latencies` or `unanswered`.
+            k (Optional[int]): Number of rows, defaults to every stored row.
+
+        Returns:
+            np.ndarray: A view of the arrays, or a copy if the window wraps around.
+        """
+        k = self._count if k is None else max(0, min(k, self._count))
+        start = (self._head - k) % self.capacity
+        if start + k <= self.capacity:
+            return array[start:start + k]
+        return np.concatenate((array[start:], array[:self._head]))
+
+    def mean_sentiment(self, k: Optional[int] = None) -> float:
+        """Mean sentiment of the last `k` messages, 0.0 if there are none."""
+        sentiments = self.window(self.sentiments, k)
+        return float(sentiments.mean()) if len(sentiments) else 0.0
+
+    def mean_latency(self, k: Optional[int] = None) -> float:
+        """Mean response latency of the last `k` messages that answered the chatbot, NaN if there are none."""
+        latencies = self.window(self.latencies, k)
+        answered = latencies[~np.isnan(latencies)]
+        return float(answered.mean()) if len(answered) else float("nan")
+
+    def message_rate(self, seconds: float = 60.0, now: Optional[float] = None) -> float:
+        """
+        Messages per minute over the last `seconds`.
+
+        Args:
+            seconds (float): Length of the window.
+            now (Optional[float]): End of the window, defaults to the current time.
+        """
+        now = time.time() if now is None else now
+        timestamps = self.window(self.timestamps)
+        recent = np.count_nonzero(timestamps >= now - seconds)
+        return recent * 60.0 / seconds
+
+    def latest(self) -> Optional[dict]:
+        """Return the most recent message's features, or None if the store is empty."""
+        if not self._count:
+            return None
+        slot = (self._head - 1) % self.capacity
+        latency = self.latencies[slot]
+        return {
+            "timestamp": float(self.timestamps[slot]),
+            "sentiment": float(self.sentiments[slot]),
+            "latency": None if np.isnan(latency) else float(latency),
+            "unanswered": int(self.unanswered[slot]),
+        }
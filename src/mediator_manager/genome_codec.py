@@ -0,0 +1,190 @@
+# src/mediator_manager/genome_codec.py
+"""
+genome_codec.py
+
+This module contains the compact binary wire format for mediators, sent by
+servers that understand the `application/x-mediator-frame` content type in
+place of base64-encoded pickles inside JSON.
+
+A frame is a fixed little-endian header followed by flat arrays describing
+the evaluated nodes of a feed-forward network:
+
+    header    magic, version, flags, genome id, message length,
+              input count, output count, node count, link count
+    message   UTF-8, zero-padded to a multiple of 4 bytes
+    int32     input keys, output keys, node keys
+    float32   node biases, node responses
+    uint32    links per node
+    int32     link sources
+    float32   link weights
+    uint8     activation codes, aggregation codes
+
+Nodes appear in evaluation order and their links are stored back to back, so
+`decode_frame` reads every array with `np.frombuffer` straight out of the
+response body without copying it first. The frame length is fully determined
+by the header, so truncated or padded frames are rejected. Weights travel as
+float32.
+"""
+import struct
+from typing import Union
+
+import numpy as np
+from neat.activations import ActivationFunctionSet
+from neat.aggregations import AggregationFunctionSet
+from neat.nn import FeedForwardNetwork
+
+FRAME_CONTENT_TYPE = "application/x-mediator-frame"
+FRAME_MAGIC = b"MEDF"
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct("<4sHHqIHHII")
+
+# codes are indexes into these tuples, so they may only ever be appended to
+ACTIVATIONS = ("sigmoid", "tanh", "sin", "gauss", "relu", "elu", "lelu", "selu", "softplus",
+               "identity", "clamped", "inv", "log", "exp", "abs", "hat", "square", "cube")
+AGGREGATIONS = ("product", "sum", "max", "min", "maxabs", "median", "mean")
+
+_activation_set = ActivationFunctionSet()
+_aggregation_set = AggregationFunctionSet()
+_activation_codes = {_activation_set.get(name): code for code, name in enumerate(ACTIVATIONS)}
+_aggregation_codes = {_aggregation_set.get(name): code for code, name in enumerate(AGGREGATIONS)}
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class FrameError(ValueError):
+    """Raised for frames that are truncated, corrupted or of an unknown version."""
+
+
+def encode_frame(genome_id: int, network: FeedForwardNetwork, message: str = "") -> bytes:
+    """
+    Serialize a feed-forward network into a mediator frame.
+
+    Args:
+        genome_id (int): The genome id of the mediator.
+        network (FeedForwardNetwork): The network to serialize.
+        message (str): The message sent along with the mediator.
+
+    Returns:
+        bytes: The encoded frame.
+
+    Raises:
+        FrameError: If the network uses an activation or aggregation function the format has no code for.
+    """
+    node_evals = network.node_evals
+    try:
+        activations = [_activation_codes[act] for _, act, _, _, _, _ in node_evals]
+        aggregations = [_aggregation_codes[agg] for _, _, agg, _, _, _ in node_evals]
+    except KeyError as e:
+        raise FrameError(f"No wire code for function {e}") from e
+    links = [link for node_eval in node_evals for link in node_eval[5]]
+    encoded_message = _pad(message.encode("utf-8"))
+    parts = [
+        FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, 0, genome_id, len(message.encode("utf-8")),
+                          len(network.input_nodes), len(network.output_nodes), len(node_evals), len(links)),
+        encoded_message,
+        np.asarray(network.input_nodes, dtype="<i4").tobytes(),
+        np.asarray(network.output_nodes, dtype="<i4").tobytes(),
+        np.asarray([node_eval[0] for node_eval in node_evals], dtype="<i4").tobytes(),
+        np.asarray([node_eval[3] for node_eval in node_evals], dtype="<f4").tobytes(),
+        np.asarray([node_eval[4] for node_eval in node_evals], dtype="<f4").tobytes(),
+        np.asarray([len(node_eval[5]) for node_eval in node_evals], dtype="<u4").tobytes(),
+        np.asarray([source for source, _ in links], dtype="<i4").tobytes(),
+        np.asarray([weight for _, weight in links], dtype="<f4").tobytes(),
+        np.asarray(activations, dtype="u1").tobytes(),
+        np.asarray(aggregations, dtype="u1").tobytes(),
+    ]
+    return b"".join(parts)
+
+
+def read_frame_header(buffer: Buffer) -> tuple[int, str]:
+    """
+    Read the genome id and message of a frame without decoding the network.
+
+    Returns:
+        tuple[int, str]: The genome id and the message.
+
+    Raises:
+        FrameError: If the buffer does not start with a valid frame header.
+    """
+    view = memoryview(buffer)
+    genome_id, message_length = _unpack_header(view)[3:5]
+    start = FRAME_HEADER.size
+    return genome_id, bytes(view[start:start + message_length]).decode("utf-8")
+
+
+def decode_frame(buffer: Buffer) -> tuple[int, FeedForwardNetwork]:
+    """
+    Rebuild the network of a mediator frame.
+
+    Args:
+        buffer (Buffer): The response body; it is read in place.
+
+    Returns:
+        tuple[int, FeedForwardNetwork]: The genome id and the network.
+
+    Raises:
+        FrameError: If the frame is truncated, padded, corrupted or of an unknown version.
+    """
+    view = memoryview(buffer)
+    _, _, _, genome_id, message_length, n_inputs, n_outputs, n_nodes, n_links = _unpack_header(view)
+    offset = FRAME_HEADER.size + _padded_length(message_length)
+    expected = offset + 4 * (n_inputs + n_outputs + 4 * n_nodes + 2 * n_links) + 2 * n_nodes
+    if len(view) != expected:
+        raise FrameError(f"Frame is {len(view)} bytes, header describes {expected}")
+
+    def take(dtype: str, count: int) -> np.ndarray:
+        nonlocal offset
+        array = np.frombuffer(view, dtype=dtype, count=count, offset=offset)
+        offset += array.nbytes
+        return array
+
+    inputs = take("<i4", n_inputs)
+    outputs = take("<i4", n_outputs)
+    nodes = take("<i4", n_nodes)
+    biases = take("<f4", n_nodes)
+    responses = take("<f4", n_nodes)
+    link_counts = take("<u4", n_nodes)
+    sources = take("<i4", n_links)
+    weights = take("<f4", n_links)
+    activations = take("u1", n_nodes)
+    aggregations = take("u1", n_nodes)
+    if int(link_counts.sum()) != n_links:
+        raise FrameError("Link counts do not add up to the link table")
+    if n_nodes and (activations.max() >= len(ACTIVATIONS) or aggregations.max() >= len(AGGREGATIONS)):
+        raise FrameError("Unknown activation or aggregation code")
+
+    # FeedForwardNetwork evaluates plain Python lists, so the arrays are converted once here
+    ends = np.cumsum(link_counts).tolist()
+    links = list(zip(sources.tolist(), weights.tolist()))
+    node_evals = []
+    start = 0
+    for i, node in enumerate(nodes.tolist()):
+        node_evals.append((
+            node,
+            _activation_set.get(ACTIVATIONS[activations[i]]),
+            _aggregation_set.get(AGGREGATIONS[aggregations[i]]),
+            float(biases[i]),
+            float(responses[i]),
+            links[start:ends[i]],
+        ))
+        start = ends[i]
+    return genome_id, FeedForwardNetwork(inputs.tolist(), outputs.tolist(), node_evals)
+
+
+def _unpack_header(view: memoryview) -> tuple:
+    if len(view) < FRAME_HEADER.size:
+        raise FrameError("Frame is shorter than its header")
+    header = FRAME_HEADER.unpack_from(view)
+    if header[0] != FRAME_MAGIC:
+        raise FrameError("Not a mediator frame")
+    if header[1] != FRAME_VERSION:
+        raise FrameError(f"Unsupported frame version {header[1]}")
+    return header
+
+
+def _padded_length(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\0" * (_padded_length(len(data)) - len(data))
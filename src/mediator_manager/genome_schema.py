@@ -0,0 +1,211 @@
+# src/mediator_manager/genome_schema.py
+"""
+genome_schema.py
+
+This module contains the JSON genome schema, the format servers that do not
+speak binary mediator frames (see `genome_codec`) send genomes in. It
+replaces base64-encoded pickles: nothing in the payload is executed, and it
+does not depend on neat-python's class layout.
+
+A genome is plain JSON:
+
+    {
+        "genome_id": 12,
+        "inputs": [-1, -2, -3],
+        "outputs": [0, 1, 2, 3],
+        "nodes": [{"key": 0, "activation": "sigmoid", "aggregation": "sum", "bias": 0.1, "response": 1.0}, ...],
+        "connections": [{"source": -1, "target": 0, "weight": 0.5}, ...]
+    }
+
+Functions are referenced by name and must be one of `ACTIVATIONS` and
+`AGGREGATIONS`. Validation rejects duplicate keys, connections to unknown
+nodes or into inputs, and cycles, so every valid genome is a feed-forward
+network. `decode_genome` orders the nodes topologically and builds the
+compiled evaluator together with the `FeedForwardNetwork` it falls back to.
+"""
+from typing import Union
+
+from neat.activations import ActivationFunctionSet
+from neat.aggregations import AggregationFunctionSet
+from neat.nn import FeedForwardNetwork
+from pydantic import BaseModel, ValidationError, field_validator, model_validator
+
+from src.mediator_manager.compiled_network import CompiledNetwork
+from src.mediator_manager.genome_codec import ACTIVATIONS, AGGREGATIONS
+
+_activation_set = ActivationFunctionSet()
+_aggregation_set = AggregationFunctionSet()
+_activation_names = {_activation_set.get(name): name for name in ACTIVATIONS}
+_aggregation_names = {_aggregation_set.get(name): name for name in AGGREGATIONS}
+
+
+class GenomeSchemaError(ValueError):
+    """Raised for genomes that do not match the schema or do not describe a feed-forward network."""
+
+
+class NodeGene(BaseModel):
+    """
+    An evaluated node.
+
+    Attributes:
+        key (int): The node key.
+        activation (str): One of `ACTIVATIONS`.
+        aggregation (str): One of `AGGREGATIONS`.
+        bias (float): Added to the aggregated input.
+        response (float): Multiplies the aggregated input.
+    """
+    key: int
+    activation: str
+    aggregation: str
+    bias: float
+    response: float
+
+    @field_validator("activation")
+    @classmethod
+    def _known_activation(cls, name: str) -> str:
+        if name not in ACTIVATIONS:
+            raise ValueError(f"Unknown activation {name!r}")
+        return name
+
+    @field_validator("aggregation")
+    @classmethod
+    def _known_aggregation(cls, name: str) -> str:
+        if name not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {name!r}")
+        return name
+
+
+class ConnectionGene(BaseModel):
+    """
+    An enabled connection.
+
+    Attributes:
+        source (int): The input or node read from.
+        target (int): The node fed.
+        weight (float): The connection weight.
+    """
+    source: int
+    target: int
+    weight: float
+
+
+class GenomeSchema(BaseModel):
+    """
+    A feed-forward genome as sent over the wire.
+
+    Attributes:
+        genome_id (int): The genome id of the mediator.
+        inputs (list[int]): The input keys, in input order.
+        outputs (list[int]): The output keys, in output order.
+        nodes (list[NodeGene]): The evaluated nodes, in any order.
+        connections (list[ConnectionGene]): The enabled connections; a node aggregates its incoming ones in this order.
+    """
+    genome_id: int
+    inputs: list[int]
+    outputs: list[int]
+    nodes: list[NodeGene]
+    connections: list[ConnectionGene]
+
+    @model_validator(mode="after")
+    def _consistent(self) -> 'GenomeSchema':
+        keys = [node.key for node in self.nodes]
+        if len(set(keys)) != len(keys):
+            raise ValueError("Duplicate node keys")
+        if len(set(self.inputs)) != len(self.inputs) or set(self.inputs) & set(keys):
+            raise ValueError("Input keys must be unique and must not be evaluated nodes")
+        known = set(keys) | set(self.inputs)
+        for connection in self.connections:
+            if connection.source not in known:
+                raise ValueError(f"Connection reads unknown node {connection.source}")
+            if connection.target not in keys:
+                raise ValueError(f"Connection feeds {connection.target}, which is not an evaluated node")
+        return self
+
+    def evaluation_order(self) -> list[NodeGene]:
+        """
+        Return the nodes so that every node comes after the nodes it reads.
+
+        Raises:
+            GenomeSchemaError: If the connections form a cycle.
+        """
+        nodes = {node.key: node for node in self.nodes}
+        pending = {key: 0 for key in nodes}
+        readers: dict[int, list[int]] = {}
+        for connection in self.connections:
+            if connection.source in nodes:
+                pending[connection.target] += 1
+                readers.setdefault(connection.source, []).append(connection.target)
+        ready = [key for key in nodes if not pending[key]]
+        order = []
+        while ready:
+            key = ready.pop()
+            order.append(nodes[key])
+            for reader in readers.get(key, ()):
+                pending[reader] -= 1
+                if not pending[reader]:
+                    ready.append(reader)
+        if len(order) != len(nodes):
+            raise GenomeSchemaError("Connections form a cycle")
+        return order
+
+
+def encode_genome(genome_id: int, network: FeedForwardNetwork) -> dict:
+    """
+    Describe a feed-forward network in the genome schema.
+
+    Args:
+        genome_id (int): The genome id of the mediator.
+        network (FeedForwardNetwork): The network to describe.
+
+    Returns:
+        dict: The JSON-serializable genome.
+
+    Raises:
+        GenomeSchemaError: If the network uses a function the schema has no name for.
+    """
+    nodes, connections = [], []
+    for node, act, agg, bias, response, links in network.node_evals:
+        if act not in _activation_names or agg not in _aggregation_names:
+            raise GenomeSchemaError(f"Node {node} uses a function without a schema name")
+        nodes.append({"key": node, "activation": _activation_names[act], "aggregation": _aggregation_names[agg],
+                      "bias": bias, "response": response})
+        connections.extend({"source": source, "target": node, "weight": weight} for source, weight in links)
+    return {
+        "genome_id": genome_id,
+        "inputs": list(network.input_nodes),
+        "outputs": list(network.output_nodes),
+        "nodes": nodes,
+        "connections": connections,
+    }
+
+
+def decode_genome(payload: Union[dict, str, bytes]) -> tuple[int, FeedForwardNetwork, CompiledNetwork]:
+    """
+    Validate a genome and build its evaluators.
+
+    Args:
+        payload (Union[dict, str, bytes]): The genome, parsed or as JSON text.
+
+    Returns:
+        tuple[int, FeedForwardNetwork, CompiledNetwork]: The genome id, the network and its compiled evaluator.
+
+    Raises:
+        GenomeSchemaError: If the payload is not valid JSON, does not match the schema or has a cycle.
+    """
+    try:
+        if isinstance(payload, dict):
+            genome = GenomeSchema.model_validate(payload)
+        else:
+            genome = GenomeSchema.model_validate_json(payload)
+    except ValidationError as e:
+        raise GenomeSchemaError(f"Invalid genome: {e}") from e
+    links: dict[int, list[tuple[int, float]]] = {}
+    for connection in genome.connections:
+        links.setdefault(connection.target, []).append((connection.source, connection.weight))
+    node_evals = [
+        (node.key, _activation_set.get(node.activation), _aggregation_set.get(node.aggregation),
+         node.bias, node.response, links.get(node.key, []))
+        for node in genome.evaluation_order()
+    ]
+    network = FeedForwardNetwork(list(genome.inputs), list(genome.outputs), node_evals)
+    return genome.genome_id, network, CompiledNetwork.compile(network)
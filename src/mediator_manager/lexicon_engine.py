@@ -0,0 +1,260 @@
+# src/mediator_manager/lexicon_engine.py
+"""
+lexicon_engine.py
+
+This module contains the LexiconSentimentEngine class, a batch sentiment
+backend that reproduces VADER's compound score from precompiled lookup
+tables.
+
+Compiling turns the VADER lexicon, booster words, negations and idioms into
+one vocabulary of token ids with parallel NumPy tables:
+
+    valence    float32 lexicon valence, 0 for words outside the lexicon
+    in_lexicon bool
+    booster    float32 booster increment (+0.293 / -0.293), 0 for other words
+    negation   bool, VADER's negation words
+    idioms     sorted n-gram codes of the idioms and multi-word boosters
+
+Scoring a batch tokenizes every message into one flat array of token ids,
+then applies VADER's rules (caps emphasis, the three preceding boosters and
+negations with their dampening, "never so", idioms, "least", the "but"
+shift, punctuation emphasis) as array operations over the whole batch at
+once, and sums per message with `np.bincount`. Tokenizing stays a Python
+loop; everything after it is vectorized.
+
+Compound scores match `SentimentIntensityAnalyzer` within `TOLERANCE`. The
+remaining differences come from float32 valences and from the case of the
+rule words "least", "at", "very", "kind" and "of", which VADER compares
+verbatim in some rules and lowercased in others; here they are always
+lowercased.
+"""
+import re
+import string
+from typing import TYPE_CHECKING, Iterable
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from nltk.sentiment import SentimentIntensityAnalyzer
+
+TOLERANCE = 0.01  # documented maximum |compound - VADER compound|
+
+C_INCR = 0.733
+N_SCALAR = -0.74
+NORMALIZE_ALPHA = 15
+REMOVE_PUNCTUATION = re.compile(f"[{re.escape(string.punctuation)}]")
+RULE_WORDS = ("", "but", "least", "at", "very", "kind", "of", "never", "so", "this")
+
+
+class LexiconSentimentEngine:
+    """
+    VADER compound scores from compiled lookup tables, scored in batches.
+
+    Use `LexiconSentimentEngine.from_vader` to compile one from an analyzer.
+
+    Args:
+        lexicon (dict[str, float]): Word valences.
+        boosters (dict[str, float]): Booster increments; multi-word boosters only dampen, as in VADER.
+        negations (Iterable[str]): Negation words.
+        idioms (dict[str, float]): Two and three word phrases that replace a word's valence.
+        punctuation (list[str]): Punctuation VADER strips from the start or end of a word.
+        decrement (float): The dampening applied after a multi-word booster.
+    """
+
+    def __init__(self, lexicon: dict[str, float], boosters: dict[str, float], negations: Iterable[str],
+                 idioms: dict[str, float], punctuation: list[str], decrement: float):
+        negations = set(negations)
+        phrase_words = {word for phrase in list(idioms) + list(boosters) for word in phrase.split()}
+        # id 0 is every word the tables know nothing about
+        words = list(RULE_WORDS)
+        words += sorted((set(lexicon) | set(boosters) | negations | phrase_words) - set(words))
+        self._ids = {word: i for i, word in enumerate(words)}
+        self._size = len(words)
+        (_, self._but, self._least, self._at, self._very, self._kind, self._of,
+         self._never, self._so, self._this) = range(len(RULE_WORDS))
+        self.valence = np.zeros(len(words), dtype=np.float32)
+        self.in_lexicon = np.zeros(len(words), dtype=bool)
+        self.booster = np.zeros(len(words), dtype=np.float32)
+        self.negation = np.zeros(len(words), dtype=bool)
+        for word, valence in lexicon.items():
+            self.valence[self._ids[word]] = valence
+            self.in_lexicon[self._ids[word]] = True
+        for word, increment in boosters.items():
+            if " " not in word:
+                self.booster[self._ids[word]] = increment
+        for word in negations:
+            self.negation[self._ids[word]] = True
+        self._punctuation = sorted(punctuation, key=len, reverse=True)
+        self._decrement = decrement
+        idiom_codes = sorted((self._code(phrase.split()), valence) for phrase, valence in idioms.items())
+        self._idiom_codes = np.asarray([code for code, _ in idiom_codes], dtype=np.int64)
+        self._idiom_valences = np.asarray([valence for _, valence in idiom_codes], dtype=np.float64)
+        self._booster_phrases = np.asarray([self._code(phrase.split()) for phrase in boosters if " " in phrase],
+                                           dtype=np.int64)
+
+    @classmethod
+    def from_vader(cls, analyzer: 'SentimentIntensityAnalyzer') -> 'LexiconSentimentEngine':
+        """Compile the lexicon and constants of a VADER analyzer."""
+        constants = analyzer.constants
+        return cls(analyzer.lexicon, constants.BOOSTER_DICT, constants.NEGATE, constants.SPECIAL_CASE_IDIOMS,
+                   constants.PUNC_LIST, constants.B_DECR)
+
+    def polarity_scores(self, text: str) -> dict:
+        """Score one message; only the compound score is computed."""
+        return {"compound": float(self.compound_batch([text])[0])}
+
+    def compound_batch(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        Compute the compound score of many messages at once.
+
+        Args:
+            texts (Iterable[str]): The messages.
+
+        Returns:
+            np.ndarray: The compound score of every message, rounded to 4 decimals like VADER.
+        """
+        texts = [text if isinstance(text, str) else str(text) for text in texts]
+        ids, upper, negated, exact, message, position, first = self._tokenize(texts)
+        count = len(texts)
+        lengths = np.bincount(message, minlength=count)
+        uppers = np.bincount(message, weights=upper, minlength=count)
+        cap_diff = ((uppers > 0) & (uppers < lengths))[message]
+        length = lengths[message]
+        # like nltk, a repeated word is read in the context of its first occurrence
+        at = position[first]
+
+        def word(offset: int) -> tuple[np.ndarray, np.ndarray]:
+            """The flat index of the word `offset` away from each word's context, and whether it exists."""
+            valid = (at + offset >= 0) & (at + offset < length)
+            return np.where(valid, first + offset, 0), valid
+
+        in_lexicon = self.in_lexicon[ids]
+        valence = self.valence[ids].astype(np.float64)
+        valence = np.where(in_lexicon & upper & cap_diff, valence + np.where(valence > 0, C_INCR, -C_INCR), valence)
+
+        before_1, has_1 = word(-1)
+        before_2, has_2 = word(-2)
+        before_3, has_3 = word(-3)
+        so_or_this = exact & ((ids == self._so) | (ids == self._this))
+        never = exact & (ids == self._never)
+        for distance, damping, before, has in ((1, 1.0, before_1, has_1), (2, 0.95, before_2, has_2),
+                                               (3, 0.9, before_3, has_3)):
+            applies = in_lexicon & has & ~self.in_lexicon[ids[before]]
+            boost = self.booster[ids[before]] * np.where(valence < 0, -1.0, 1.0)
+            boost = np.where((boost != 0) & upper[before] & cap_diff,
+                             boost + np.where(valence > 0, C_INCR, -C_INCR), boost) * damping
+            valence = np.where(applies, valence + boost, valence)
+            negation = np.where(negated[before], N_SCALAR, 1.0)
+            if distance == 2:
+                negation = np.where(never[before_2] & so_or_this[before_1], 1.5, negation)
+            elif distance == 3:
+                emphasis = (never[before_3] & so_or_this[before_2]) | so_or_this[before_1]
+                negation = np.where(emphasis, 1.25, negation)
+            valence = np.where(applies, valence * negation, valence)
+            if distance == 3:
+                valence = np.where(applies, self._idioms(valence, ids, exact, word), valence)
+
+        least = in_lexicon & has_1 & (ids[before_1] == self._least)
+        least &= ~has_2 | ((ids[before_2] != self._at) & (ids[before_2] != self._very))
+        valence = np.where(least, valence * N_SCALAR, valence)
+
+        # boosters and "kind of" carry no valence themselves
+        after_1, has_after = word(1)
+        kind_of = (ids == self._kind) & has_after & (ids[after_1] == self._of)
+        valence = np.where(in_lexicon & ~kind_of & (self.booster[ids] == 0), valence, 0.0)
+
+        # words before the first "but" count half, words after it one and a half times
+        no_but = np.iinfo(np.int64).max
+        but = np.full(count, no_but)
+        is_but = ids == self._but
+        np.minimum.at(but, message[is_but], position[is_but])
+        but_position = but[message]
+        shift = np.where(position < but_position, 0.5, np.where(position > but_position, 1.5, 1.0))
+        valence *= np.where(but_position == no_but, 1.0, shift)
+
+        total = np.bincount(message, weights=valence, minlength=count)
+        emphasis = np.array([self._punctuation_emphasis(text) for text in texts], dtype=np.float64)
+        total = total + np.sign(total) * emphasis
+        compound = total / np.sqrt(total * total + NORMALIZE_ALPHA)
+        return np.round(np.where(lengths > 0, compound, 0.0), 4)
+
+    def _idioms(self, valence: np.ndarray, ids: np.ndarray, exact: np.ndarray, word) -> np.ndarray:
+        """VADER's idiom check: phrases around a word replace its valence, multi-word boosters dampen it."""
+
+        def phrase(*offsets: int) -> np.ndarray:
+            """The n-gram code of the words at `offsets`, -1 where one is missing or not lowercase."""
+            code = np.zeros(len(ids), dtype=np.int64)
+            valid = np.ones(len(ids), dtype=bool)
+            for offset in offsets:
+                flat, has = word(offset)
+                code = code * self._size + ids[flat]
+                valid &= has & exact[flat] & (ids[flat] != 0)
+            return np.where(valid, code, -1)
+
+        def lookup(code: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            if not len(self._idiom_codes):
+                return np.zeros(len(code), dtype=bool), np.zeros(len(code))
+            slot = np.minimum(np.searchsorted(self._idiom_codes, code), len(self._idiom_codes) - 1)
+            return self._idiom_codes[slot] == code, self._idiom_valences[slot]
+
+        # the first phrase ending at or before the word wins, then phrases reaching forward override it
+        matched = np.zeros(len(ids), dtype=bool)
+        for offsets in ((-1, 0), (-2, -1, 0), (-2, -1), (-3, -2, -1), (-3, -2)):
+            found, idiom = lookup(phrase(*offsets))
+            valence = np.where(found & ~matched, idiom, valence)
+            matched |= found
+        for offsets in ((0, 1), (0, 1, 2)):
+            found, idiom = lookup(phrase(*offsets))
+            valence = np.where(found, idiom, valence)
+        dampened = np.isin(phrase(-3, -2), self._booster_phrases) | np.isin(phrase(-2, -1), self._booster_phrases)
+        return np.where(dampened, valence + self._decrement, valence)
+
+    def _code(self, words: list[str]) -> int:
+        code = 0
+        for word in words:
+            code = code * self._size + self._ids[word]
+        return code
+
+    def _tokenize(self, texts: list[str]) -> tuple[np.ndarray, ...]:
+        ids, upper, contracted, exact, message, position, first = [], [], [], [], [], [], []
+        lookup = self._ids.get
+        for index, text in enumerate(texts):
+            words = [word for word in text.split() if len(word) > 1]
+            if not words:
+                continue
+            # VADER strips one leading or trailing punctuation mark from words that are words without it
+            plain = {word for word in REMOVE_PUNCTUATION.sub("", text).split() if len(word) > 1}
+            seen: dict[str, int] = {}
+            for offset, word in enumerate(words):
+                word = self._strip(word, plain)
+                lower = word.lower()
+                first.append(seen.setdefault(word, len(ids)))
+                ids.append(lookup(lower, 0))
+                upper.append(word.isupper())
+                contracted.append("n't" in lower)
+                exact.append(word == lower)
+                message.append(index)
+                position.append(offset)
+        ids = np.asarray(ids, dtype=np.int64)
+        negated = self.negation[ids] | np.asarray(contracted, dtype=bool)
+        return (ids, np.asarray(upper, dtype=bool), negated, np.asarray(exact, dtype=bool),
+                np.asarray(message, dtype=np.int64), np.asarray(position, dtype=np.int64),
+                np.asarray(first, dtype=np.int64))
+
+    def _strip(self, word: str, plain: set[str]) -> str:
+        if word[0] not in string.punctuation and word[-1] not in string.punctuation:
+            return word
+        for mark in self._punctuation:
+            if word.endswith(mark) and word[:-len(mark)] in plain:
+                return word[:-len(mark)]
+            if word.startswith(mark) and word[len(mark):] in plain:
+                return word[len(mark):]
+        return word
+
+    @staticmethod
+    def _punctuation_emphasis(text: str) -> float:
+        exclamations = min(text.count("!"), 4) * 0.292
+        questions = text.count("?")
+        if questions <= 1:
+            return exclamations
+        return exclamations + (questions * 0.18 if questions <= 3 else 0.96)
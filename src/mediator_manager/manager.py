@@ -1,13 +1,18 @@
 # src/mediator_management/manager.py
 
-import logging, time, pickle, base64
+import logging, time, math
 from src.interfaces.i_mediator_handler import IMediatorHandler
 from src.interfaces.i_system_module import ISystemModule
-from PyQt5.QtCore import QThread, QTimer, pyqtSignal
-from nltk.sentiment import SentimentIntensityAnalyzer
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 import random
 import numpy as np
-from src.interfaces.data_models import UserData, MediatorData
+from src.interfaces.data_models import UserData, MediatorData, MessageData, ReplyData
+from src.mediator_manager.genome_codec import decode_frame, read_frame_header
+from src.mediator_manager.genome_schema import GenomeSchemaError, decode_genome
+from src.mediator_manager.compiled_network import CompiledNetwork, CompiledNetworkCache, CompileError
+from src.mediator_manager.sentiment import SentimentScorer
+from src.mediator_manager.feature_store import FeatureStore
+from src.mediator_manager.scheduler import EvaluationScheduler
 from src.signals.chat_signal_manager import ChatbotState
 
 from typing import TYPE_CHECKING
@@ -15,11 +20,43 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from src.client.client import SignalManager
     from src.chatbot_interface.chat_state_manager import ChatStateManager
+    from src.mediator_manager.mediator_pool import MediatorPool
+    from src.mediator_manager.mediator_cache import MediatorCache
+
+
+MAX_TIME_INTERVAL = 5 * 60  # seconds of silence that normalize to 1
+MAX_UNANSWERED = 10  # assume a max reasonable count to normalize against
+INTERVENTION_THRESHOLD = 0.5  # the biggest output has to reach this for the mediator to intervene
+
+
+def normalize_features(sentiment, elapsed, unanswered) -> np.ndarray:
+    """
+    Normalize raw mediator features; shared by the live path and `evaluate_batch`.
+
+    Args:
+        sentiment: Compound sentiment score(s) of the last message.
+        elapsed: Seconds since the last message.
+        unanswered: Number of unanswered messages.
+
+    Returns:
+        np.ndarray: [sentiment, normalized time, normalized unanswered] along the last axis;
+            scalars give shape (3,), arrays of shape (N,) give (N, 3).
+    """
+    normalized_time = np.asarray(elapsed, dtype=np.float64) / MAX_TIME_INTERVAL
+    # the more unanswered messages, the less urgent it is to intervene (going from 1 to 0)
+    normalized_unanswered = 1 - np.log1p(np.asarray(unanswered, dtype=np.float64)) / np.log1p(MAX_UNANSWERED)
+    return np.stack(np.broadcast_arrays(np.asarray(sentiment, dtype=np.float64), normalized_time,
+                                        normalized_unanswered), axis=-1)
 
 
 class MediatorTimerThread(QThread):
+    """
+    Single-shot timer for mediator evaluations; every tick is rescheduled with `schedule`,
+    so the interval can follow the EvaluationScheduler.
+    """
     update_user_model = pyqtSignal()
     stop_signal = pyqtSignal()
+    reschedule = pyqtSignal(int)
 
     def __init__(self, interval=10000, parent=None):
         super().__init__(parent)
@@ -30,9 +67,12 @@ class MediatorTimerThread(QThread):
     def run(self):
         logging.info("\033[96mRunning timer in mediator\033[0m")
         self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)  # predicted crossings are armed to the millisecond
         self.timer.setInterval(self.interval)
         self.timer.timeout.connect(self.trigger_mediator_intervention)
         self.stop_signal.connect(self.timer.stop)
+        self.reschedule.connect(self.timer.start)  # queued into this thread, where the timer lives
         self.timer.start()
         self.exec_()  # Enter the event loop
 
@@ -43,21 +83,59 @@ class MediatorTimerThread(QThread):
         self.quit()
         self.wait()
 
+    def schedule(self, seconds: float):
+        """Fire the next tick in `seconds`, replacing the pending one; 0 fires as soon as possible."""
+        self.reschedule.emit(math.ceil(seconds * 1000))  # never before a predicted crossing
+
     def trigger_mediator_intervention(self):
         logging.info("\033[96mAbout to emit update user model\033[0m")
         self.update_user_model.emit()
 
 class Mediator(): 
-    def __init__(self, genome_id, network):
+    def __init__(self, genome_id, network, compiled_network: 'CompiledNetwork' = None):
         self.genome_id = genome_id
         self.network = network
+        self.compiled_network : 'CompiledNetwork' = compiled_network
         self.report_traits()
 
+    def compile(self):
+        """Compile the network into its array-backed form once; `network.activate` stays the fallback."""
+        if self.compiled_network is not None:
+            return
+        try:
+            self.compiled_network = CompiledNetwork.compile(self.network)
+        except CompileError as e:
+            logging.warning(f"Mediator {self.genome_id} is evaluated uncompiled: {e}")
+            return
+        logging.info(f"Mediator network compiled into {self.compiled_network.layers} layers")
+
     def process_input(self, normalized_input_data) -> tuple[float, int]:
-        outputs = self.network.activate(normalized_input_data)
+        if self.compiled_network is not None:
+            outputs = self.compiled_network.activate(normalized_input_data)
+        else:
+            outputs = self.network.activate(normalized_input_data)
         # find the biggest output and report its index
         biggest_output, index = max((val, idx) for idx, val in enumerate(outputs))
-        return biggest_output, index
+        return float(biggest_output), index
+
+    def evaluate_batch(self, normalized_rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate many normalized input vectors at once.
+
+        Args:
+            normalized_rows (np.ndarray): An (N, inputs) array.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The (N, outputs) outputs and the (N,) index of each row's 
+                biggest output, breaking ties towards the last index like `process_input`.
+        """
+        if self.compiled_network is not None:
+            outputs = self.compiled_network.activate_batch(normalized_rows)
+        else:
+            outputs = np.asarray([self.network.activate(list(row)) for row in normalized_rows])
+        width = len(self.network.output_nodes)
+        indices = width - 1 - np.argmax(outputs[:, ::-1], axis=1)
+        return outputs, indices
 
     def report_traits(self):
         logging.info(f"Mediator genome id: {self.genome_id}")
@@ -76,38 +154,60 @@ class MediatorManagementModule(ISystemModule, IMediatorHandler):
         self.signals = signal_manager.mediator_signals
         self.chatbot_state_manager = None
         self.timer_thread = MediatorTimerThread()
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()  # Initialize VADER
+        self.sentiment_scorer = SentimentScorer()  # VADER is built lazily, see initialize()
         self.current_mediator = None
-        self.input_history = []
+        self.feature_store = FeatureStore()  # features of the recent user messages
+        self.scheduler = EvaluationScheduler()  # when the timer thread ticks and which ticks evaluate
+        self.last_chatbot_message_time : 'float' = None
         self.unanswered_count = 0  # Initialize the count of unanswered messages
         self.message_to_send : 'tuple[str, bool]' = None 
+        self.mediator_pool : 'MediatorPool' = None
+        self.mediator_cache : 'MediatorCache' = None
+        self.compiled_networks = CompiledNetworkCache()  # swapping back to a recent genome skips decoding
+        self.pool_config = {}
 
     # Implement abstract methods from ISystemModule
     def initialize(self):
         super().initialize() 
         self.timer_thread.update_user_model.connect(self.update_mediator)
+        self.sentiment_scorer.warm_up_in_background()  # loads VADER while the window comes up
         logging.info("Mediator Management Module initialized")
 
     def configure(self, config):
         super().configure(config)  # Optionally call base implementation if defined
-        # Configuration logic specific to mediators
+        self.pool_config = config.get("mediator_pool", self.pool_config)
+        self.sentiment_scorer.configure(config.get("sentiment_cache", {}))
+        self.scheduler.configure(config.get("evaluation_schedule", {}))
+        self.compiled_networks.configure(config.get("compiled_network_cache", {}))
+        self.timer_thread.interval = int(self.scheduler.base_interval * 1000)
+        if "sentiment_backend" in config:
+            self.sentiment_scorer.set_backend(config["sentiment_backend"])  # "vader" or "lexicon"
+        if self.mediator_pool is not None:
+            self.mediator_pool.configure(self.pool_config)
         logging.info(f"Mediator Management Module configured with {config}")
 
     def start(self):
         super().start()  # Start the module
-        self.load_mediator()  # Load the mediator as part of the start process
+        self.load_mediator("startup")  # Load the mediator as part of the start process
+        if self.mediator_pool is not None:
+            self.mediator_pool.start()
+        self.sentiment_scorer.warm_up()  # done before the first mediator tick
         self.timer_thread.start()
         logging.info("Mediator Management Module started")
 
     def stop(self):
         super().stop()  # Stop the module
         self.current_mediator = None  # Clear current mediator
+        if self.mediator_pool is not None:
+            self.mediator_pool.shutdown()
         self.timer_thread.stop()
         logging.info("Mediator Management Module stopped")
 
     def reset(self):
         super().reset()  # Reset the module
-        self.input_history.clear()
+        self.feature_store.clear()
+        self.scheduler.reset()
+        self.last_chatbot_message_time = None
         self.unanswered_count = 0
         logging.info("Mediator Management Module reset")
 
@@ -119,6 +219,10 @@ class MediatorManagementModule(ISystemModule, IMediatorHandler):
     def status(self):
         return super().status()  # Return the module's status
 
+    def evaluation_stats(self) -> dict:
+        """Return the executed and skipped evaluation counts and the current timer interval."""
+        return self.scheduler.stats()
+
     # IMediatorHandler specific methods
     def store_message_to_send(self, msg_to_send):
         self.message_to_send = msg_to_send
@@ -142,33 +246,82 @@ class MediatorManagementModule(ISystemModule, IMediatorHandler):
     def attach_chatbot_state_manager(self, chatbot_state_manager: 'ChatStateManager'):
         self.chatbot_state_manager = chatbot_state_manager
 
-    def load_mediator(self):
-        logging.info("Requesting new mediator...")
+    def attach_mediator_pool(self, mediator_pool: 'MediatorPool'):
+        self.mediator_pool = mediator_pool
+        self.mediator_pool.configure(self.pool_config)  # configure() may have run before the pool existed
+
+    def attach_mediator_cache(self, mediator_cache: 'MediatorCache'):
+        self.mediator_cache = mediator_cache
+
+    def request_mediator(self, requested_by: str = "new_mediator_requested"):
+        """Swap to a prefetched mediator if one is pooled, otherwise fetch one from the server."""
+        mediator = self.mediator_pool.acquire() if self.mediator_pool is not None else None
+        if mediator is None:
+            self.load_mediator(requested_by)
+        else:
+            logging.info("Swapping to pooled mediator")
+            # the server only hears about the outgoing genome through this report on a pool hit
+            logging.info("\033[96mAbout to emit mediator released\033[0m")
+            self.signals.mediator_released.emit({})
+            self.set_mediator(mediator)
+
+    def load_mediator(self, requested_by: str = "mediator_manager"):
+        logging.info(f"Requesting new mediator for {requested_by}...")
         #self.signal_manager.request_new_mediator.emit()
         logging.info("\033[96mAbout to emit mediator requested\033[0m")
-        self.signals.mediator_requested.emit({}) 
+        # the collector coalesces concurrent requests and traces who asked
+        self.signals.mediator_requested.emit({"requested_by": requested_by}) 
 
     def attach_mediator(self, response : 'MediatorData'):
         logging.warning("ATTACHING MEDIATOR")
-        if not response.new_mediator:
-            logging.info("Response does not contain new_mediator")
-            pass
-        new_mediator = response.new_mediator
-        logging.info(f"New mediator json: {new_mediator}")
-        try:
-            pickled_object = base64.b64decode(new_mediator)
-        except (TypeError, ValueError):
-            assert False, "new_mediator is not a valid base64-encoded string"
-        try:
-            genome_id, deserialized_network = pickle.loads(pickled_object)
-        except pickle.UnpicklingError:
-            assert False, "new_mediator is not a valid serialized object"
-        self.current_mediator = Mediator(genome_id, deserialized_network)
+        self.set_mediator(self.decode_mediator(response))
+
+    def decode_mediator(self, response : 'MediatorData') -> Mediator:
+        cached = self.mediator_cache is not None and response.etag is not None
+        if cached:
+            mediator = self.mediator_cache.mediator(response.etag)
+            if mediator is not None:
+                logging.info(f"Reusing decoded mediator {mediator.genome_id}")
+                return mediator
+        mediator = self._decode_payload(response)
+        if cached:
+            self.mediator_cache.remember(response.etag, mediator)
+        return mediator
+
+    def _decode_payload(self, response : 'MediatorData') -> Mediator:
+        if response.frame is not None:
+            genome_id = read_frame_header(response.frame)[0]
+            cached = self.compiled_networks.get(genome_id)
+            if cached is not None:
+                return Mediator(genome_id, *cached)
+            # binary frames are read in place, without a JSON round trip
+            genome_id, network = decode_frame(response.frame)
+            mediator = Mediator(genome_id, network)
+            mediator.compile()
+            self.compiled_networks.put(genome_id, network, mediator.compiled_network)
+            return mediator
+        if response.genome is not None:
+            cached = self.compiled_networks.get(response.genome.get("genome_id"))
+            if cached is not None:
+                return Mediator(response.genome["genome_id"], *cached)
+            genome_id, network, compiled = decode_genome(response.genome)
+            self.compiled_networks.put(genome_id, network, compiled)
+            return Mediator(genome_id, network, compiled)
+        # servers still sending base64 pickles are refused: unpickling server data can run arbitrary code
+        raise GenomeSchemaError("Response carries neither a mediator frame nor a genome")
+
+    def set_mediator(self, mediator: Mediator):
+        mediator.compile()
+        self.current_mediator = mediator
+        genome_id = mediator.genome_id
         logging.info(f"Mediator attached: {genome_id}.")
+        self.request_evaluation()  # predictions of the previous mediator no longer hold
         logging.info("\033[96mAbout to emit new mediator assigned\033[0m")
         self.signals.new_mediator_assigned.emit({'genome_id': genome_id})
 
     def update_mediator(self):
+        # every tick arms the next one: back to the base interval after activity, backing off otherwise
+        self.timer_thread.schedule(self.scheduler.next_interval())
         logging.info("\033[96mAbout to emit mediator update requested\033[0m")
         self.signals.mediator_data_requested.emit()
 
@@ -181,6 +334,29 @@ class MediatorManagementModule(ISystemModule, IMediatorHandler):
     def reset_on_user_message(self):
         self.update_unanswered_count(reset=True)
 
+    def record_user_message(self, data: dict):
+        """Store the features of a user message and reset the unanswered count."""
+        message = MessageData.model_validate(data)
+        latency = None
+        if self.last_chatbot_message_time is not None:
+            latency = message.last_message_time - self.last_chatbot_message_time
+        sentiment = self.perform_sentiment_analysis(message.last_message)  # cached for the next tick
+        self.feature_store.append(message.last_message_time, sentiment, latency, self.unanswered_count)
+        self.reset_on_user_message()
+        self.request_evaluation()
+
+    def record_chatbot_message(self, data: dict):
+        """Count a chatbot message the user has not answered yet."""
+        reply = ReplyData.model_validate(data)
+        self.last_chatbot_message_time = reply.last_response_time
+        self.update_unanswered_count()
+        self.request_evaluation()
+
+    def request_evaluation(self):
+        """Evaluate as soon as possible instead of waiting for the next timer tick."""
+        self.scheduler.activity()
+        self.timer_thread.schedule(0)
+
     def normalize_input_data(self, input_data: UserData) -> list[float]:
         logging.info(f"Normalizing input data: {input_data}")
         message = input_data.last_message
@@ -189,45 +365,103 @@ class MediatorManagementModule(ISystemModule, IMediatorHandler):
 
         sentiment_score = self.perform_sentiment_analysis(message)
         logging.info(f"Sentiment score: {sentiment_score}")
-        normalized_time = self.calculate_normalized_time(last_message_time)
-        normalized_unanswered = self.calculate_normalized_unanswered()
+        normalized = normalize_features(sentiment_score, time.time() - last_message_time, self.unanswered_count)
 
-        logging.info(f"Sentiment: {sentiment_score}, normalized time: {normalized_time}, normalized_unanswered: {normalized_unanswered}")
+        logging.info(f"Sentiment: {sentiment_score}, normalized time: {normalized[1]}, normalized_unanswered: {normalized[2]}")
 
-        return [sentiment_score, normalized_time, normalized_unanswered]
+        return normalized.tolist()
     
     def perform_sentiment_analysis(self, message):
         try: 
-            sentiment_result = self.sentiment_analyzer.polarity_scores(message)
+            return self.sentiment_scorer.score(message)  # the compound score, cached per message
         except Exception as e:
             logging.error(f"Error in sentiment analysis: {e}")
             return 0.0
-        return sentiment_result['compound']  # Get the compound score
+
+    def score_messages(self, messages: list[str]) -> np.ndarray:
+        """Score a backlog of messages, e.g. a replayed transcript, scoring each distinct message once."""
+        return self.sentiment_scorer.score_batch(messages)
 
     def calculate_normalized_time(self, last_message_time):
         time_elapsed = time.time() - last_message_time
         logging.info(f"Time elapsed: {time_elapsed}")
-        max_time_interval = 5 * 60
-        return time_elapsed / max_time_interval
+        return float(normalize_features(0.0, time_elapsed, 0)[1])
 
     def calculate_normalized_unanswered(self):
-        # the more unanswered messages, the less urgent it is to intervene (going from 1 to 0)
         logging.info(f"Unanswered count: {self.unanswered_count}")
-        normalized_count = np.log1p(self.unanswered_count)
-        logging.info(f"Normalized unanswered count: {normalized_count}")
-        max_log_count = np.log1p(10)  # Assume a max reasonable count to normalize against
-        return 1 - (normalized_count / max_log_count)
+        return float(normalize_features(0.0, 0.0, self.unanswered_count)[2])
+
+    def evaluate_batch(self, rows: np.ndarray, mediator: Mediator = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Push many raw feature rows through a mediator in one vectorized call.
+
+        Rows are normalized with `normalize_features`, the same code as the live path, so offline 
+        and online results agree.
+
+        Args:
+            rows (np.ndarray): An (N, 3) array of [sentiment, seconds since the last message, unanswered count].
+            mediator (Mediator): The mediator to evaluate, defaults to the current one.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The (N, outputs) outputs and the (N,) argmax indices.
+
+        Raises:
+            ValueError: If `rows` is not (N, 3) or there is no mediator to evaluate.
+        """
+        rows = np.asarray(rows, dtype=np.float64)
+        if rows.ndim != 2 or rows.shape[1] != 3:
+            raise ValueError(f"Expected an (N, 3) array, got {rows.shape}")
+        mediator = mediator or self.current_mediator
+        if mediator is None:
+            raise ValueError("No mediator to evaluate")
+        mediator.compile()
+        return mediator.evaluate_batch(normalize_features(rows[:, 0], rows[:, 1], rows[:, 2]))
     
     def process_input(self, input_data: UserData) -> tuple[str, bool]:
         if input_data.last_message_time == None:
             logging.info("No message to process")
             return None, False
         normalized_input_data = self.normalize_input_data(input_data)
+        if not self.scheduler.should_evaluate(self.current_mediator, normalized_input_data):
+            logging.info("Mediator input unchanged, skipping evaluation")
+            return None, False
         biggest_output, index = self.current_mediator.process_input(normalized_input_data)
         logging.info(f"Biggest output: {biggest_output}, index: {index}")
         message, internal = self.get_message_and_type(index)
-        if biggest_output >= 0.5:
+        if biggest_output >= INTERVENTION_THRESHOLD:
             self.send_message(message, internal)
+            self.scheduler.predict(None)
+        else:
+            self.schedule_predicted_crossing(normalized_input_data)
+
+    def predict_crossing(self, normalized_input_data: list[float]) -> float:
+        """
+        Predict when the current mediator will intervene if nothing but time changes.
+
+        Sentiment and the unanswered count stay fixed while the user is idle, so the mediator is 
+        evaluated over the scheduler's look-ahead offsets in one batch.
+
+        Args:
+            normalized_input_data (list[float]): The inputs evaluated now.
+
+        Returns:
+            float: Seconds until the biggest output first reaches the threshold, None if it does not
+                within the look-ahead horizon.
+        """
+        offsets = self.scheduler.lookahead_offsets()
+        rows = np.tile(np.asarray(normalized_input_data, dtype=np.float64), (len(offsets), 1))
+        rows[:, 1] += offsets / MAX_TIME_INTERVAL  # the normalized time grows linearly
+        outputs, _ = self.current_mediator.evaluate_batch(rows)
+        crossings = np.flatnonzero(outputs.max(axis=1) >= INTERVENTION_THRESHOLD)
+        return float(offsets[crossings[0]]) if len(crossings) else None
+
+    def schedule_predicted_crossing(self, normalized_input_data: list[float]):
+        """Arm the timer for the predicted crossing instead of polling towards it."""
+        crossing = self.predict_crossing(normalized_input_data)
+        self.scheduler.predict(crossing)
+        if crossing is not None:
+            logging.info(f"Mediator predicted to intervene in {crossing:.2f}s")
+            self.timer_thread.schedule(crossing)
 
     def send_message(self, message: str, internal: bool):
         logging.info("\033[96mAbout to emit mediator msg ready\033[0m")
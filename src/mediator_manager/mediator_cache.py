@@ -0,0 +1,237 @@
+# src/mediator_manager/mediator_cache.py
+"""
+mediator_cache.py
+
+This module contains the MediatorCache class, a content-addressed cache of
+mediators the server has already sent.
+
+Payloads are stored on disk under the SHA-256 of their bytes, together with
+an index that maps each entry's ETag to its hash, content type and genome
+id. Decoded mediators are additionally kept in a small in-memory LRU, so a
+repeat assignment skips decoding as well as the download.
+
+Swap requests send the ETags of the most recently used entries in
+`If-None-Match`; a server that wants to assign one of them answers
+`304 Not Modified` with that entry's `ETag`, and the payload is read from
+disk instead of the wire. The on-disk store is bounded by `max_bytes` and
+evicts least recently used entries first.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from src.mediator_manager.manager import Mediator
+
+CURRENT_PATH = os.getcwd()
+
+
+class MediatorCache:
+    """
+    An on-disk plus in-memory LRU cache of mediators, keyed by ETag and content hash.
+
+    Args:
+        directory (str): Directory holding the payload files and the index.
+        max_bytes (int): Upper bound for the payloads on disk.
+        max_entries (int): Number of decoded mediators kept in memory.
+        max_etags (int): Number of ETags offered to the server per request.
+
+    Attributes:
+        hits (int): Number of 304 answers served from the cache.
+        decode_hits (int): Number of decodes skipped thanks to the in-memory LRU.
+        evicted (int): Number of entries evicted from disk.
+    """
+
+    def __init__(self, directory: str = os.path.join(CURRENT_PATH, "mediator_cache"),
+                 max_bytes: int = 64 * 1024 * 1024, max_entries: int = 8, max_etags: int = 16):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_etags = max_etags
+        self.hits = 0
+        self.decode_hits = 0
+        self.evicted = 0
+        self._index: OrderedDict[str, dict] = OrderedDict()  # etag -> entry, least recently used first
+        self._decoded: OrderedDict[str, 'Mediator'] = OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def configure(self, config: dict):
+        """Apply `directory`, `max_bytes`, `max_entries` and `max_etags` from the given configuration."""
+        self.directory = config.get("directory", self.directory)
+        self.max_bytes = config.get("max_bytes", self.max_bytes)
+        self.max_entries = config.get("max_entries", self.max_entries)
+        self.max_etags = config.get("max_etags", self.max_etags)
+
+    def load(self):
+        """Read the index left by a previous run, dropping entries whose payload is gone."""
+        with self._lock:
+            self._read_index()
+
+    def etags(self) -> list[str]:
+        """Return the ETags of the most recently used entries, newest first."""
+        with self._lock:
+            self._ensure_loaded()
+            return list(reversed(self._index))[:self.max_etags]
+
+    def store(self, content_type: str, payload: bytes, etag: Optional[str] = None,
+              genome_id: Optional[int] = None) -> str:
+        """
+        Add a payload the server sent.
+
+        Args:
+            content_type (str): The response content type, needed to decode the payload later.
+            payload (bytes): The response body.
+            etag (Optional[str]): The server's ETag; the quoted content hash is used if omitted.
+            genome_id (Optional[int]): The genome id, if it is known before decoding.
+
+        Returns:
+            str: The ETag the entry is stored under.
+        """
+        digest = hashlib.sha256(payload).hexdigest()
+        etag = etag or f'"{digest}"'
+        with self._lock:
+            self._ensure_loaded()
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._payload_path(digest)
+            if not os.path.exists(path):
+                # content-addressed, so a payload already on disk is never written twice
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp, path)
+            entry = self._index.pop(etag, None) or {}
+            entry.update({"etag": etag, "hash": digest, "content_type": content_type, "size": len(payload)})
+            if genome_id is not None:
+                entry["genome_id"] = genome_id
+            self._index[etag] = entry
+            self._evict()
+            self._save_index()
+        return etag
+
+    def payload(self, etag: str) -> Optional[tuple[str, bytes]]:
+        """
+        Return the content type and payload stored under `etag`, or None if it is not cached.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._index.get(etag)
+            if entry is None:
+                return None
+            try:
+                with open(self._payload_path(entry["hash"]), "rb") as f:
+                    payload = f.read()
+            except FileNotFoundError:
+                del self._index[etag]
+                self._save_index()
+                return None
+            self._index.move_to_end(etag)
+            self.hits += 1
+            self._save_index()
+            return entry["content_type"], payload
+
+    def mediator(self, etag: str) -> Optional['Mediator']:
+        """Return the decoded mediator for `etag` if it is still in memory."""
+        with self._lock:
+            mediator = self._decoded.get(etag)
+            if mediator is not None:
+                self._decoded.move_to_end(etag)
+                self.decode_hits += 1
+            return mediator
+
+    def remember(self, etag: str, mediator: 'Mediator'):
+        """Keep a decoded mediator in memory and record its genome id."""
+        with self._lock:
+            self._decoded[etag] = mediator
+            self._decoded.move_to_end(etag)
+            while len(self._decoded) > self.max_entries:
+                self._decoded.popitem(last=False)
+            entry = self._index.get(etag)
+            if entry is not None and entry.get("genome_id") != mediator.genome_id:
+                entry["genome_id"] = mediator.genome_id
+                self._save_index()
+
+    def etag_for(self, genome_id: int) -> Optional[str]:
+        """Return the ETag of the most recently used entry for `genome_id`."""
+        with self._lock:
+            for etag in reversed(self._index):
+                if self._index[etag].get("genome_id") == genome_id:
+                    return etag
+        return None
+
+    def invalidate(self, genome_id: int) -> int:
+        """
+        Drop every entry for `genome_id`.
+
+        Returns:
+            int: The number of entries dropped.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            stale = [etag for etag, entry in self._index.items() if entry.get("genome_id") == genome_id]
+            for etag in stale:
+                self._remove(etag)
+            if stale:
+                self._save_index()
+        return len(stale)
+
+    def stats(self) -> dict:
+        """Return the cache size and its hit and eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "decoded": len(self._decoded),
+                "bytes": sum(entry["size"] for entry in self._index.values()),
+                "hits": self.hits,
+                "decode_hits": self.decode_hits,
+                "evicted": self.evicted,
+            }
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._read_index()
+
+    def _read_index(self):
+        try:
+            with open(self._index_path()) as f:
+                entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            entries = []
+        self._index = OrderedDict(
+            (entry["etag"], entry) for entry in entries if os.path.exists(self._payload_path(entry["hash"]))
+        )
+        self._loaded = True
+        logging.info(f"Mediator cache loaded with {len(self._index)} entries")
+
+    def _evict(self):
+        total = sum(entry["size"] for entry in self._index.values())
+        while total > self.max_bytes and len(self._index) > 1:
+            etag = next(iter(self._index))
+            total -= self._index[etag]["size"]
+            self._remove(etag)
+            self.evicted += 1
+
+    def _remove(self, etag: str):
+        entry = self._index.pop(etag)
+        self._decoded.pop(etag, None)
+        if not any(other["hash"] == entry["hash"] for other in self._index.values()):
+            try:
+                os.remove(self._payload_path(entry["hash"]))
+            except FileNotFoundError:
+                pass
+
+    def _save_index(self):
+        tmp = self._index_path() + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(list(self._index.values()), f)
+        os.replace(tmp, self._index_path())
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, "index.json")
+
+    def _payload_path(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{digest}.bin")
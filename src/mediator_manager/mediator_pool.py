@@ -0,0 +1,163 @@
+# src/mediator_manager/mediator_pool.py
+"""
+mediator_pool.py
+
+This module contains the MediatorPool class, a bounded pool of prefetched,
+already decoded mediators. Swapping to a pooled mediator is a local pointer
+exchange; the pool refills itself on a background thread whenever it drops
+to its low watermark. Once shut down the pool ignores `acquire` and `refill`
+until `start` is called again.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from src.interfaces.data_models import MediatorData
+    from src.mediator_manager.manager import Mediator
+
+
+class MediatorPool:
+    """
+    A bounded pool of ready-to-run mediators.
+
+    Args:
+        fetch (Callable[[], Optional[MediatorData]]): Fetches one serialized mediator, None on failure.
+        decode (Callable[[MediatorData], Mediator]): Turns a serialized mediator into a runnable one.
+        size (int): Number of mediators the pool tries to hold.
+        low_watermark (int): A refill starts once the pool holds this many mediators or fewer.
+        max_age (float): Seconds after which a pooled mediator is considered stale and dropped.
+
+    Attributes:
+        hits (int): Number of `acquire` calls served from the pool.
+        misses (int): Number of `acquire` calls that found the pool empty.
+        expired (int): Number of mediators dropped for being stale.
+    """
+
+    def __init__(self, fetch: Callable[[], Optional['MediatorData']], decode: Callable[['MediatorData'], 'Mediator'],
+                 size: int = 2, low_watermark: int = 1, max_age: float = 600.0):
+        self.fetch = fetch
+        self.decode = decode
+        self.size = size
+        self.low_watermark = low_watermark
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._entries: deque[tuple[float, 'Mediator']] = deque()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._refill: Optional[Future] = None
+        self._stopped = threading.Event()
+
+    def configure(self, config: dict):
+        """Apply `size`, `low_watermark` and `max_age` from the given configuration."""
+        self.size = config.get("size", self.size)
+        self.low_watermark = config.get("low_watermark", self.low_watermark)
+        self.max_age = config.get("max_age", self.max_age)
+
+    def acquire(self) -> Optional['Mediator']:
+        """
+        Take a fresh mediator out of the pool and trigger a refill if needed.
+
+        Returns:
+            Optional[Mediator]: A ready-to-run mediator, or None if the pool is empty or shut down.
+        """
+        if self._stopped.is_set():
+            return None
+        with self._lock:
+            self._drop_stale()
+            mediator = self._entries.popleft()[1] if self._entries else None
+            if mediator is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            remaining = len(self._entries)
+        if remaining <= self.low_watermark:
+            self.refill()
+        return mediator
+
+    def start(self) -> Optional[Future]:
+        """Re-enable a shut down pool and start filling it."""
+        if self._stopped.is_set():
+            # a fresh flag, so a fill left over from before the shutdown stays stopped
+            self._stopped = threading.Event()
+        return self.refill()
+
+    def refill(self) -> Optional[Future]:
+        """
+        Top the pool up to `size` on the background thread.
+
+        Returns:
+            Optional[Future]: The refill in progress (an already running refill is reused), 
+            or None if the pool is shut down.
+        """
+        if self._stopped.is_set():
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mediator-pool")
+            if self._refill is None or self._refill.done():
+                self._refill = self._executor.submit(self._fill, self._stopped)
+            return self._refill
+
+    def stats(self) -> dict:
+        """Return the pool size and its hit, miss and expiry counters."""
+        with self._lock:
+            return {
+                "available": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+            }
+
+    def clear(self):
+        """Drop every pooled mediator."""
+        with self._lock:
+            self._entries.clear()
+
+    def shutdown(self):
+        """
+        Stop refilling and drop every pooled mediator.
+
+        A fetch already on the wire is left to finish, but its result is 
+        thrown away; `_fill` checks the stop flag before and after each fetch.
+        """
+        self._stopped.set()
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._refill = None
+            self._entries.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fill(self, stopped: threading.Event):
+        # stale entries are only dropped in `acquire`, so a short `max_age` cannot make this loop forever
+        while not stopped.is_set():
+            with self._lock:
+                if len(self._entries) >= self.size:
+                    return
+            mediator_data = self.fetch()
+            if mediator_data is None:
+                logging.warning("Mediator pool refill stopped: fetch failed")
+                return
+            try:
+                mediator = self.decode(mediator_data)
+            except Exception as e:
+                logging.error(f"Mediator pool could not decode mediator: {e}")
+                return
+            with self._lock:
+                if stopped.is_set():
+                    return
+                self._entries.append((time.monotonic(), mediator))
+                available = len(self._entries)
+            logging.info(f"Mediator pool holds {available} mediators")
+
+    def _drop_stale(self):
+        cutoff = time.monotonic() - self.max_age
+        while self._entries and self._entries[0][0] < cutoff:
+            self._entries.popleft()
+            self.expired += 1
@@ -0,0 +1,157 @@
+# src/mediator_manager/scheduler.py
+"""
+scheduler.py
+
+This module contains the EvaluationScheduler class, which decides when the
+mediator evaluates its inputs instead of a fixed 10 second poll.
+
+    activity     a user or chatbot message asks for an immediate evaluation
+                 and resets the interval to `base_interval`
+    idle ticks   every tick without activity since the previous one doubles
+                 the interval, up to `max_interval`
+    unchanged    an input vector within `tolerance` of the last evaluated one
+                 (for the same mediator) is skipped
+    prediction   while the user is idle only the time input changes, so the
+                 manager evaluates `lookahead_offsets` ahead in one batch and
+                 `predict` replaces the polling ticks with a single tick at
+                 the first threshold crossing
+
+The scheduler only keeps the policy and counters; MediatorTimerThread owns
+the timer and the manager reschedules it with `next_interval`.
+"""
+import threading
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+class EvaluationScheduler:
+    """
+    Adaptive evaluation policy with counters.
+
+    Args:
+        base_interval (float): Seconds between evaluations while the conversation is active.
+        max_interval (float): Upper bound for the interval during inactivity.
+        backoff (float): Factor the interval grows by per idle tick.
+        tolerance (float): Largest input change still treated as unchanged.
+        lookahead_horizon (float): How many seconds ahead crossings are predicted.
+        lookahead_resolution (float): Spacing of the predicted offsets in seconds.
+
+    Attributes:
+        executed (int): Evaluations run.
+        skipped (int): Evaluations skipped because the input vector was unchanged.
+        immediate (int): Evaluations requested by activity instead of the timer.
+        predicted (int): Ticks armed for a predicted threshold crossing.
+    """
+
+    def __init__(self, base_interval: float = 10.0, max_interval: float = 160.0, backoff: float = 2.0,
+                 tolerance: float = 1e-3, lookahead_horizon: float = 300.0, lookahead_resolution: float = 0.25):
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.lookahead_horizon = lookahead_horizon
+        self.lookahead_resolution = lookahead_resolution
+        self.interval = base_interval
+        self.executed = 0
+        self.skipped = 0
+        self.immediate = 0
+        self.predicted = 0
+        self._deadline: Optional[float] = None  # monotonic time of the predicted crossing
+        self._active = False
+        self._last: Optional[tuple[object, np.ndarray]] = None
+        self._lock = threading.Lock()
+
+    def configure(self, config: dict):
+        """Apply the constructor arguments found in the given configuration."""
+        self.base_interval = config.get("base_interval", self.base_interval)
+        self.max_interval = config.get("max_interval", self.max_interval)
+        self.backoff = config.get("backoff", self.backoff)
+        self.tolerance = config.get("tolerance", self.tolerance)
+        self.lookahead_horizon = config.get("lookahead_horizon", self.lookahead_horizon)
+        self.lookahead_resolution = config.get("lookahead_resolution", self.lookahead_resolution)
+        self.interval = self.base_interval
+
+    def activity(self):
+        """Record a new message: the next tick comes immediately and the interval starts over."""
+        with self._lock:
+            self._active = True
+            self._deadline = None  # predicted from inputs that are now out of date
+            self.immediate += 1
+
+    def next_interval(self) -> float:
+        """
+        Called on every tick; returns the seconds until the next one.
+
+        Returns:
+            float: `base_interval` after activity, otherwise the previous interval times `backoff`;
+                or the time left until a pending predicted crossing.
+        """
+        with self._lock:
+            if self._active:
+                self.interval = self.base_interval
+                self._active = False
+            else:
+                self.interval = min(self.interval * self.backoff, self.max_interval)
+            if self._deadline is not None:
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    return remaining
+                self._deadline = None  # this is the tick it was armed for
+            return self.interval
+
+    def lookahead_offsets(self) -> np.ndarray:
+        """Seconds from now at which the manager evaluates the mediator ahead of time."""
+        return np.arange(1, int(self.lookahead_horizon / self.lookahead_resolution) + 1) * self.lookahead_resolution
+
+    def predict(self, seconds: Optional[float]):
+        """
+        Record the predicted threshold crossing, replacing the previous prediction.
+
+        Args:
+            seconds (Optional[float]): Seconds until the crossing, None if none is expected within the horizon.
+        """
+        with self._lock:
+            if seconds is None:
+                self._deadline = None
+                return
+            self._deadline = time.monotonic() + seconds
+            self.predicted += 1
+
+    def should_evaluate(self, mediator: object, inputs: Sequence[float]) -> bool:
+        """
+        Decide whether `inputs` differ enough from the last evaluated vector, and count the decision.
+
+        Args:
+            mediator (object): The mediator that would evaluate; a different one always evaluates.
+            inputs (Sequence[float]): The normalized input vector.
+        """
+        vector = np.asarray(inputs, dtype=np.float64)
+        with self._lock:
+            if self._last is not None and self._last[0] is mediator and \
+                    np.abs(vector - self._last[1]).max(initial=0.0) <= self.tolerance:
+                self.skipped += 1
+                return False
+            self._last = (mediator, vector)
+            self.executed += 1
+            return True
+
+    def reset(self):
+        """Forget the last evaluated vector and start over from `base_interval`."""
+        with self._lock:
+            self._last = None
+            self._deadline = None
+            self._active = False
+            self.interval = self.base_interval
+
+    def stats(self) -> dict:
+        """Return the evaluation counters and the current interval."""
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "skipped": self.skipped,
+                "immediate": self.immediate,
+                "predicted": self.predicted,
+                "interval": self.interval,
+            }
@@ -0,0 +1,229 @@
+# src/mediator_manager/sentiment.py
+"""
+sentiment.py
+
+This module contains the SentimentScorer class, which memoizes the compound
+sentiment scores the mediator feeds into its network.
+
+The mediator timer scores the last message on every tick, usually the same
+text as on the previous tick. Scores are kept in a bounded LRU keyed by a
+hash of the message text, so a repeated message costs one dictionary lookup
+instead of a VADER pass, and the cache never holds the messages themselves.
+`score_batch` scores a backlog of messages, such as a replayed transcript,
+scoring every distinct message once.
+
+The analyzer is built on first use: importing `nltk.sentiment` and parsing
+the VADER lexicon takes a noticeable part of client startup. `warm_up` builds
+it ahead of time, in the calling thread or with `warm_up_in_background`.
+
+Two backends are available through `SENTIMENT_BACKENDS`: "vader", nltk's
+analyzer, and "lexicon", the LexiconSentimentEngine compiled from it, which
+scores batches with NumPy and matches VADER's compound score within its
+documented `TOLERANCE`.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    from src.mediator_manager.lexicon_engine import LexiconSentimentEngine
+
+
+def load_vader() -> 'SentimentIntensityAnalyzer':
+    """Build the VADER analyzer, importing nltk only now."""
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+
+def load_lexicon_engine() -> 'LexiconSentimentEngine':
+    """Compile the VADER lexicon into the batch scoring engine."""
+    from src.mediator_manager.lexicon_engine import LexiconSentimentEngine
+    return LexiconSentimentEngine.from_vader(load_vader())
+
+
+SENTIMENT_BACKENDS: dict[str, Callable[[], object]] = {
+    "vader": load_vader,
+    "lexicon": load_lexicon_engine,
+}
+
+
+class SentimentScorer:
+    """
+    Compound sentiment scores with a bounded memo cache.
+
+    Args:
+        analyzer_factory (Callable[[], SentimentIntensityAnalyzer]): Builds the analyzer computing 
+            uncached scores, called once on first use.
+        max_entries (int): Number of scores kept in the cache.
+
+    Attributes:
+        hits (int): Number of scores served from the cache.
+        misses (int): Number of scores computed by the analyzer.
+        warm_up_seconds (Optional[float]): How long building the analyzer took, once it is built.
+    """
+
+    def __init__(self, analyzer_factory: Callable[[], 'SentimentIntensityAnalyzer'] = load_vader,
+                 max_entries: int = 1024):
+        self.analyzer_factory = analyzer_factory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.warm_up_seconds: Optional[float] = None
+        self._analyzer: Optional['SentimentIntensityAnalyzer'] = None
+        self._analyzer_lock = threading.Lock()
+        self._scores: OrderedDict[bytes, float] = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+
+    @property
+    def analyzer(self) -> 'SentimentIntensityAnalyzer':
+        """The analyzer, built on first access; concurrent first accesses wait for the same build."""
+        if self._analyzer is None:
+            with self._analyzer_lock:
+                if self._analyzer is None:
+                    start = time.perf_counter()
+                    self._analyzer = self.analyzer_factory()
+                    self.warm_up_seconds = time.perf_counter() - start
+                    logging.info(f"Sentiment analyzer ready after {self.warm_up_seconds:.3f}s")
+        return self._analyzer
+
+    def warm_up(self):
+        """Build the analyzer now, or wait for a warm-up already in progress."""
+        self.analyzer
+
+    def warm_up_in_background(self) -> threading.Thread:
+        """Build the analyzer on a daemon thread; `warm_up` later waits for it."""
+        thread = threading.Thread(target=self._warm_up_quietly, name="sentiment-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def _warm_up_quietly(self):
+        try:
+            self.warm_up()
+        except Exception as e:
+            # scoring retries the build and reports the error where it can be handled
+            logging.error(f"Sentiment analyzer warm-up failed: {e}")
+
+    def configure(self, config: dict):
+        """Apply `max_entries` from the given configuration."""
+        self.max_entries = config.get("max_entries", self.max_entries)
+        with self._lock:
+            self._trim()
+
+    def set_backend(self, name: str):
+        """
+        Switch to one of `SENTIMENT_BACKENDS`; the new analyzer is built on next use.
+
+        Raises:
+            ValueError: If there is no backend called `name`.
+        """
+        if name not in SENTIMENT_BACKENDS:
+            raise ValueError(f"Unknown sentiment backend {name!r}, expected one of {sorted(SENTIMENT_BACKENDS)}")
+        factory = SENTIMENT_BACKENDS[name]
+        if factory is self.analyzer_factory:
+            return
+        with self._analyzer_lock:
+            self.analyzer_factory = factory
+            self._analyzer = None
+            self.warm_up_seconds = None
+        self.clear()  # scores of the previous backend may differ slightly
+        logging.info(f"Sentiment backend set to {name}")
+
+    def score(self, text: str) -> float:
+        """
+        Return the compound score of `text`, from the cache if it was scored before.
+
+        Raises:
+            Exception: Whatever the analyzer raises for text it cannot score.
+        """
+        key = self._key(text)
+        with self._lock:
+            score = self._lookup(key)
+        if score is None:
+            score = self.analyzer.polarity_scores(text)["compound"]
+            with self._lock:
+                self._store(key, score)
+        return score
+
+    def score_batch(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        Score many messages at once, computing each distinct uncached message once.
+
+        Args:
+            texts (Iterable[str]): The messages to score.
+
+        Returns:
+            np.ndarray: The compound score of every message, in order.
+        """
+        texts = list(texts)
+        keys = [self._key(text) for text in texts]
+        scores = np.empty(len(keys), dtype=np.float64)
+        missing: dict[bytes, list[int]] = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in missing:
+                    missing[key].append(i)
+                    continue
+                score = self._lookup(key)
+                if score is None:
+                    missing[key] = [i]
+                else:
+                    scores[i] = score
+        if not missing:
+            return scores
+        analyzer = self.analyzer
+        distinct = [texts[positions[0]] for positions in missing.values()]
+        if hasattr(analyzer, "compound_batch"):
+            computed = analyzer.compound_batch(distinct)
+        else:
+            computed = [analyzer.polarity_scores(text)["compound"] for text in distinct]
+        with self._lock:
+            for (key, positions), score in zip(missing.items(), computed):
+                scores[positions] = score
+                self._store(key, float(score))
+                self.hits += len(positions) - 1  # repeats within the batch
+        return scores
+
+    def stats(self) -> dict:
+        """Return the cache size and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._scores),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "warm_up_seconds": self.warm_up_seconds,
+            }
+
+    def clear(self):
+        """Drop every cached score."""
+        with self._lock:
+            self._scores.clear()
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _lookup(self, key: bytes):
+        score = self._scores.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self._scores.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def _store(self, key: bytes, score: float):
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        self._trim()
+
+    def _trim(self):
+        while len(self._scores) > self.max_entries:
+            self._scores.popitem(last=False)
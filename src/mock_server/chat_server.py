@@ -0,0 +1,233 @@
+# src/mock_server/chat_server.py
+"""
+chat_server.py
+
+This module contains MockChatServer, a local stand-in for an OpenAI-compatible
+chat-completions API, used by the tests and benchmarks of
+`ChatCompletionsService`. It serves:
+
+- `GET /v1/models` listing the configured models.
+- `POST /v1/chat/completions` answering with a deterministic reply that
+  echoes the last user message, after an injectable latency. With
+  `"stream": true` the reply is sent as server-sent `chat.completion.chunk`
+  events, one word per event `token_delay` seconds apart, ending in
+  `data: [DONE]`.
+
+Requests without the configured bearer token are refused with 401, like the
+real API. The server can also be started on its own:
+
+    python -m src.mock_server.chat_server --port 8001 --latency 0.2
+"""
+import argparse
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class MockChatServer:
+    """
+    A threaded HTTP server imitating an OpenAI-compatible chat-completions endpoint.
+
+    Args:
+        host (str): Interface to bind to.
+        port (int): Port to bind to; 0 picks a free one.
+        latency (float): Seconds every completion is delayed by, before its first token when streaming.
+        token_delay (float): Seconds between streamed words.
+        models (Optional[list[str]]): Model ids reported by `/v1/models`.
+        api_key (Optional[str]): The bearer token required, None accepts any request.
+
+    Attributes:
+        requests (dict): Number of requests per route.
+        completions (list[dict]): The request bodies of every completion, oldest first.
+        connections (int): Number of TCP connections accepted.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, token_delay: float = 0.0,
+                 models: Optional[list[str]] = None, api_key: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.token_delay = token_delay
+        self.models = models or ["mock-gpt"]
+        self.api_key = api_key
+        self.requests: dict[str, int] = {}
+        self.completions: list[dict] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def start(self) -> str:
+        """
+        Start serving on a background thread.
+
+        Returns:
+            str: The base URL of the API, ending in `/v1`.
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), _ChatRequestHandler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-chat-server", daemon=True)
+        self._thread.start()
+        logging.info(f"Mock chat server listening on {self.url}")
+        return self.url
+
+    def stop(self):
+        """Stop serving and release the port."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = self._thread = None
+
+    def stats(self) -> dict:
+        """Return the request and connection counters."""
+        with self._lock:
+            return {"requests": dict(self.requests), "completions": len(self.completions),
+                    "connections": self.connections}
+
+    def count(self, route: str):
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def complete(self, request: dict) -> dict:
+        """
+        Answer a chat-completions request.
+
+        Returns:
+            dict: A chat-completions response whose reply echoes the last user message.
+        """
+        with self._lock:
+            self.completions.append(request)
+            number = len(self.completions)
+        user_messages = [message["content"] for message in request.get("messages", []) if message.get("role") == "user"]
+        content = self.reply_for(user_messages[-1] if user_messages else "")
+        return {
+            "id": f"chatcmpl-mock-{number}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", self.models[0]),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(content.split()), "total_tokens": len(content.split())},
+        }
+
+    def chunks(self, completion: dict) -> list[dict]:
+        """Split a completion into the `chat.completion.chunk` events streamed for it, one word each."""
+        words = completion["choices"][0]["message"]["content"].split(" ")
+        deltas = [{"role": "assistant"}] + [{"content": word if i == 0 else " " + word} for i, word in enumerate(words)]
+        chunks = [{"index": 0, "delta": delta, "finish_reason": None} for delta in deltas]
+        chunks.append({"index": 0, "delta": {}, "finish_reason": "stop"})
+        return [{"id": completion["id"], "object": "chat.completion.chunk", "created": completion["created"],
+                 "model": completion["model"], "choices": [choice]} for choice in chunks]
+
+    @staticmethod
+    def reply_for(message: str) -> str:
+        """The reply the server gives to `message`."""
+        return f"You said: {message}"
+
+
+class _ChatRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    @property
+    def mock(self) -> MockChatServer:
+        return self.server.mock
+
+    def setup(self):
+        super().setup()
+        with self.mock._lock:
+            self.mock.connections += 1
+
+    def do_GET(self):
+        route = self.path.strip("/")
+        self.mock.count(route)
+        if not self._authorized():
+            return
+        if route == "v1/models":
+            self._reply_json(200, {"object": "list", "data": [{"id": model, "object": "model"}
+                                                              for model in self.mock.models]})
+        else:
+            self._reply_json(404, {"error": {"message": f"Unknown route /{route}"}})
+
+    def do_POST(self):
+        route = self.path.strip("/")
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.mock.count(route)
+        if not self._authorized():
+            return
+        if route != "v1/chat/completions":
+            self._reply_json(404, {"error": {"message": f"Unknown route /{route}"}})
+            return
+        try:
+            request = json.loads(body)
+        except ValueError:
+            self._reply_json(400, {"error": {"message": "Body is not JSON"}})
+            return
+        if self.mock.latency:
+            time.sleep(self.mock.latency)
+        completion = self.mock.complete(request)
+        if request.get("stream"):
+            self._stream(self.mock.chunks(completion))
+        else:
+            self._reply_json(200, completion)
+
+    def _stream(self, chunks: list[dict]):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")  # one HTTP chunk per event, so clients see it at once
+        self.end_headers()
+        try:
+            for i, chunk in enumerate(chunks):
+                if i > 1 and self.mock.token_delay:
+                    time.sleep(self.mock.token_delay)
+                self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self._write_chunk(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # the client went away
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+    def _authorized(self) -> bool:
+        if self.mock.api_key is None or self.headers.get("Authorization") == f"Bearer {self.mock.api_key}":
+            return True
+        self._reply_json(401, {"error": {"message": "Invalid API key"}})
+        return False
+
+    def _reply_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug(f"Mock chat server: {format % args}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the local stand-in chat-completions API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every completion")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed words")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    server = MockChatServer(args.host, args.port, args.latency, args.token_delay)
+    server.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
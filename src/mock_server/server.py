@@ -0,0 +1,373 @@
+# src/mock_server/server.py
+"""
+server.py
+
+This module contains MockMediatorServer, a local stand-in for the mediator
+evolution server. It serves the same routes the NetworkHandler talks to:
+
+- `POST /request_new_mediator` hands out genomes from a fixed population of
+  real NEAT feed-forward networks, round robin. It answers with a binary
+  mediator frame or with a JSON genome (see `genome_schema`), whichever the
+  `Accept` header prefers, and with `304 Not Modified` when the genome's
+  ETag is listed in `If-None-Match`.
+- `POST /user_data` accepts plain or gzip-compressed JSON and drops repeated
+  `Idempotency-Key`s.
+- `GET /mediator_events` is a server-sent events stream; `push_mediator` and
+  `push_invalidation` publish to it, and reconnecting clients get every
+  event after their `Last-Event-ID` replayed.
+- `HEAD /` answers the connection pool warm-up.
+
+Every POST can be delayed by an injectable latency. NetworkHandler runs
+against an in-process instance in mock mode; the server can also be started
+on its own:
+
+    python -m src.mock_server.server --port 8000 --hidden-nodes 32 --latency 0.05
+"""
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from neat.activations import sigmoid_activation, tanh_activation
+from neat.aggregations import sum_aggregation
+from neat.nn import FeedForwardNetwork
+
+from src.mediator_manager.genome_codec import FRAME_CONTENT_TYPE, encode_frame
+from src.mediator_manager.genome_schema import encode_genome
+
+NUM_INPUTS = 3  # sentiment, normalized time, normalized unanswered count
+NUM_OUTPUTS = 4  # calm, angry, funny, poke
+
+
+def make_network(rng: random.Random, hidden_nodes: int, hidden_layers: int = 1) -> FeedForwardNetwork:
+    """
+    Build a random network of fully connected hidden layers.
+
+    Args:
+        rng (random.Random): Source of the weights and biases.
+        hidden_nodes (int): Size of each hidden layer.
+        hidden_layers (int): Number of hidden layers.
+
+    Returns:
+        FeedForwardNetwork: A network with the client's 3 inputs and 4 outputs.
+    """
+    inputs = [-(i + 1) for i in range(NUM_INPUTS)]
+    outputs = list(range(NUM_OUTPUTS))
+    node_evals = []
+    previous = inputs
+    next_key = NUM_OUTPUTS
+    for _ in range(hidden_layers if hidden_nodes else 0):
+        layer = list(range(next_key, next_key + hidden_nodes))
+        next_key += hidden_nodes
+        for node in layer:
+            links = [(i, rng.uniform(-2.0, 2.0)) for i in previous]
+            node_evals.append((node, tanh_activation, sum_aggregation, rng.uniform(-1.0, 1.0), 1.0, links))
+        previous = layer
+    for node in outputs:
+        links = [(h, rng.uniform(-2.0, 2.0)) for h in previous]
+        node_evals.append((node, sigmoid_activation, sum_aggregation, rng.uniform(-1.0, 1.0), 1.0, links))
+    return FeedForwardNetwork(inputs, outputs, node_evals)
+
+
+class MockMediatorServer:
+    """
+    A threaded HTTP server imitating the mediator evolution server.
+
+    Args:
+        host (str): Interface to bind to.
+        port (int): Port to bind to; 0 picks a free one.
+        population (int): Number of genomes handed out round robin.
+        hidden_nodes (int): Hidden layer size of every network.
+        latency (float): Seconds every POST is delayed by.
+        seed (int): Seed for the generated networks.
+        binary_frames (bool): Whether to offer binary frames; False imitates an old JSON-only server.
+
+    Attributes:
+        requests (dict): Number of requests per route.
+        not_modified (int): Number of 304 answers.
+        duplicates (int): Number of uploads dropped for a repeated idempotency key.
+        records (int): Number of user data records received.
+        heartbeat (float): Seconds between keep-alive comments on idle event streams.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, population: int = 8,
+                 hidden_nodes: int = 8, latency: float = 0.0, seed: int = 0, binary_frames: bool = True):
+        self.host = host
+        self.port = port
+        self.population = population
+        self.hidden_nodes = hidden_nodes
+        self.latency = latency
+        self.seed = seed
+        self.binary_frames = binary_frames
+        self.requests: dict[str, int] = {}
+        self.not_modified = 0
+        self.duplicates = 0
+        self.records = 0
+        self._payloads: list[dict[str, tuple[bytes, str]]] = []  # per genome: content type -> (body, etag)
+        self._next_genome = 0
+        self._seen_keys: set[str] = set()
+        self._lock = threading.Lock()
+        self.heartbeat = 15.0
+        self._events: list[tuple[int, str, str]] = []  # (id, event type, JSON data)
+        self._events_changed = threading.Condition(self._lock)
+        self._stream_generation = 0  # bumped to drop every open event stream
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def configure(self, config: dict):
+        """Apply `population`, `hidden_nodes`, `latency`, `seed` and `binary_frames`; takes effect on the next `start`."""
+        self.population = config.get("population", self.population)
+        self.hidden_nodes = config.get("hidden_nodes", self.hidden_nodes)
+        self.latency = config.get("latency", self.latency)
+        self.seed = config.get("seed", self.seed)
+        self.binary_frames = config.get("binary_frames", self.binary_frames)
+
+    def start(self) -> str:
+        """
+        Generate the population and start serving on a background thread.
+
+        Returns:
+            str: The base URL of the server.
+        """
+        rng = random.Random(self.seed)
+        self._payloads = [self._encode(genome_id, make_network(rng, self.hidden_nodes))
+                          for genome_id in range(1, self.population + 1)]
+        self._server = ThreadingHTTPServer((self.host, self.port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-server", daemon=True)
+        self._thread.start()
+        logging.info(f"Mock mediator server listening on {self.url}")
+        return self.url
+
+    def stop(self):
+        """Stop serving and release the port."""
+        if self._server is not None:
+            self.drop_push_clients()
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = self._thread = None
+
+    def stats(self) -> dict:
+        """Return the request counters."""
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "not_modified": self.not_modified,
+                "duplicates": self.duplicates,
+                "records": self.records,
+            }
+
+    def next_mediator(self, accept: str, if_none_match: str) -> tuple[int, str, bytes, str]:
+        """
+        Pick the next genome and encode it the way the client prefers.
+
+        Returns:
+            tuple[int, str, bytes, str]: Status code, content type, body and ETag.
+        """
+        with self._lock:
+            payloads = self._payloads[self._next_genome % len(self._payloads)]
+            self._next_genome += 1
+        content_type = FRAME_CONTENT_TYPE if self.binary_frames and FRAME_CONTENT_TYPE in accept else "application/json"
+        body, etag = payloads[content_type]
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            with self._lock:
+                self.not_modified += 1
+            return 304, content_type, b"", etag
+        return 200, content_type, body, etag
+
+    def receive_user_data(self, body: bytes, encoding: str, key: Optional[str]) -> bool:
+        """
+        Record an upload.
+
+        Returns:
+            bool: False if the upload repeats an idempotency key that was already received.
+        """
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        payload = json.loads(body)
+        with self._lock:
+            if key is not None:
+                if key in self._seen_keys:
+                    self.duplicates += 1
+                    return False
+                self._seen_keys.add(key)
+            self.records += len(payload) if isinstance(payload, list) else 1
+        return True
+
+    def push_mediator(self, index: int = 0) -> int:
+        """
+        Publish the genome at `index` of the population to every event stream.
+
+        Returns:
+            int: The event id.
+        """
+        genome_id = index + 1
+        frame, etag = self._payloads[index][FRAME_CONTENT_TYPE]
+        return self._publish("mediator", {
+            "genome_id": genome_id,
+            "message": f"Mediator {genome_id}",
+            "frame": base64.b64encode(frame).decode("ascii"),
+            "etag": etag,
+        })
+
+    def push_invalidation(self, genome_id: int) -> int:
+        """Tell every event stream that `genome_id` must no longer be used. Returns the event id."""
+        return self._publish("invalidate", {"genome_id": genome_id})
+
+    def drop_push_clients(self):
+        """Close every open event stream, as a restart or network failure would."""
+        with self._events_changed:
+            self._stream_generation += 1
+            self._events_changed.notify_all()
+
+    def wait_for_events(self, after: int, generation: int) -> Optional[list[tuple[int, str, str]]]:
+        """
+        Block until there are events after id `after`, or the heartbeat interval passes.
+
+        Returns:
+            Optional[list]: The new events (possibly none), or None once the stream must close.
+        """
+        with self._events_changed:
+            self._events_changed.wait_for(
+                lambda: self._stream_generation != generation or (self._events and self._events[-1][0] > after),
+                timeout=self.heartbeat)
+            if self._stream_generation != generation:
+                return None
+            return [event for event in self._events if event[0] > after]
+
+    def stream_generation(self) -> int:
+        with self._lock:
+            return self._stream_generation
+
+    def _publish(self, event_type: str, data: dict) -> int:
+        with self._events_changed:
+            event_id = len(self._events) + 1
+            self._events.append((event_id, event_type, json.dumps(data)))
+            self._events_changed.notify_all()
+        return event_id
+
+    def count(self, route: str):
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    @staticmethod
+    def _encode(genome_id: int, network: FeedForwardNetwork) -> dict[str, tuple[bytes, str]]:
+        message = f"Mediator {genome_id}"
+        genome = json.dumps({"genome": encode_genome(genome_id, network), "message": message}).encode("utf-8")
+        frame = encode_frame(genome_id, network, message)
+        return {
+            "application/json": (genome, f'"{hashlib.sha256(genome).hexdigest()}"'),
+            FRAME_CONTENT_TYPE: (frame, f'"{hashlib.sha256(frame).hexdigest()}"'),
+        }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real server
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    @property
+    def mock(self) -> MockMediatorServer:
+        return self.server.mock
+
+    def do_HEAD(self):
+        self._reply(200, "text/plain", b"", head_only=True)
+
+    def do_GET(self):
+        route = self.path.strip("/")
+        self.mock.count(route)
+        if route != "mediator_events":
+            self._reply_json(404, {"status": "error", "message": f"Unknown route /{route}"})
+            return
+        generation = self.mock.stream_generation()
+        last_id = self.headers.get("Last-Event-ID", "0")
+        last_id = int(last_id) if last_id.isdigit() else 0
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")  # one chunk per event, so clients see it at once
+        self.end_headers()
+        self.close_connection = True
+        try:
+            self._write_chunk(b"retry: 1000\n\n")
+            while True:
+                events = self.mock.wait_for_events(last_id, generation)
+                if events is None:
+                    break
+                if not events:
+                    self._write_chunk(b": heartbeat\n\n")
+                for event_id, event_type, data in events:
+                    self._write_chunk(f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n".encode("utf-8"))
+                    last_id = event_id
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client went away
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+    def do_POST(self):
+        route = self.path.strip("/")
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.mock.count(route)
+        if self.mock.latency:
+            time.sleep(self.mock.latency)
+        if route == "request_new_mediator":
+            status, content_type, payload, etag = self.mock.next_mediator(
+                self.headers.get("Accept", ""), self.headers.get("If-None-Match", ""))
+            self._reply(status, content_type, payload, {"ETag": etag})
+        elif route == "user_data":
+            fresh = self.mock.receive_user_data(body, self.headers.get("Content-Encoding", ""),
+                                                self.headers.get("Idempotency-Key"))
+            self._reply_json(200, {"status": "success" if fresh else "duplicate"})
+        else:
+            self._reply_json(404, {"status": "error", "message": f"Unknown route /{route}"})
+
+    def _reply_json(self, status: int, payload: dict):
+        self._reply(status, "application/json", json.dumps(payload).encode("utf-8"))
+
+    def _reply(self, status: int, content_type: str, body: bytes, headers: Optional[dict] = None,
+               head_only: bool = False):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body and not head_only:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug(f"Mock server: {format % args}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the local stand-in mediator server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--population", type=int, default=8)
+    parser.add_argument("--hidden-nodes", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every POST")
+    parser.add_argument("--json-only", action="store_true", help="imitate a server without binary frames")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    server = MockMediatorServer(args.host, args.port, args.population, args.hidden_nodes, args.latency,
+                                binary_frames=not args.json_only)
+    server.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
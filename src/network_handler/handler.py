@@ -1,8 +1,22 @@
 # src/network_handler/handler.py
 
+import base64
 import logging
 import json
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
 import requests
+from requests.adapters import HTTPAdapter
+from src.network_handler.uploader import BatchUploader
+from src.network_handler.outbox import Outbox
+from src.network_handler.resilience import CircuitBreaker, RetryPolicy
+from src.network_handler.push_channel import PushChannel
+from src.mediator_manager.genome_codec import FRAME_CONTENT_TYPE, read_frame_header
+from src.mediator_manager.mediator_cache import MediatorCache
+from src.mock_server.server import MockMediatorServer
 from src.interfaces.i_network_handler import INetworkHandler
 from src.interfaces.i_system_module import ISystemModule
 from src.interfaces.data_models import UserData, MediatorData
@@ -15,9 +29,32 @@ class NetworkHandler(ISystemModule, INetworkHandler):
 
     The class has the following key features:
 
-    - Supports a mock mode to simulate network operations without actually connecting to a server.
+    - Supports a mock mode that runs every request against an in-process `MockMediatorServer`, a local
+      stand-in for the evolution server, instead of the configured endpoint.
     - Provides methods to send and receive data over the network, with support for JSON payloads.
     - Manages the connection status and allows connecting and disconnecting from the configured endpoint.
+    - Owns a long-lived `requests.Session` with a keep-alive connection pool, so repeated mediator swaps and
+      data uploads reuse the same TCP/TLS connection instead of opening a new one per call.
+      The session is shared by the network workers and the mediator pool thread. It is fully set up before
+      it is published and never mutated afterwards, so the only shared state is urllib3's connection pool
+      (thread-safe) and the cookie jar (locked internally). The pool is sized for every thread that may use it
+      and blocks rather than opening extra connections, which caps concurrent use of the session.
+    - Runs mediator swaps on a small worker pool (`request_mediator_swap_async`) so callers on the Qt thread
+      get a `Future` back immediately instead of blocking on the server round trip.
+    - Batches telemetry records queued with `enqueue_upload` into gzip-compressed uploads to `/user_data`
+      (see `BatchUploader`), flushed on count, size or time and on `stop()`.
+    - Spools uploads that cannot reach the server to an on-disk `Outbox`, which replays them in order with
+      their idempotency keys once the server answers again.
+    - Wraps every request in a resilience layer: a per-call deadline bounding the total time spent on a call,
+      jittered exponential retries for idempotent calls (those carrying an `Idempotency-Key`) and a
+      `CircuitBreaker` that fails fast with `CircuitOpenError` while the server is down. Breaker state and
+      retry counts are reported by `status()`.
+    - Negotiates the mediator wire format: swaps advertise the binary `application/x-mediator-frame` format
+      (see `genome_codec`) and fall back to a JSON genome (see `genome_schema`) for servers that do not speak it.
+    - Keeps received mediators in a content-addressed `MediatorCache` and offers their ETags in
+      `If-None-Match`, so reassigning a cached genome is a `304 Not Modified` without a payload.
+    - Optionally keeps a server-sent events `PushChannel` open, over which the server pushes new mediators
+      (handed to the listener set with `set_push_listener`) and cache invalidations.
     - Implements the standard lifecycle methods (`initialize`, `configure`, `start`, `stop`, `reset`, `update`, `status`) to integrate with the overall system.
 
     The `send_data` method is the primary entry point for sending data over the network. It handles the logic of making the actual HTTP request, with support for both real and mock modes. The method returns the server's response as a dictionary.
@@ -28,6 +65,37 @@ class NetworkHandler(ISystemModule, INetworkHandler):
         self.connection_status = False
         self.mock_mode = False  # Add mock mode flag
         self.endpoint = "http://127.0.0.1:8000"  # Add endpoint property
+        self.session: requests.Session = None  # type: ignore
+        self._session_lock = threading.Lock()
+        self.pool_connections = 2  # number of hosts kept in the pool
+        self.pool_maxsize = 4  # connections kept alive per host
+        self.keep_alive = True
+        self.default_timeout = (3.05, 30.0)  # (connect, read) in seconds
+        self.timeouts = {
+            "request_new_mediator": (3.05, 30.0),
+            "user_data": (3.05, 10.0),
+        }
+        self.default_deadline = 30.0  # total seconds a call may take, retries included
+        self.deadlines = {
+            "request_new_mediator": 30.0,
+            "user_data": 15.0,
+        }
+        self.retry_policy = RetryPolicy()
+        self.breaker = CircuitBreaker()
+        self.retries = 0
+        self.deadlines_exceeded = 0
+        self._counter_lock = threading.Lock()
+        self.max_workers = 2
+        self.executor: ThreadPoolExecutor = None  # type: ignore
+        self.uploader = BatchUploader(self.send_batch)
+        self.outbox = Outbox(self._replay_record)
+        self.mediator_cache = MediatorCache()
+        self.mock_server: MockMediatorServer = None  # type: ignore
+        self.mock_server_config = {}
+        self.push_enabled = False
+        self.push_route = "mediator_events"
+        self.push_channel = PushChannel(lambda: f"{self.endpoint}/{self.push_route}", self._handle_push_event)
+        self.push_listener: Callable[[MediatorData], None] = None  # type: ignore
 
     def set_mock_mode(self, mock_mode):
         self.mock_mode = mock_mode
@@ -39,15 +107,54 @@ class NetworkHandler(ISystemModule, INetworkHandler):
 
     def configure(self, config):
         super().configure(config)  # Optionally call base implementation if defined
-        # Configuration logic specific to network handling
+        self.endpoint = config.get("endpoint", self.endpoint)
+        self.pool_connections = config.get("pool_connections", self.pool_connections)
+        self.pool_maxsize = config.get("pool_maxsize", self.pool_maxsize)
+        self.keep_alive = config.get("keep_alive", self.keep_alive)
+        # JSON configs hand timeouts over as lists, which requests rejects
+        self.default_timeout = self._as_timeout(config.get("default_timeout", self.default_timeout))
+        self.timeouts.update({route: self._as_timeout(t) for route, t in config.get("timeouts", {}).items()})
+        self.max_workers = config.get("max_workers", self.max_workers)
+        self.default_deadline = config.get("default_deadline", self.default_deadline)
+        self.deadlines.update(config.get("deadlines", {}))
+        self.retry_policy.configure(config.get("retry", {}))
+        self.breaker.configure(config.get("circuit_breaker", {}))
+        self.uploader.configure(config.get("upload_batch", {}))
+        self.outbox.configure(config.get("outbox", {}))
+        self.mediator_cache.configure(config.get("mediator_cache", {}))
+        self.mock_server_config = config.get("mock_server", self.mock_server_config)
+        push_config = config.get("push", {})
+        self.push_enabled = push_config.get("enabled", self.push_enabled)
+        self.push_route = push_config.get("route", self.push_route)
+        self.push_channel.configure(push_config)
         logging.info(f"Network Handler configured with {config}")
 
     def start(self):
         super().start()  # Start the module
+        if self.mock_mode and self.mock_server is None:
+            self.mock_server = MockMediatorServer()
+            self.mock_server.configure(self.mock_server_config)
+            self.endpoint = self.mock_server.start()
+        self.connect(self.endpoint)  # Open and warm the connection pool
+        self.mediator_cache.load()
+        if self.push_enabled:
+            self.push_channel.start()
+        self.outbox.start()
+        self.uploader.start()
         logging.info("Network Handler started")
 
     def stop(self):
         super().stop()  # Stop the module
+        self.push_channel.stop()
+        self.uploader.stop()  # Flush queued telemetry while the pool is still open
+        self.outbox.stop()  # Commit anything spooled during the flush
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.disconnect()  # Drain the connection pool
+        if self.mock_server is not None:
+            self.mock_server.stop()
+            self.mock_server = None
         logging.info("Network Handler stopped")
 
     def reset(self):
@@ -60,8 +167,26 @@ class NetworkHandler(ISystemModule, INetworkHandler):
         # Update logic here
         logging.info("Network Handler updated")
 
-    def status(self):
-        return super().status()  # Return the module's status
+    def status(self) -> dict:
+        """
+        Return the running state together with the resilience and upload counters.
+
+        Returns:
+            dict: `running`, `connected`, the breaker state and counters, retry and deadline counts, 
+            and the outbox counters.
+        """
+        with self._counter_lock:
+            retries, deadlines_exceeded = self.retries, self.deadlines_exceeded
+        return {
+            "running": super().status(),
+            "connected": self.connection_status,
+            "circuit": self.breaker.stats(),
+            "retries": retries,
+            "deadlines_exceeded": deadlines_exceeded,
+            "outbox": self.outbox.stats(),
+            "mediator_cache": self.mediator_cache.stats(),
+            "push": self.push_channel.stats(),
+        }
 
     # INetworkHandler specific methods
     def send(self, data):
@@ -69,45 +194,307 @@ class NetworkHandler(ISystemModule, INetworkHandler):
         # Simulate sending data
         return "Data sent"
 
-    def request_mediator_swap(self, data: UserData) -> Response | dict:
+    def request_mediator_swap_async(self, data: UserData, timeout=None) -> Future:
+        """
+        Run `request_mediator_swap` on the network worker pool.
+
+        Args:
+            data (UserData): The user data sent along with the request.
+            timeout: Optional read timeout overriding the configured one for this call.
+
+        Returns:
+            Future: Resolves to the same value `request_mediator_swap` returns.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="network")
+        return self.executor.submit(self.request_mediator_swap, data, timeout)
+
+    def request_mediator_swap(self, data: UserData, timeout=None) -> Response | dict:
         logging.info(f"Requesting mediator with data: {data} to {self.endpoint}")
         try:
-            if self.mock_mode:
-                # broken
-                logging.info("Mock mode enabled - simulating server response")
-                response = {"status": "success", "data": "Mock response"}
-                logging.info(f"Mock response: {response}")
+            headers = {"Content-Type": "application/json", "Accept": f"{FRAME_CONTENT_TYPE}, application/json;q=0.9"}
+            if timeout is None:
+                timeout = self.get_timeout("request_new_mediator")
             else:
-                headers = {"Content-Type": "application/json"}
-                response = requests.post(
-                    self.endpoint + "/request_new_mediator", json=data.model_dump(), headers=headers
-                )
-                logging.info(f"Server response: {response.json()}"[:50])
+                # the override only replaces the read timeout, the connect timeout stays configured
+                route_timeout = self.get_timeout("request_new_mediator")
+                connect_timeout = route_timeout[0] if isinstance(route_timeout, tuple) else route_timeout
+                timeout = (connect_timeout, timeout)
+            etags = self.mediator_cache.etags()
+            if etags:
+                headers["If-None-Match"] = ", ".join(etags)
+            response = self._post("request_new_mediator", json=data.model_dump(), headers=headers, timeout=timeout)
+            logging.info(f"Server response: {response.status_code} {response.headers.get('Content-Type')}, {len(response.content)} bytes")
             return response 
         except requests.exceptions.RequestException as e:
             logging.error(f"Network error: {e}")
+            # the swap itself is not replayed (the caller has moved on), but its user data is
+            self.spool("user_data", data.model_dump_json().encode("utf-8"), {"Content-Type": "application/json"})
             return {"status_code": "error", "message": str(e)}
 
-    def send_data(self, data):
-        logging.info(f"Sending data: {data} to {self.endpoint}")
+    def send_data_async(self, data) -> Future:
+        """Run `send_data` on the network worker pool, for fire-and-forget uploads."""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="network")
+        return self.executor.submit(self.send_data, data)
+
+    def prefetch_mediator(self) -> MediatorData | None:
+        """
+        Fetch a mediator for the prefetch pool without reporting on the current one.
+
+        The request carries the same blank `UserData` (genome id 0, no rating) the 
+        client sends before any mediator is assigned, so prefetching never counts 
+        as a rating submission for the current genome. That data is reported 
+        separately when the mediator is actually swapped out.
+
+        Returns:
+            MediatorData | None: The serialized mediator, or None if the request failed.
+        """
+        return self.fetch_mediator(UserData(genome_id=0, time_since_startup=0.0, user_rating=0))
+
+    def enqueue_upload(self, record: dict):
+        """Queue a telemetry record for the next batched upload to `/user_data`."""
+        self.uploader.add(record)
+
+    def send_batch(self, body: bytes) -> bool:
+        """
+        Upload one gzip-compressed JSON array of records to `/user_data`.
+
+        A batch that cannot reach the server is spooled to the outbox, as is 
+        every batch while the outbox still holds older records, so uploads 
+        arrive in the order they were made.
+
+        Args:
+            body (bytes): The compressed batch built by the uploader.
+
+        Returns:
+            bool: True once the batch is delivered or spooled.
+        """
+        headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        key = uuid.uuid4().hex
+        if self.outbox.pending() or not self._replay_record("user_data", body, dict(headers, **{"Idempotency-Key": key})):
+            self.outbox.append("user_data", body, headers, key)
+        return True
+
+    def spool(self, route: str, body: bytes, headers: dict):
+        """Hand a request that could not be delivered to the outbox, keeping its idempotency key."""
+        if self.mock_mode:
+            return
+        headers = dict(headers)
+        key = headers.pop("Idempotency-Key", None)
+        self.outbox.append(route, body, headers, key)
+        logging.info(f"Spooled {len(body)} bytes for /{route} to the outbox")
+
+    def _replay_record(self, route: str, body: bytes, headers: dict) -> bool:
+        """
+        Deliver one spooled record to the server.
+
+        Returns:
+            bool: False if the server is unreachable or asks to retry later, True otherwise. 
+            Records the server rejects outright are logged and dropped, replaying them cannot help.
+        """
         try:
-            if self.mock_mode:
-                logging.info("Mock mode enabled - simulating server response")
-                response = {"status": "success", "data": "Mock response"}
-                logging.info(f"Mock response: {response}")
+            response = self._post(route, data=body, headers=headers)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Network error: {e}")
+            return False
+        if response.status_code >= 500 or response.status_code in (408, 429):
+            logging.warning(f"Server asked to retry /{route}: {response.status_code}")
+            return False
+        if not response.ok:
+            logging.error(f"Server rejected /{route} record: {response.status_code}")
+        return True
+
+    def fetch_mediator(self, data: UserData) -> MediatorData | None:
+        """
+        Fetch a new mediator synchronously, for callers already off the Qt thread.
+
+        Args:
+            data (UserData): The user data sent along with the request.
+
+        Returns:
+            MediatorData | None: The serialized mediator, or None if the request failed.
+        """
+        response = self.request_mediator_swap(data)
+        if isinstance(response, dict) or response.status_code not in (200, 304):
+            return None
+        return self.parse_mediator_response(response)
+
+    def parse_mediator_response(self, response: Response) -> MediatorData:
+        """
+        Turn a successful swap response into `MediatorData`, whichever wire format the server chose.
+
+        A `304 Not Modified` is served from the mediator cache, any other payload is stored in it.
+        A binary frame is kept as is in `MediatorData.frame`, only its header is read here; 
+        the network is decoded later, straight from the response body.
+
+        Raises:
+            ValueError: If the body is neither a valid frame header nor valid mediator JSON, 
+            or the server answered 304 for an entry that is no longer cached.
+        """
+        if response.status_code == 304:
+            etag = response.headers.get("ETag")
+            cached = self.mediator_cache.payload(etag) if etag else None
+            if cached is None:
+                raise ValueError(f"Server answered 304 for uncached mediator {etag}")
+            logging.info(f"Mediator {etag} served from cache")
+            content_type, body = cached
+            return self._mediator_data(content_type, body, etag)
+        return self._cache_mediator(response.headers.get("Content-Type", ""), response.content, response.headers.get("ETag"))
+
+    def set_push_listener(self, listener: Callable[[MediatorData], None]):
+        """Set the callback receiving mediators pushed by the server. It runs on the push channel thread."""
+        self.push_listener = listener
+
+    def _handle_push_event(self, event_type: str, data: dict, event_id: str | None):
+        if event_type == "invalidate":
+            dropped = self.mediator_cache.invalidate(data["genome_id"])
+            logging.info(f"Server invalidated genome {data['genome_id']}, {dropped} cache entries dropped")
+        elif event_type == "mediator":
+            if "frame" in data:
+                content_type, body = FRAME_CONTENT_TYPE, base64.b64decode(data["frame"])
             else:
-                headers = {"Content-Type": "application/json"}
-                response = requests.post(
-                    self.endpoint + "/user_data", data=json.dumps(data), headers=headers
-                )
-                response = response.json()
-                logging.info(f"Server response: {response}")
+                content_type = "application/json"
+                body = json.dumps({"genome": data["genome"], "message": data.get("message", "")}).encode("utf-8")
+            mediator_data = self._cache_mediator(content_type, body, data.get("etag"))
+            logging.info(f"Server pushed mediator {mediator_data.etag} (event {event_id})")
+            if self.push_listener is not None:
+                self.push_listener(mediator_data)
+        else:
+            logging.warning(f"Ignoring unknown push event {event_type}")
+
+    def _cache_mediator(self, content_type: str, body: bytes, etag: str | None) -> MediatorData:
+        mediator_data = self._mediator_data(content_type, body, None)
+        if mediator_data.frame is not None:
+            genome_id = read_frame_header(body)[0]
+        else:
+            genome_id = mediator_data.genome.get("genome_id") if mediator_data.genome is not None else None
+        mediator_data.etag = self.mediator_cache.store(content_type, body, etag, genome_id)
+        return mediator_data
+
+    @staticmethod
+    def _mediator_data(content_type: str, body: bytes, etag: str | None) -> MediatorData:
+        if content_type.startswith(FRAME_CONTENT_TYPE):
+            _, message = read_frame_header(body)
+            return MediatorData(new_mediator="", message=message, frame=body, etag=etag)
+        return MediatorData.model_validate(dict(json.loads(body), etag=etag))
 
+    def send_data(self, data):
+        logging.info(f"Sending data: {data} to {self.endpoint}")
+        try:
+            headers = {"Content-Type": "application/json", "Idempotency-Key": uuid.uuid4().hex}
+            body = json.dumps(data).encode("utf-8")
+            response = self._post("user_data", data=body, headers=headers)
+            response = response.json()
+            logging.info(f"Server response: {response}")
             return response
         except requests.exceptions.RequestException as e:
             logging.error(f"Network error: {e}")
+            self.spool("user_data", body, headers)
             return {"status": "error", "message": str(e)}
 
+    def get_timeout(self, route: str):
+        """Return the (connect, read) timeout configured for the given route."""
+        return self.timeouts.get(route, self.default_timeout)
+
+    @staticmethod
+    def _as_timeout(timeout):
+        return tuple(timeout) if isinstance(timeout, list) else timeout
+
+    def get_deadline(self, route: str) -> float:
+        """Return the total number of seconds a call to the given route may take, retries included."""
+        return self.deadlines.get(route, self.default_deadline)
+
+    def _post(self, route: str, deadline: float | None = None, **kwargs) -> Response:
+        """
+        POST to `route` on the configured endpoint through the pooled session.
+
+        The call goes through the circuit breaker and must finish within its deadline; 
+        each attempt's timeout is cut down to the time that is left. Idempotent calls, 
+        those carrying an `Idempotency-Key` header, are retried with jittered backoff 
+        on network errors and 5xx responses. Other calls are sent once.
+
+        Args:
+            route (str): The server route, e.g. "user_data".
+            deadline (float | None): Overrides the route's configured deadline in seconds.
+
+        Raises:
+            requests.exceptions.ConnectionError: If the handler is not connected. The pool is 
+            never reopened implicitly, so nothing reaches the server after `disconnect()`.
+            CircuitOpenError: If the circuit is open.
+            requests.exceptions.Timeout: If the deadline passes before a response arrives.
+        """
+        with self._session_lock:
+            session = self.session
+        if session is None:
+            raise requests.exceptions.ConnectionError("Network Handler is not connected")
+        idempotent = "Idempotency-Key" in (kwargs.get("headers") or {})
+        timeout = kwargs.pop("timeout", self.get_timeout(route))
+        deadline_at = time.monotonic() + (deadline if deadline is not None else self.get_deadline(route))
+        attempt = 0
+        while True:
+            attempt += 1
+            self.breaker.before_call()
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                self._deadline_exceeded(route)
+            error, response = None, None
+            try:
+                response = session.post(f"{self.endpoint}/{route}", timeout=self._cap_timeout(timeout, remaining), **kwargs)
+            except requests.exceptions.RequestException as e:
+                error = e
+            if error is None and response.status_code < 500:
+                self.breaker.record_success()
+                return response
+            self.breaker.record_failure()
+            if not idempotent or attempt >= self.retry_policy.max_attempts:
+                break
+            delay = self.retry_policy.delay(attempt)
+            if time.monotonic() + delay >= deadline_at:
+                break
+            with self._counter_lock:
+                self.retries += 1
+            logging.warning(f"Retrying /{route} in {delay:.2f}s (attempt {attempt + 1}): {error or response.status_code}")
+            time.sleep(delay)
+        if error is not None:
+            if isinstance(error, requests.exceptions.Timeout) and time.monotonic() >= deadline_at:
+                self._deadline_exceeded(route)
+            raise error
+        return response
+
+    def _deadline_exceeded(self, route: str):
+        with self._counter_lock:
+            self.deadlines_exceeded += 1
+        raise requests.exceptions.Timeout(f"Deadline for /{route} exceeded")
+
+    @staticmethod
+    def _cap_timeout(timeout, remaining: float):
+        """Shrink a (connect, read) or single timeout so it cannot outlast the deadline."""
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(min(t, remaining) for t in timeout)
+        return min(timeout, remaining)
+
+    def _create_session(self) -> requests.Session:
+        """Build a session whose adapter keeps a bounded pool of keep-alive connections."""
+        session = requests.Session()
+        # one connection for each network worker plus the mediator pool thread
+        pool_maxsize = max(self.pool_maxsize, self.max_workers + 1)
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=pool_maxsize, pool_block=True)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"Connection": "keep-alive" if self.keep_alive else "close"})
+        return session
+
+    def _warm_up(self, session: requests.Session):
+        """Open the first pooled connection so the first real request skips the handshake."""
+        try:
+            session.head(self.endpoint, timeout=self.default_timeout)
+            logging.info(f"Connection pool to {self.endpoint} warmed")
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"Could not warm connection pool: {e}")
+
     def receive(self):
         logging.info("Receiving data...")
         # Simulate receiving data
@@ -115,12 +502,24 @@ class NetworkHandler(ISystemModule, INetworkHandler):
 
     def connect(self, endpoint):
         logging.info(f"Connecting to {endpoint}...")
-        # Simulate establishing a connection
-        self.connection_status = True
+        if endpoint != self.endpoint:
+            self.disconnect()  # pooled connections belong to the old endpoint
+            self.endpoint = endpoint
+        with self._session_lock:
+            created = self.session is None
+            if created:
+                self.session = self._create_session()
+            session = self.session
+            self.connection_status = True
+        if created and not self.mock_mode:
+            self._warm_up(session)
         return "Connected"
 
     def disconnect(self):
         logging.info("Disconnecting...")
-        # Simulate disconnecting the connection
-        self.connection_status = False
+        with self._session_lock:
+            session, self.session = self.session, None
+            self.connection_status = False
+        if session is not None:
+            session.close()  # Close every pooled connection
         return "Disconnected"
@@ -0,0 +1,299 @@
+# src/network_handler/outbox.py
+"""
+outbox.py
+
+This module contains the Outbox class, an append-only on-disk spool for
+requests that could not reach the mediator server.
+
+Records are written to numbered segment files. Each record is framed as
+
+    [length: uint32][crc32: uint32][payload]
+
+where the payload is a JSON header line (idempotency key, route, headers)
+followed by the raw request body. Appends only enqueue the record; a writer
+thread group-commits everything queued with a single flush and fsync. A
+replay thread sends records in order, backing off exponentially while the
+server is unreachable, and persists its position in a cursor file so a
+restart resumes where it stopped. Every record carries an idempotency key
+that is sent as the `Idempotency-Key` header, so the server can drop
+replays it has already seen. When the spool grows past `max_bytes` the
+oldest segments are evicted.
+"""
+import json
+import logging
+import os
+import struct
+import threading
+import uuid
+import zlib
+from typing import Callable, Optional
+
+CURRENT_PATH = os.getcwd()
+
+RECORD_HEADER = struct.Struct(">II")  # payload length, crc32 of the payload
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+
+
+class Outbox:
+    """
+    A durable, ordered spool of requests destined for the server.
+
+    Args:
+        send (Callable[[str, bytes, dict], bool]): Sends one record (route, body, headers),
+            returns True once the server has it.
+        directory (str): Directory holding the segment files and the cursor.
+        max_bytes (int): Upper bound on the spool size; the oldest segments are evicted beyond it.
+        segment_bytes (int): Size at which a new segment file is started.
+        base_delay (float): First replay retry delay in seconds, doubled after every failure.
+        max_delay (float): Upper bound for the replay retry delay.
+
+    Attributes:
+        appended (int): Number of records written to disk.
+        replayed (int): Number of records delivered by the replay thread.
+        evicted (int): Number of records dropped by the size bound.
+    """
+
+    def __init__(self, send: Callable[[str, bytes, dict], bool], directory: str = os.path.join(CURRENT_PATH, "outbox"),
+                 max_bytes: int = 50 * 1024 * 1024, segment_bytes: int = 1024 * 1024,
+                 base_delay: float = 1.0, max_delay: float = 60.0):
+        self.send = send
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.appended = 0
+        self.replayed = 0
+        self.evicted = 0
+        self._queue: list[bytes] = []
+        self._condition = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self._replayer: Optional[threading.Thread] = None
+        self._running = False
+        self._unsent = 0  # records on disk or queued that have not been delivered yet
+        self._wake_replay = threading.Event()
+        self._file_lock = threading.RLock()  # segment files are written, read and deleted from two threads
+
+    def configure(self, config: dict):
+        """Apply `directory`, `max_bytes`, `segment_bytes`, `base_delay` and `max_delay`."""
+        self.directory = config.get("directory", self.directory)
+        self.max_bytes = config.get("max_bytes", self.max_bytes)
+        self.segment_bytes = config.get("segment_bytes", self.segment_bytes)
+        self.base_delay = config.get("base_delay", self.base_delay)
+        self.max_delay = config.get("max_delay", self.max_delay)
+
+    def start(self):
+        """Open the spool directory and start the writer and replay threads."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        os.makedirs(self.directory, exist_ok=True)
+        self._unsent = self._count_unsent()
+        self._writer = threading.Thread(target=self._write_loop, name="outbox-writer", daemon=True)
+        self._replayer = threading.Thread(target=self._replay_loop, name="outbox-replay", daemon=True)
+        self._writer.start()
+        self._replayer.start()
+        if self._unsent:
+            logging.info(f"Outbox resuming with {self._unsent} unsent records")
+            self._wake_replay.set()
+
+    def stop(self):
+        """Commit every queued record to disk and stop both threads."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._wake_replay.set()
+        for thread in (self._writer, self._replayer):
+            if thread is not None:
+                thread.join()
+        self._writer = self._replayer = None
+
+    def append(self, route: str, body: bytes, headers: Optional[dict] = None, key: Optional[str] = None) -> str:
+        """
+        Queue a request for durable storage and later replay. Returns immediately.
+
+        Args:
+            route (str): The server route, e.g. "user_data".
+            body (bytes): The raw request body.
+            headers (Optional[dict]): Request headers to replay with the body.
+            key (Optional[str]): Idempotency key; a new one is generated if omitted.
+
+        Returns:
+            str: The idempotency key of the record.
+        """
+        key = key or uuid.uuid4().hex
+        header = json.dumps({"key": key, "route": route, "headers": headers or {}}).encode("utf-8")
+        payload = header + b"\n" + body
+        record = RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._condition:
+            self._queue.append(record)
+            self._unsent += 1
+            self._condition.notify_all()
+        return key
+
+    def pending(self) -> int:
+        """Return the number of records that have not been delivered yet."""
+        with self._condition:
+            return self._unsent
+
+    def stats(self) -> dict:
+        """Return the spool counters."""
+        with self._condition:
+            return {
+                "pending": self._unsent,
+                "appended": self.appended,
+                "replayed": self.replayed,
+                "evicted": self.evicted,
+            }
+
+    # group commit
+
+    def _write_loop(self):
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                batch, self._queue = self._queue, []
+                running = self._running
+            if batch:
+                self._commit(batch)
+            if not running:
+                return
+
+    def _commit(self, batch: list[bytes]):
+        with self._file_lock:
+            segment = self._writable_segment()
+            with open(segment, "ab") as f:
+                f.write(b"".join(batch))
+                f.flush()
+                os.fsync(f.fileno())  # one fsync for the whole batch
+            with self._condition:
+                self.appended += len(batch)
+            self._enforce_size_bound()
+        self._wake_replay.set()
+
+    def _writable_segment(self) -> str:
+        segments = self._segments()
+        if segments and os.path.getsize(segments[-1]) < self.segment_bytes:
+            return segments[-1]
+        number = self._segment_number(segments[-1]) + 1 if segments else 0
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{number:08d}{SEGMENT_SUFFIX}")
+
+    def _enforce_size_bound(self):
+        segments = self._segments()
+        total = sum(os.path.getsize(segment) for segment in segments)
+        # never evict the segment being written to
+        while total > self.max_bytes and len(segments) > 1:
+            oldest = segments.pop(0)
+            size = os.path.getsize(oldest)
+            dropped = len(self._read_records(oldest, self._cursor_offset(oldest)))
+            os.remove(oldest)
+            total -= size
+            with self._condition:
+                self.evicted += dropped
+                self._unsent = max(0, self._unsent - dropped)
+            logging.warning(f"Outbox over {self.max_bytes} bytes, evicted {dropped} records from {oldest}")
+
+    # replay
+
+    def _replay_loop(self):
+        delay = self.base_delay
+        while True:
+            self._wake_replay.wait()
+            self._wake_replay.clear()
+            with self._condition:
+                running = self._running
+            if not running:
+                return
+            if self._replay_once():
+                delay = self.base_delay
+            else:
+                # the endpoint is still down, wait before trying again
+                self._wake_replay.wait(timeout=delay)
+                delay = min(delay * 2, self.max_delay)
+                self._wake_replay.set()
+
+    def _replay_once(self) -> bool:
+        """Send every committed record in order. Returns False if the server refused one."""
+        for segment in self._segments():
+            offset = self._cursor_offset(segment)
+            for end, header, body in self._read_records(segment, offset):
+                with self._condition:
+                    if not self._running:
+                        return True
+                headers = dict(header["headers"], **{"Idempotency-Key": header["key"]})
+                try:
+                    delivered = self.send(header["route"], body, headers)
+                except Exception as e:
+                    logging.error(f"Outbox replay failed: {e}")
+                    delivered = False
+                if not delivered:
+                    return False
+                self._save_cursor(segment, end)
+                with self._condition:
+                    self.replayed += 1
+                    self._unsent = max(0, self._unsent - 1)  # eviction may already have counted it
+            with self._file_lock:
+                if os.path.exists(segment) and segment != self._segments()[-1]:
+                    os.remove(segment)  # fully delivered and no longer written to
+        return True
+
+    # segment files
+
+    def _segments(self) -> list[str]:
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    @staticmethod
+    def _segment_number(segment: str) -> int:
+        return int(os.path.basename(segment)[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+
+    def _read_records(self, segment: str, offset: int) -> list[tuple[int, dict, bytes]]:
+        """Read (end offset, header, body) for each intact record after `offset`."""
+        records = []
+        with self._file_lock:
+            try:
+                with open(segment, "rb") as f:
+                    f.seek(offset)
+                    data = f.read()
+            except FileNotFoundError:
+                return records  # evicted in the meantime
+        position = 0
+        while position + RECORD_HEADER.size <= len(data):
+            length, crc = RECORD_HEADER.unpack_from(data, position)
+            start = position + RECORD_HEADER.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                # a torn write at the tail or a corrupted record, nothing after it can be trusted
+                logging.error(f"Outbox record at {segment}:{offset + position} failed its checksum")
+                break
+            header, body = payload.split(b"\n", 1)
+            position = start + length
+            records.append((offset + position, json.loads(header), body))
+        return records
+
+    def _cursor_path(self) -> str:
+        return os.path.join(self.directory, "cursor")
+
+    def _cursor_offset(self, segment: str) -> int:
+        """Return how far `segment` has been delivered, 0 if the cursor points elsewhere."""
+        try:
+            with open(self._cursor_path()) as f:
+                name, offset = f.read().split()
+        except (FileNotFoundError, ValueError):
+            return 0
+        return int(offset) if name == os.path.basename(segment) else 0
+
+    def _save_cursor(self, segment: str, offset: int):
+        tmp = self._cursor_path() + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(f"{os.path.basename(segment)} {offset}")
+        os.replace(tmp, self._cursor_path())
+
+    def _count_unsent(self) -> int:
+        return sum(len(self._read_records(s, self._cursor_offset(s))) for s in self._segments())
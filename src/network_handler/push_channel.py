@@ -0,0 +1,189 @@
+# src/network_handler/push_channel.py
+"""
+push_channel.py
+
+This module contains the PushChannel class, an optional server-sent events
+(SSE) connection over which the server pushes mediator assignments and
+cache invalidations instead of waiting for the client to ask.
+
+The channel keeps one streaming `GET` open on its own session, so it never
+holds a connection of the request pool. Two event types are understood:
+
+    event: mediator      data: {"message": ..., "new_mediator": ...} or {"message": ..., "frame": <base64>}
+    event: invalidate    data: {"genome_id": ...}
+
+Every event id is remembered and sent back as `Last-Event-ID` when the
+stream reconnects, so the server can replay what was missed. Reconnects
+back off exponentially, starting from the server's `retry:` hint when it
+sends one, and reset once a stream has been established.
+"""
+import json
+import logging
+import socket
+import threading
+from typing import Callable, Iterator, Optional
+
+import requests
+
+EVENT_STREAM = "text/event-stream"
+
+
+class PushChannel:
+    """
+    A reconnecting server-sent events client.
+
+    Args:
+        url (Callable[[], str]): Returns the stream URL; called on every connect so endpoint changes apply.
+        on_event (Callable[[str, dict, Optional[str]], None]): Called with the event type, its JSON data
+            and its id for every event received.
+        base_delay (float): First reconnect delay in seconds, doubled after every failed attempt.
+        max_delay (float): Upper bound for the reconnect delay.
+        timeout (tuple): (connect, read) timeout; the read timeout must exceed the server's heartbeat interval.
+
+    Attributes:
+        last_event_id (Optional[str]): Id of the last event received, sent back on reconnect.
+        connects (int): Number of streams established.
+        events (int): Number of events received.
+    """
+
+    def __init__(self, url: Callable[[], str], on_event: Callable[[str, dict, Optional[str]], None],
+                 base_delay: float = 1.0, max_delay: float = 60.0, timeout: tuple = (3.05, 60.0)):
+        self.url = url
+        self.on_event = on_event
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.last_event_id: Optional[str] = None
+        self.connects = 0
+        self.events = 0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._response: Optional[requests.Response] = None
+        self._lock = threading.Lock()
+
+    def configure(self, config: dict):
+        """Apply `base_delay`, `max_delay` and `timeout` from the given configuration."""
+        self.base_delay = config.get("base_delay", self.base_delay)
+        self.max_delay = config.get("max_delay", self.max_delay)
+        self.timeout = tuple(config.get("timeout", self.timeout))
+
+    def start(self):
+        """Open the stream on a background thread, reconnecting until `stop`."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="push-channel", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Close the stream and wait for the background thread."""
+        self._stopped.set()
+        with self._lock:
+            response = self._response
+        if response is not None:
+            self._interrupt(response)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        """Return the channel counters."""
+        return {
+            "connected": self._response is not None,
+            "connects": self.connects,
+            "events": self.events,
+            "last_event_id": self.last_event_id,
+        }
+
+    def _run(self):
+        delay = self.base_delay
+        with requests.Session() as session:
+            while not self._stopped.is_set():
+                try:
+                    if self._stream(session):
+                        delay = self.base_delay  # the stream was up, start the backoff over
+                except Exception as e:
+                    if self._stopped.is_set():
+                        return  # `stop` cut the stream
+                    logging.warning(f"Push channel disconnected: {e}")
+                if self._stopped.wait(timeout=delay):
+                    return
+                delay = min(delay * 2, self.max_delay)
+
+    def _stream(self, session: requests.Session) -> bool:
+        """Read one stream until it ends. Returns True if it was established."""
+        headers = {"Accept": EVENT_STREAM, "Cache-Control": "no-cache"}
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+        response = session.get(self.url(), headers=headers, stream=True, timeout=self.timeout)
+        with self._lock:
+            self._response = response
+        try:
+            if response.status_code != 200:
+                logging.warning(f"Push channel refused: {response.status_code}")
+                return False
+            self.connects += 1
+            logging.info(f"Push channel connected, resuming after {self.last_event_id}")
+            for event_type, data, event_id, retry in self._events(response):
+                if retry is not None:
+                    self.base_delay = retry
+                if event_type is None:
+                    continue
+                if event_id is not None:
+                    self.last_event_id = event_id
+                self.events += 1
+                try:
+                    self.on_event(event_type, json.loads(data), event_id)
+                except Exception as e:
+                    logging.error(f"Push event {event_id} could not be handled: {e}")
+            return True
+        finally:
+            with self._lock:
+                self._response = None
+            response.close()
+
+    @staticmethod
+    def _interrupt(response: requests.Response):
+        """Unblock a thread reading `response`; closing the response alone leaves a pending read waiting."""
+        connection = getattr(response.raw, "connection", None)
+        sock = getattr(connection, "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # already closed
+        response.close()
+
+    def _events(self, response: requests.Response) -> Iterator[tuple[Optional[str], str, Optional[str], Optional[float]]]:
+        """Yield (event type, data, id, retry seconds) for each event, following the SSE framing rules."""
+        event_type, data, event_id, retry = None, [], None, None
+        for line in self._lines(response):
+            if not line:
+                # a blank line dispatches the event
+                if data or retry is not None:
+                    yield (event_type or "message") if data else None, "\n".join(data), event_id, retry
+                event_type, data, event_id, retry = None, [], None, None
+                continue
+            if line.startswith(":"):
+                continue  # heartbeat comment
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "event":
+                event_type = value
+            elif field == "data":
+                data.append(value)
+            elif field == "id":
+                event_id = value
+            elif field == "retry" and value.isdigit():
+                retry = int(value) / 1000
+
+    def _lines(self, response: requests.Response) -> Iterator[str]:
+        pending = b""
+        # chunk_size=None yields data as soon as it arrives instead of filling a buffer first
+        for chunk in response.iter_content(chunk_size=None):
+            if self._stopped.is_set():
+                return
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                yield line.rstrip(b"\r").decode("utf-8")
@@ -0,0 +1,143 @@
+# src/network_handler/resilience.py
+"""
+resilience.py
+
+This module contains the building blocks the NetworkHandler wraps around
+every request to the mediator server:
+
+- `RetryPolicy` computes jittered exponential backoff delays for retrying
+  idempotent calls.
+- `CircuitBreaker` counts consecutive failures and, once the server looks
+  down, fails calls immediately with `CircuitOpenError` instead of letting
+  each one wait out its timeout. After `reset_timeout` seconds a single
+  trial call is let through (half-open); its outcome closes or re-opens
+  the circuit.
+"""
+import random
+import threading
+import time
+
+import requests
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff.
+
+    Args:
+        max_attempts (int): Total number of attempts, including the first one.
+        base_delay (float): Delay before the first retry in seconds, doubled for every further retry.
+        max_delay (float): Upper bound for a single delay.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.2, max_delay: float = 2.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def configure(self, config: dict):
+        """Apply `max_attempts`, `base_delay` and `max_delay` from the given configuration."""
+        self.max_attempts = config.get("max_attempts", self.max_attempts)
+        self.base_delay = config.get("base_delay", self.base_delay)
+        self.max_delay = config.get("max_delay", self.max_delay)
+
+    def delay(self, attempt: int) -> float:
+        """
+        Return how long to wait before retry number `attempt` (starting at 1).
+
+        Uses "full jitter", a random delay between 0 and the exponential bound,
+        so clients that failed together do not retry together.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    A thread-safe circuit breaker.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds the circuit stays open before a trial call is allowed.
+
+    Attributes:
+        failures (int): Consecutive failures since the last success.
+        opened (int): Number of times the circuit has opened.
+        rejected (int): Number of calls failed fast while the circuit was open.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def configure(self, config: dict):
+        """Apply `failure_threshold` and `reset_timeout` from the given configuration."""
+        self.failure_threshold = config.get("failure_threshold", self.failure_threshold)
+        self.reset_timeout = config.get("reset_timeout", self.reset_timeout)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def before_call(self):
+        """
+        Ask the breaker whether a call may go out.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with the trial call already in flight.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self.rejected += 1
+        raise CircuitOpenError("Circuit open - mediator server marked as unavailable")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._state = CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            trial_failed = self._trial_in_flight
+            self._trial_in_flight = False
+            if trial_failed or (self._state == CLOSED and self.failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self.opened += 1
+
+    def stats(self) -> dict:
+        """Return the breaker state and counters."""
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "failures": self.failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+        return self._state
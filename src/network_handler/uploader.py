@@ -0,0 +1,166 @@
+# src/network_handler/uploader.py
+"""
+uploader.py
+
+This module contains the BatchUploader class, which accumulates telemetry
+records (UserData snapshots and rating events) and uploads them as one
+gzip-compressed JSON array per request instead of one request per record.
+
+A batch is flushed when it reaches `max_count` records, `max_bytes` of
+serialized JSON, or when `max_interval` seconds have passed since its first
+record. A batch that fails to upload is put back at the front of the queue,
+and `stop` flushes whatever is left before the network handler closes its
+connection pool. Records the server refuses during `stop` stay queued.
+"""
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+class BatchUploader:
+    """
+    Batches records and hands each batch to `send` as a gzip-compressed JSON array.
+
+    Args:
+        send (Callable[[bytes], bool]): Uploads one compressed batch, returns True on success.
+        max_count (int): Flush once this many records are queued.
+        max_bytes (int): Flush once the queued records serialize to this many bytes.
+        max_interval (float): Flush once the oldest queued record is this many seconds old.
+
+    Attributes:
+        batches_sent (int): Number of batches uploaded successfully.
+        records_sent (int): Number of records uploaded successfully.
+    """
+
+    def __init__(self, send: Callable[[bytes], bool], max_count: int = 50,
+                 max_bytes: int = 64 * 1024, max_interval: float = 30.0):
+        self.send = send
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.max_interval = max_interval
+        self.batches_sent = 0
+        self.records_sent = 0
+        self._records: deque[bytes] = deque()
+        self._queued_bytes = 0
+        self._first_queued_at: Optional[float] = None
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def configure(self, config: dict):
+        """Apply `max_count`, `max_bytes` and `max_interval` from the given configuration."""
+        self.max_count = config.get("max_count", self.max_count)
+        self.max_bytes = config.get("max_bytes", self.max_bytes)
+        self.max_interval = config.get("max_interval", self.max_interval)
+
+    def start(self):
+        """Start the background flush thread."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="batch-uploader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread and upload everything still queued."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        while self.pending() and self.flush():
+            pass
+
+    def add(self, record: dict):
+        """
+        Queue a record for upload.
+
+        Args:
+            record (dict): A JSON-serializable record.
+        """
+        encoded = json.dumps(record).encode("utf-8")
+        with self._condition:
+            first = self._first_queued_at is None
+            if first:
+                self._first_queued_at = time.monotonic()
+            self._records.append(encoded)
+            self._queued_bytes += len(encoded)
+            if first or self._is_due():
+                # the first record arms the interval timer, later ones only matter once a limit is hit
+                self._condition.notify()
+
+    def pending(self) -> int:
+        """Return the number of records waiting to be uploaded."""
+        with self._condition:
+            return len(self._records)
+
+    def flush(self) -> bool:
+        """
+        Upload the queued records as one batch, up to `max_count` of them.
+
+        Returns:
+            bool: True if the batch was uploaded (or nothing was queued), False otherwise.
+        """
+        with self._condition:
+            batch = self._take_batch()
+        if not batch:
+            return True
+        body = gzip.compress(b"[" + b",".join(batch) + b"]")
+        try:
+            sent = self.send(body)
+        except Exception as e:
+            logging.error(f"Batch upload failed: {e}")
+            sent = False
+        if sent:
+            self.batches_sent += 1
+            self.records_sent += len(batch)
+            logging.info(f"Uploaded batch of {len(batch)} records ({len(body)} bytes compressed)")
+        else:
+            with self._condition:
+                self._requeue(batch)
+        return sent
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._is_due():
+                    self._condition.wait(timeout=self._time_until_due())
+                if not self._running:
+                    return
+            if not self.flush():
+                # back off instead of retrying a failing server in a tight loop
+                with self._condition:
+                    self._condition.wait(timeout=self.max_interval)
+
+    def _is_due(self) -> bool:
+        if not self._records:
+            return False
+        if len(self._records) >= self.max_count or self._queued_bytes >= self.max_bytes:
+            return True
+        return time.monotonic() - self._first_queued_at >= self.max_interval
+
+    def _time_until_due(self) -> Optional[float]:
+        if self._first_queued_at is None:
+            return None
+        return max(0.0, self._first_queued_at + self.max_interval - time.monotonic())
+
+    def _take_batch(self) -> list[bytes]:
+        batch = []
+        while self._records and len(batch) < self.max_count:
+            record = self._records.popleft()
+            self._queued_bytes -= len(record)
+            batch.append(record)
+        self._first_queued_at = time.monotonic() if self._records else None
+        return batch
+
+    def _requeue(self, batch: list[bytes]):
+        self._records.extendleft(reversed(batch))
+        self._queued_bytes += sum(len(record) for record in batch)
+        if self._first_queued_at is None:
+            self._first_queued_at = time.monotonic()
@@ -4,6 +4,7 @@ from src.interfaces.i_signal_manager import BaseSignalManager
 class APISignalManager(BaseSignalManager):
     """ Deals with outgoing signals for the Chatbot API """
     chatbot_response_collected = pyqtSignal(str)
+    chatbot_partial_response = pyqtSignal(str) #reply so far, while it streams
     is_ready_to_go = pyqtSignal(bool)
     api_error = pyqtSignal(str)
 
@@ -11,6 +12,7 @@ class APISignalManager(BaseSignalManager):
         super().__init__()
         self.signals = [
             self.chatbot_response_collected,
+            self.chatbot_partial_response,
             self.is_ready_to_go,
             self.api_error
         ]
\ No newline at end of file
@@ -25,6 +25,7 @@ class ChatSignalHandler(BaseSignalHandler):
     def connect_signals(self):
         self.gui_signals.message_submitted.connect(self.handle_message_submission)
         self.api_signals.chatbot_response_collected.connect(self.handle_response_retrieved)
+        self.api_signals.chatbot_partial_response.connect(self.handle_partial_response)
         self.api_signals.api_error.connect(self.handle_api_error)
         self.mediator_signals.public_mediator_msg_ready.connect(self.handle_public_mediator_message)
         self.mediator_signals.internal_mediator_msg_ready.connect(self.handle_internal_mediator_message) 
@@ -35,6 +36,10 @@ class ChatSignalHandler(BaseSignalHandler):
         logging.info(f"Response received: {response}"[:50])
         self.chatbot_interface.process_response(response)
 
+    @pyqtSlot(str)
+    def handle_partial_response(self, partial: str):
+        self.chatbot_interface.process_partial_response(partial)
+
     @pyqtSlot(str)
     def handle_message_submission(self, message):
         logging.info(f"Message submitted: {message}"[:50])
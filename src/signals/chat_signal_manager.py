@@ -25,6 +25,7 @@ class ChatSignalManager(BaseSignalManager):
     internal_chatbot_msg_received = pyqtSignal(dict) #msg as data
     dialogue_user_msg_received = pyqtSignal(dict)
     public_chatbot_msg_received = pyqtSignal(dict) #msg as data
+    public_chatbot_partial_received = pyqtSignal(str) #formatted reply so far
     first_message_submitted = pyqtSignal()
     chatbot_error = pyqtSignal(str)
     is_line_free = pyqtSignal(bool)
@@ -47,6 +48,7 @@ class ChatSignalManager(BaseSignalManager):
             self.internal_chatbot_msg_received,
             self.dialogue_user_msg_received,
             self.public_chatbot_msg_received,
+            self.public_chatbot_partial_received,
             self.first_message_submitted,
             self.chatbot_error, 
             self.is_line_free
@@ -20,9 +20,11 @@ class CollectorSignalHandler(BaseSignalHandler):
 
     def connect_signals(self):
         self.gui_signals.rating_changed.connect(self.handle_data_submission) # int, rating
-        self.gui_signals.new_mediator_requested.connect(lambda data: self.handle_data_submission(data, True)) 
+        # the mediator manager decides whether the swap needs the network (see MediatorSignalHandler)
+        self.gui_signals.new_mediator_requested.connect(self.handle_data_submission)
 
         self.mediator_signals.new_mediator_assigned.connect(self.handle_data_submission)
+        self.mediator_signals.mediator_released.connect(self.handle_mediator_released)
         self.mediator_signals.mediator_data_requested.connect(self.handle_data_requested)
         self.mediator_signals.mediator_requested.connect(lambda data: self.handle_data_submission(data, True))
         #self.chat_signals.secret_chatbot_msg_received.connect(self.handle_data_submission)
@@ -37,12 +39,18 @@ class CollectorSignalHandler(BaseSignalHandler):
         # remove entry "is_secret" from dict if it exists
         #if "is_secret" in data: 
             #data.pop("is_secret")
+        data = dict(data)  # the same dict is delivered to every connected slot
+        requested_by = data.pop("requested_by", "unknown")
         self.collector.update(data)
         if request_mediator: 
-            self.collector.send_data(Recipient.NETWORK)
+            self.collector.send_data(Recipient.NETWORK, requested_by)
 
     @pyqtSlot()
     def handle_data_requested(self):
         logging.info("\033[90mCollectorSignalHandler handle data requested\033[0m")
         self.collector.send_data(Recipient.MEDIATOR)
-    
\ No newline at end of file
+
+    @pyqtSlot(dict)
+    def handle_mediator_released(self, data: dict):
+        logging.info("\033[90mCollectorSignalHandler handle mediator released\033[0m")
+        self.collector.report_user_data()
@@ -21,6 +21,7 @@ class GUISignalHandler(BaseSignalHandler):
 
     def connect_signals(self):
         self.chatbot_signals.public_chatbot_msg_received.connect(self.handle_chatbot_msg_received)
+        self.chatbot_signals.public_chatbot_partial_received.connect(self.handle_chatbot_partial_received)
 
     @pyqtSlot(dict)
     def handle_chatbot_msg_received(self, reply_data: dict):
@@ -28,3 +29,7 @@ class GUISignalHandler(BaseSignalHandler):
         data = ReplyData.model_validate(reply_data)
         self.gui.display_response(data.last_response)
 
+    @pyqtSlot(str)
+    def handle_chatbot_partial_received(self, partial: str):
+        self.gui.display_partial_response(partial)
+
@@ -12,6 +12,7 @@ class MediatorSignalHandler(BaseSignalHandler):
     """Deals with incoming signals for the MediatorManager"""
     def __init__(self, signal_manager : 'SignalManager', manager):
         self.chat_signals = signal_manager.chat_signals
+        self.gui_signals = signal_manager.gui_signals
         self.collector_signals = signal_manager.collector_signals
         self.manager : 'MediatorManagementModule' = manager
         super().__init__(signal_manager, manager)
@@ -20,6 +21,9 @@ class MediatorSignalHandler(BaseSignalHandler):
         self.chat_signals.state_idle.connect(self.handle_is_line_free)
         self.collector_signals.data_ready_for_mediator.connect(self.handle_data_received)
         self.collector_signals.new_mediator_fetched.connect(self.handle_new_mediator_fetched)
+        self.gui_signals.new_mediator_requested.connect(self.handle_new_mediator_requested)
+        self.chat_signals.dialogue_user_msg_received.connect(self.handle_user_msg_received)
+        self.chat_signals.public_chatbot_msg_received.connect(self.handle_chatbot_msg_received)
 
     @pyqtSlot()
     def handle_is_line_free(self):
@@ -37,4 +41,19 @@ class MediatorSignalHandler(BaseSignalHandler):
     def handle_new_mediator_fetched(self, mediator : dict):
         logging.info("\033[90mMediatorSignalHandler handle new mediator fetched\033[0m")
         mediator_data = MediatorData.model_validate(mediator)
-        self.manager.attach_mediator(mediator_data)
\ No newline at end of file
+        self.manager.attach_mediator(mediator_data)
+
+    @pyqtSlot(dict)
+    def handle_user_msg_received(self, data : dict):
+        logging.info("\033[90mMediatorSignalHandler handle user msg received\033[0m")
+        self.manager.record_user_message(data)
+
+    @pyqtSlot(dict)
+    def handle_chatbot_msg_received(self, data : dict):
+        logging.info("\033[90mMediatorSignalHandler handle chatbot msg received\033[0m")
+        self.manager.record_chatbot_message(data)
+
+    @pyqtSlot(dict)
+    def handle_new_mediator_requested(self, data : dict):
+        logging.info("\033[90mMediatorSignalHandler handle new mediator requested\033[0m")
+        self.manager.request_mediator()
@@ -8,6 +8,7 @@ class MediatorSignalManager(BaseSignalManager):
     public_mediator_msg_ready = pyqtSignal(str) # (msg) send to chatbot
     internal_mediator_msg_ready = pyqtSignal(str) # (msg) send to chatbot
     new_mediator_assigned = pyqtSignal(dict) # (mediator id) 
+    mediator_released = pyqtSignal(dict) # outgoing mediator swapped out locally, report its data
     mediator_intervention_completed = pyqtSignal(bool) 
 
     def __init__(self):
@@ -18,5 +19,6 @@ class MediatorSignalManager(BaseSignalManager):
             self.public_mediator_msg_ready,
             self.internal_mediator_msg_ready,
             self.new_mediator_assigned,
+            self.mediator_released,
             self.mediator_intervention_completed
        ]
\ No newline at end of file
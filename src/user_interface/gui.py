@@ -27,6 +27,7 @@ class ChatbotGUI(QWidget):
         self.init_ui()
         self.signals = signal_manager.gui_signals
         self.start_time = time.time()  # Initialize start time
+        self.streaming_message = None  # (item, widget) of the reply still streaming in
         #self.message_submitted_gui.connect(self.display_response)
         logging.info("GUI initialized")
 
@@ -69,6 +70,13 @@ class ChatbotGUI(QWidget):
         self.message_list.addItem(list_item)
         self.message_list.setItemWidget(list_item, message_widget)
         self.message_list.scrollToBottom()  # Scroll to the latest message
+        return list_item, message_widget
+
+    def _update_message(self, list_item, message_widget, text):
+        message_widget.message_label.setText(text)
+        message_widget.adjustSize()
+        list_item.setSizeHint(message_widget.sizeHint())
+        self.message_list.scrollToBottom()
 
     def submit_message(self):
         """Send message to chatbot and display it in the chat window"""
@@ -93,12 +101,23 @@ class ChatbotGUI(QWidget):
     def display_response(self, response: dict):
         """Display chatbot response in the chat window."""
         logging.info("Appending response...")
-        response 
-        self._append_message(response, "BARD")
+        if self.streaming_message is not None:
+            self._update_message(*self.streaming_message, response)
+            self.streaming_message = None
+        else:
+            self._append_message(response, "BARD")
         #logging.info("\033[96mAbout to emit chatbot response displayed\033[0m")
         #self.signals..emit(True)
 
+    def display_partial_response(self, partial: str):
+        """Show a reply that is still streaming in, growing its bubble in place until `display_response`."""
+        if self.streaming_message is None:
+            self.streaming_message = self._append_message(partial, "BARD")
+        else:
+            self._update_message(*self.streaming_message, partial)
+
     def display_input_message(self, message):
+        self.streaming_message = None  # a reply cut off by an error stays as it is
         self._append_message(message, "You")
 
     def make_rating_callback(self, rating):
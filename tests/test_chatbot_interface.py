@@ -1,5 +1,14 @@
 import pytest
+import threading
+from unittest.mock import MagicMock
+from PyQt5.QtCore import Qt
 from src.chatbot_interface.chatbot import ChatbotInterface
+from src.backends.chat_completions import ChatCompletionsService
+from src.backends.browser_thread import BrowserCommand, BrowserCommandThread, CommandKind
+from src.backends.backend_setup.openai import ChatGPT
+from src.backends.backend_setup.chatgpt_scripts import SUBMIT_PROMPT_JS, AWAIT_RESPONSE_JS
+from src.mock_server.chat_server import MockChatServer
+from src.signals.chat_signal_manager import ChatbotState, MessageType
 from src.backends.gemini_base import Bard
 from src.backends.backend_setup.discover import get_chrome_version
 
@@ -65,3 +74,173 @@ def test_get_status(chatbot_interface):
     chatbot.is_connected = True
     status = chatbot.get_status()
     assert status == {'connected': True}
+
+
+class TestChatCompletionsService:
+    def setup_method(self, method):
+        self.server = MockChatServer(api_key="secret")
+        self.server.start()
+        self.signal_manager = MagicMock()
+        self.state = MagicMock()
+        self.state.is_state.return_value = False
+        self.service = ChatCompletionsService(self.signal_manager, self.state, base_url=self.server.url,
+                                              model="mock-gpt", api_key="secret")
+
+    def teardown_method(self, method):
+        self.service.close()
+        self.server.stop()
+
+    def test_turns_keep_history_over_one_pooled_connection(self):
+        self.service.open()
+        self.state.update_state.assert_called_with(ChatbotState.CONNECTED)
+        assert self.service.query("hello") == "You said: hello"
+        assert self.service.query("again") == "You said: again"
+        self.signal_manager.api_signals.chatbot_response_collected.emit.assert_called_with("You said: again")
+        assert [m["content"] for m in self.server.completions[-1]["messages"]] == ["hello", "You said: hello", "again"]
+        assert self.server.stats()["connections"] == 1
+
+    def test_state_machine_moves_through_busy_and_ready(self):
+        self.service.open()
+        self.state.reset_mock()
+        self.service.query("hello")
+        assert [c.args[0] for c in self.state.update_state.call_args_list] == [ChatbotState.API_BUSY,
+                                                                               ChatbotState.API_READY]
+
+    def test_failures_are_reported_on_api_error(self):
+        self.service.open()
+        self.service.session.headers["Authorization"] = "Bearer wrong"
+        assert self.service.query("hello") is None
+        self.signal_manager.api_signals.api_error.emit.assert_called_once()
+
+    def test_unreachable_endpoint_fails_to_open(self):
+        self.server.stop()
+        with pytest.raises(ConnectionError):
+            self.service.open()
+
+    def test_interface_selects_the_backend_from_config(self):
+        chatbot = ChatbotInterface(MagicMock())
+        chatbot.configure({"backend": "chat_completions",
+                           "chat_completions": {"base_url": self.server.url, "api_key": "secret"}})
+        chatbot.connect_to_API()
+        assert isinstance(chatbot.bard, ChatCompletionsService)
+        assert chatbot.state.is_state(ChatbotState.CONNECTED)
+        chatbot.close_connection()
+
+    def test_streamed_replies_arrive_as_growing_partials(self):
+        self.server.token_delay = 0.01
+        self.service.partial_interval = 0.0
+        self.service.open()
+        assert self.service.query("one two three") == "You said: one two three"
+        partials = [c.args[0] for c in self.signal_manager.api_signals.chatbot_partial_response.emit.call_args_list]
+        assert partials == ["You", "You said:", "You said: one", "You said: one two", "You said: one two three"]
+        self.signal_manager.api_signals.chatbot_response_collected.emit.assert_called_once_with(
+            "You said: one two three")
+        assert self.service.first_token_latency < 0.5
+        assert self.server.completions[-1]["stream"] is True
+
+    def test_partials_are_throttled_but_end_with_the_full_reply(self):
+        self.service.partial_interval = 60.0
+        self.service.open()
+        self.service.query("one two three")
+        partials = [c.args[0] for c in self.signal_manager.api_signals.chatbot_partial_response.emit.call_args_list]
+        assert partials == ["You", "You said: one two three"]
+
+    def test_non_streaming_turns_emit_no_partials(self):
+        self.service.stream = False
+        self.service.open()
+        assert self.service.query("hello") == "You said: hello"
+        self.signal_manager.api_signals.chatbot_partial_response.emit.assert_not_called()
+        assert "stream" not in self.server.completions[-1]
+
+    def test_interface_forwards_partials_of_displayed_replies_only(self):
+        chatbot = ChatbotInterface(MagicMock())
+        chatbot.set_mode(MessageType.USER)
+        chatbot.process_partial_response("Hel")
+        chatbot.signals.public_chatbot_partial_received.emit.assert_called_once_with("BARD: Hel")
+        chatbot.signals.reset_mock()
+        chatbot.set_mode(MessageType.MEDIATOR_INTERNAL)
+        chatbot.process_partial_response("Hel")
+        chatbot.signals.public_chatbot_partial_received.emit.assert_not_called()
+
+
+class TestBrowserCommandThread:
+    def setup_method(self, method):
+        self.driver = MagicMock()
+        self.browser = BrowserCommandThread(self.driver)
+        self.completed, self.failed = [], []
+        self.browser.command_completed.connect(lambda tag, result: self.completed.append((tag, result)),
+                                               Qt.DirectConnection)
+        self.browser.command_failed.connect(lambda tag, kind, message: self.failed.append((tag, kind, message)),
+                                            Qt.DirectConnection)
+        self.browser.start()
+
+    def teardown_method(self, method):
+        self.browser.stop()
+
+    def test_commands_run_in_order_on_one_thread_that_owns_the_driver(self):
+        threads = []
+
+        def step(name):
+            def run(driver):
+                threads.append(threading.get_ident())
+                return (driver, name)
+            return run
+
+        futures = [self.browser.submit(BrowserCommand(CommandKind.LOCATE, step(name), name))
+                   for name in ("locate", "act", "read")]
+        assert [future.result(timeout=5) for future in futures] == [(self.driver, "locate"), (self.driver, "act"),
+                                                                    (self.driver, "read")]
+        assert [tag for tag, _ in self.completed] == ["locate", "act", "read"]
+        assert len(set(threads)) == 1 and threads[0] != threading.get_ident()
+        assert self.browser.executed == 3
+
+    def test_a_failing_command_does_not_stop_the_thread(self):
+        def fail(driver):
+            raise TimeoutError("no prompt")
+
+        failed = self.browser.submit(BrowserCommand(CommandKind.COMPOSITE, fail, "enter"))
+        with pytest.raises(TimeoutError):
+            failed.result(timeout=5)
+        assert self.failed == [("enter", "TimeoutError", "no prompt")]
+        assert self.browser.submit(BrowserCommand(CommandKind.READ, lambda driver: "text")).result(timeout=5) == "text"
+
+    def test_stopped_thread_cancels_queued_commands_and_refuses_new_ones(self):
+        started, release = threading.Event(), threading.Event()
+
+        def act(driver):
+            started.set()
+            return release.wait(5)
+
+        running = self.browser.submit(BrowserCommand(CommandKind.ACT, act))
+        queued = self.browser.submit(BrowserCommand(CommandKind.READ, lambda driver: "late"))
+        assert started.wait(5)
+        threading.Timer(0.05, release.set).start()
+        self.browser.stop()
+        assert running.result(timeout=5) is True
+        assert queued.cancelled()
+        with pytest.raises(RuntimeError):
+            self.browser.submit(BrowserCommand(CommandKind.READ, lambda driver: "late")).result(timeout=5)
+
+
+class TestChatGPTTurn:
+    def test_a_turn_is_two_round_trips_on_the_browser_thread(self):
+        driver = MagicMock()
+        driver.other_references = 0
+        driver.execute_async_script.side_effect = [{"ok": True}, {"text": "hi there"}]
+        signal_manager = MagicMock()
+        collected = threading.Event()
+        signal_manager.api_signals.chatbot_response_collected.emit.side_effect = lambda reply: collected.set()
+        state = MagicMock()
+        state.is_state.return_value = False
+        chatgpt = ChatGPT(signal_manager, state, driver=driver, path="chrome")
+        chatgpt.open()
+        driver.reset_mock()
+        chatgpt.query("hello")
+        assert collected.wait(5)
+        chatgpt.close()
+        signal_manager.api_signals.chatbot_response_collected.emit.assert_called_once_with("hi there")
+        assert [c.args[0] for c in driver.execute_async_script.call_args_list] == [SUBMIT_PROMPT_JS, AWAIT_RESPONSE_JS]
+        assert driver.execute_async_script.call_args_list[0].args[3] == "hello"
+        driver.find_element.assert_not_called()
+        driver.execute_script.assert_not_called()
+        state.update_state.assert_called_with(ChatbotState.API_READY)
@@ -1,7 +1,14 @@
 # tests/test_data_collector.py
 
+import tempfile
+import threading
+import time
+from concurrent.futures import wait
+from unittest.mock import MagicMock
 import pytest
 from src.data_collection.collector import ClientDataCollector
+from src.network_handler.handler import NetworkHandler
+from src.interfaces.data_models import MediatorData
 
 class TestDataCollector:
     def setup_method(self):
@@ -23,3 +30,85 @@ class TestDataCollector:
         assert isinstance(serialized, str)
         deserialized = self.collector.to_model(serialized)
         assert deserialized == data
+
+
+class TestMediatorSwap:
+    def setup_method(self):
+        self.signal_manager = MagicMock()
+        self.collector = ClientDataCollector(self.signal_manager)
+        self.network_handler = NetworkHandler()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.network_handler.mediator_cache.directory = self.cache_dir.name
+        self.collector.set_network_handler(self.network_handler)
+        self.release = threading.Event()
+        self.response = MagicMock(status_code=200, headers={"Content-Type": "application/json", "ETag": '"v1"'},
+                                  content=b'{"new_mediator": "abc", "message": "ok"}')
+
+        def slow_swap(data, timeout=None):
+            self.release.wait(5)
+            return self.response
+
+        self.network_handler.request_mediator_swap = MagicMock(side_effect=slow_swap)
+
+    def teardown_method(self):
+        self.release.set()
+        self.network_handler.stop()
+        self.cache_dir.cleanup()
+
+    def test_swap_does_not_block_and_emits_when_done(self):
+        future = self.collector.request_mediator_swap()
+        assert not future.done()
+        self.release.set()
+        future.result(timeout=5)
+        emit = self.signal_manager.collector_signals.new_mediator_fetched.emit
+        deadline = time.monotonic() + 5
+        while not emit.called and time.monotonic() < deadline:
+            time.sleep(0.01)  # done callbacks run after result() returns
+        emit.assert_called_once_with(
+            {"new_mediator": "abc", "message": "ok", "frame": None, "genome": None, "etag": '"v1"'}
+        )
+        assert self.collector.pending_swap is None
+
+    def test_second_request_joins_pending_swap(self):
+        first = self.collector.request_mediator_swap()
+        second = self.collector.request_mediator_swap()
+        assert first is second
+        self.release.set()
+        first.result(timeout=5)
+        self.network_handler.request_mediator_swap.assert_called_once()
+
+    def test_coalesced_callers_are_traced(self):
+        first = self.collector.request_mediator_swap(requested_by="startup")
+        self.collector.request_mediator_swap(requested_by="gui")
+        self.collector.request_mediator_swap(requested_by="pool_miss")
+        self.release.set()
+        first.result(timeout=5)
+        deadline = time.monotonic() + 5
+        while not self.collector.swap_traces and time.monotonic() < deadline:
+            time.sleep(0.01)
+        trace = self.collector.swap_traces[-1]
+        assert trace["callers"] == ["startup", "gui", "pool_miss"]
+        assert trace["outcome"] == "completed"
+        assert trace["finished_at"] >= trace["started_at"]
+        assert self.collector.coalesced_swaps == 2
+
+    def test_cancelled_swap_result_is_discarded(self):
+        future = self.collector.request_mediator_swap()
+        assert self.collector.cancel_mediator_swap()
+        self.release.set()
+        wait([future], timeout=5)
+        self.signal_manager.collector_signals.new_mediator_fetched.emit.assert_not_called()
+
+    def test_mock_response_is_not_reported_as_error(self):
+        self.collector._handle_mediator_response({"status": "success", "data": "Mock response"})
+        self.signal_manager.collector_signals.collector_error.emit.assert_not_called()
+
+    def test_pushed_mediator_joins_the_fetched_flow(self):
+        self.network_handler.push_listener(MediatorData(new_mediator="abc", message="ok", etag='"v2"'))
+        self.signal_manager.collector_signals.new_mediator_fetched.emit.assert_called_once_with(
+            {"new_mediator": "abc", "message": "ok", "frame": None, "genome": None, "etag": '"v2"'}
+        )
+
+    def test_network_error_response_is_reported(self):
+        self.collector._handle_mediator_response({"status_code": "error", "message": "down"})
+        self.signal_manager.collector_signals.collector_error.emit.assert_called_once_with("down")
@@ -1,8 +1,28 @@
 # tests/test_mediator_management.py
 
+import threading
 import pytest
 from unittest.mock import MagicMock
-from src.mediator_manager.manager import MediatorManagementModule
+from src.mediator_manager.manager import Mediator, MediatorManagementModule, normalize_features
+import base64
+import json
+import pickle
+import numpy as np
+import random
+from neat.activations import ActivationFunctionSet, sigmoid_activation, relu_activation
+from neat.aggregations import AggregationFunctionSet, sum_aggregation
+from neat.nn import FeedForwardNetwork
+from src.interfaces.data_models import MediatorData, UserData
+from src.mediator_manager.mediator_pool import MediatorPool
+from src.mediator_manager.mediator_cache import MediatorCache
+from src.mediator_manager.genome_codec import (ACTIVATIONS, AGGREGATIONS, FrameError, decode_frame,
+                                               encode_frame, read_frame_header)
+from src.mediator_manager.compiled_network import CompiledNetwork, CompiledNetworkCache, CompileError
+from src.mediator_manager.genome_schema import GenomeSchemaError, decode_genome, encode_genome
+from src.mediator_manager.sentiment import SentimentScorer, load_lexicon_engine, load_vader
+from src.mediator_manager.lexicon_engine import TOLERANCE, LexiconSentimentEngine
+from src.mediator_manager.feature_store import FeatureStore
+from src.mediator_manager.scheduler import EvaluationScheduler
 
 class TestMediatorManagementModule:
     def setup_method(self):
@@ -66,4 +86,486 @@ class TestMediatorManagementModule:
 
     def test_generate_output(self):
         output = self.mmm.generate_output()
-        assert output == "Generated output based on historical input"
\ No newline at end of file
+        assert output == "Generated output based on historical input"
+
+class TestMediatorPool:
+    def setup_method(self):
+        self.fetch = MagicMock(side_effect=lambda: MagicMock(name="mediator_data"))
+        self.decode = MagicMock(side_effect=lambda data: MagicMock(name="mediator"))
+        self.pool = MediatorPool(self.fetch, self.decode, size=2, low_watermark=0)
+
+    def teardown_method(self):
+        self.pool.shutdown()
+
+    def test_refill_fills_pool_to_size(self):
+        self.pool.refill().result(timeout=5)
+        assert self.pool.stats()["available"] == 2
+        assert self.fetch.call_count == 2
+
+    def test_acquire_counts_hits_and_misses(self):
+        assert self.pool.acquire() is None
+        self.pool.refill().result(timeout=5)
+        assert self.pool.acquire() is not None
+        stats = self.pool.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_stale_mediators_are_dropped(self):
+        self.pool.refill().result(timeout=5)
+        self.pool.max_age = 0.0
+        assert self.pool.acquire() is None
+        assert self.pool.stats()["expired"] == 2
+
+    def test_shutdown_pool_ignores_acquire_and_restarts(self):
+        self.pool.refill().result(timeout=5)
+        self.pool.shutdown()
+        assert self.pool.acquire() is None
+        assert self.pool.refill() is None
+        self.pool.start().result(timeout=5)
+        assert self.pool.stats()["available"] == 2
+
+    def test_fill_running_during_shutdown_discards_result(self):
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_fetch():
+            started.set()
+            release.wait(5)
+            return MagicMock(name="mediator_data")
+
+        self.fetch.side_effect = blocking_fetch
+        future = self.pool.refill()
+        started.wait(5)
+        self.pool.shutdown()
+        release.set()
+        future.result(timeout=5)
+        assert self.fetch.call_count == 1
+        assert self.pool.stats()["available"] == 0
+
+    def test_failed_fetch_stops_refill(self):
+        self.fetch.side_effect = lambda: None
+        self.pool.refill().result(timeout=5)
+        assert self.pool.stats()["available"] == 0
+
+
+class TestRequestMediator:
+    def setup_method(self):
+        self.mmm = MediatorManagementModule(MagicMock())
+
+    def test_pool_hit_swaps_without_network(self):
+        mediator = MagicMock(genome_id=7)
+        self.mmm.attach_mediator_pool(MagicMock(acquire=MagicMock(return_value=mediator)))
+        self.mmm.request_mediator()
+        assert self.mmm.current_mediator is mediator
+        self.mmm.signals.mediator_released.emit.assert_called_once()
+        self.mmm.signals.new_mediator_assigned.emit.assert_called_once_with({'genome_id': 7})
+        self.mmm.signals.mediator_requested.emit.assert_not_called()
+
+    def test_pool_config_applies_when_attached_later(self):
+        self.mmm.configure({"mediator_pool": {"size": 5}})
+        pool = MediatorPool(MagicMock(), MagicMock())
+        self.mmm.attach_mediator_pool(pool)
+        assert pool.size == 5
+
+    def test_pool_miss_requests_from_network(self):
+        self.mmm.attach_mediator_pool(MagicMock(acquire=MagicMock(return_value=None)))
+        self.mmm.request_mediator()
+        self.mmm.signals.mediator_requested.emit.assert_called_once()
+
+
+def make_network():
+    node_evals = [
+        (3, relu_activation, sum_aggregation, 0.1, 1.0, [(-1, 0.5), (-2, -0.25)]),
+        (0, sigmoid_activation, sum_aggregation, -0.2, 1.0, [(3, 1.5), (-3, 0.75)]),
+        (1, sigmoid_activation, sum_aggregation, 0.0, 1.0, [(-1, -1.0)]),
+        (2, sigmoid_activation, sum_aggregation, 0.3, 1.0, []),
+    ]
+    return FeedForwardNetwork([-1, -2, -3], [0, 1, 2], node_evals)
+
+
+class TestGenomeCodec:
+    def test_round_trip_matches_original_network(self):
+        network = make_network()
+        genome_id, decoded = decode_frame(encode_frame(42, network, "hello"))
+        assert genome_id == 42
+        for inputs in ([0.0, 0.0, 0.0], [0.5, -0.3, 1.0], [-1.0, 2.0, 0.1]):
+            assert np.allclose(decoded.activate(inputs), network.activate(inputs), atol=1e-6)
+
+    def test_frame_is_smaller_than_json_genome(self):
+        network = make_network()
+        assert len(encode_frame(42, network)) < len(json.dumps(encode_genome(42, network)))
+
+    def test_header_is_read_without_decoding(self):
+        assert read_frame_header(encode_frame(7, make_network(), "msg")) == (7, "msg")
+
+    def test_truncated_frame_is_rejected(self):
+        frame = encode_frame(7, make_network())
+        with pytest.raises(FrameError):
+            decode_frame(frame[:-1])
+        with pytest.raises(FrameError):
+            decode_frame(b"JUNK" + frame[4:])
+
+    def test_manager_decodes_frames_and_genomes(self):
+        mmm = MediatorManagementModule(MagicMock())
+        network = make_network()
+        framed = mmm.decode_mediator(MediatorData(message="", frame=encode_frame(5, network)))
+        genome = mmm.decode_mediator(MediatorData(message="", genome=encode_genome(6, network)))
+        assert (framed.genome_id, genome.genome_id) == (5, 6)
+        assert np.allclose(framed.process_input([0.2, 0.4, 0.6])[0], genome.process_input([0.2, 0.4, 0.6])[0])
+
+    def test_manager_refuses_pickled_payloads(self):
+        mmm = MediatorManagementModule(MagicMock())
+        with pytest.raises(GenomeSchemaError):
+            mmm.decode_mediator(MediatorData(
+                new_mediator=base64.b64encode(pickle.dumps((6, make_network()))).decode(), message=""))
+
+
+def make_mixed_network(seed=0, layers=3, width=6):
+    """A random layered network using every built-in activation and aggregation, with skip links."""
+    rng = random.Random(seed)
+    activation_set, aggregation_set = ActivationFunctionSet(), AggregationFunctionSet()
+    inputs, outputs = [-1, -2, -3], [0, 1, 2, 3]
+    node_evals, available, key = [], list(inputs), 4
+    for _ in range(layers):
+        layer = []
+        for _ in range(width):
+            links = [(source, rng.uniform(-1.5, 1.5)) for source in rng.sample(available, rng.randint(0, 3))]
+            node_evals.append((key, activation_set.get(rng.choice(ACTIVATIONS)),
+                               aggregation_set.get(rng.choice(AGGREGATIONS)),
+                               rng.uniform(-0.5, 0.5), rng.uniform(0.5, 1.5), links))
+            layer.append(key)
+            key += 1
+        available += layer
+    for node in outputs:
+        links = [(source, rng.uniform(-1.5, 1.5)) for source in rng.sample(available, 5)]
+        node_evals.append((node, sigmoid_activation, aggregation_set.get(rng.choice(AGGREGATIONS)),
+                           0.1, 1.0, links))
+    return FeedForwardNetwork(inputs, outputs, node_evals)
+
+
+class TestCompiledNetwork:
+    def test_outputs_match_neat(self):
+        rng = random.Random(1)
+        for seed in range(20):
+            network = make_mixed_network(seed)
+            compiled = CompiledNetwork.compile(network)
+            for _ in range(10):
+                inputs = [rng.uniform(-2.0, 2.0) for _ in range(3)]
+                assert np.allclose(compiled.activate(inputs), network.activate(inputs), atol=1e-5, rtol=1e-4)
+
+    def test_batch_matches_single_evaluation(self):
+        network = make_network()
+        compiled = CompiledNetwork.compile(network)
+        rows = np.random.default_rng(0).uniform(-1.0, 1.0, size=(50, 3))
+        batch = compiled.activate_batch(rows)
+        assert batch.shape == (50, 3) and batch.dtype == np.float32
+        assert np.allclose(batch, [network.activate(list(row)) for row in rows], atol=1e-6)
+
+    def test_nodes_are_grouped_into_layers(self):
+        assert CompiledNetwork.compile(make_network()).layers == 2
+
+    def test_unsupported_networks_are_rejected(self):
+        custom = FeedForwardNetwork([-1], [0], [(0, lambda z: z, sum_aggregation, 0.0, 1.0, [(-1, 1.0)])])
+        with pytest.raises(CompileError):
+            CompiledNetwork.compile(custom)
+        recurrent = FeedForwardNetwork([-1], [0], [(0, sigmoid_activation, sum_aggregation, 0.0, 1.0, [(0, 1.0)])])
+        with pytest.raises(CompileError):
+            CompiledNetwork.compile(recurrent)
+
+    def test_attached_mediator_is_compiled(self):
+        mmm = MediatorManagementModule(MagicMock())
+        network = make_network()
+        mmm.attach_mediator(MediatorData(new_mediator="", message="", frame=encode_frame(5, network)))
+        mediator = mmm.current_mediator
+        assert mediator.compiled_network is not None
+        biggest, index = mediator.process_input([0.2, 0.4, 0.6])
+        outputs = network.activate([0.2, 0.4, 0.6])
+        assert index == outputs.index(max(outputs)) and np.isclose(biggest, max(outputs), atol=1e-6)
+
+
+class TestGenomeSchema:
+    def test_round_trip_builds_the_compiled_evaluator(self):
+        network = make_mixed_network(seed=2)
+        payload = encode_genome(9, network)
+        random.Random(0).shuffle(payload["nodes"])  # evaluation order is recovered from the connections
+        genome_id, decoded, compiled = decode_genome(json.dumps(payload))
+        assert genome_id == 9
+        rows = np.random.default_rng(1).uniform(-1, 1, (20, 3))
+        expected = np.asarray([network.activate(list(row)) for row in rows])
+        assert np.allclose(compiled.activate_batch(rows), expected, atol=1e-5)
+        assert np.allclose([decoded.activate(list(row)) for row in rows], expected)
+
+    def test_invalid_genomes_are_rejected(self):
+        payload = encode_genome(1, make_network())
+        cyclic = json.loads(json.dumps(payload))
+        cyclic["connections"] += [{"source": 0, "target": 1, "weight": 1.0}, {"source": 1, "target": 0, "weight": 1.0}]
+        unknown_function = json.loads(json.dumps(payload))
+        unknown_function["nodes"][0]["activation"] = "__import__"
+        dangling = json.loads(json.dumps(payload))
+        dangling["connections"].append({"source": 99, "target": 0, "weight": 1.0})
+        for invalid in (cyclic, unknown_function, dangling, "not json", {"genome_id": 1}):
+            with pytest.raises(GenomeSchemaError):
+                decode_genome(invalid)
+
+    def test_recent_genomes_skip_decoding(self):
+        mmm = MediatorManagementModule(MagicMock())
+        data = MediatorData(message="", genome=encode_genome(6, make_network()))
+        first = mmm.decode_mediator(data)
+        second = mmm.decode_mediator(data.model_copy(update={"genome": {"genome_id": 6}}))
+        assert second.compiled_network is first.compiled_network
+        assert mmm.compiled_networks.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = CompiledNetworkCache(max_entries=2)
+        for genome_id in (1, 2):
+            cache.put(genome_id, make_network(), None)
+        cache.get(1)
+        cache.put(3, make_network(), None)
+        assert cache.get(2) is None and cache.get(1) is not None
+
+
+class TestEvaluateBatch:
+    def setup_method(self):
+        self.mmm = MediatorManagementModule(MagicMock())
+        self.mmm.attach_mediator(MediatorData(new_mediator="", message="", frame=encode_frame(5, make_mixed_network(3))))
+        rng = np.random.default_rng(0)
+        self.rows = np.column_stack([rng.uniform(-1, 1, 200), rng.uniform(0, 600, 200), rng.integers(0, 12, 200)])
+
+    def test_batch_matches_the_live_path(self):
+        outputs, indices = self.mmm.evaluate_batch(self.rows)
+        assert outputs.shape == (200, 4) and indices.shape == (200,)
+        for row, output, index in zip(self.rows, outputs, indices):
+            biggest, live_index = self.mmm.current_mediator.process_input(normalize_features(*row).tolist())
+            assert (live_index, biggest) == (index, output[index])
+
+    def test_shared_normalization_matches_the_live_helpers(self):
+        self.mmm.unanswered_count = 3
+        assert normalize_features(0.5, 0.0, 3)[2] == self.mmm.calculate_normalized_unanswered()
+        assert normalize_features(0.5, 150.0, 3)[1] == 0.5
+
+    def test_uncompiled_mediators_are_evaluated_row_by_row(self):
+        mediator = self.mmm.current_mediator
+        compiled, mediator.compiled_network = mediator.compiled_network, None
+        mediator.compile = lambda: None
+        outputs, indices = self.mmm.evaluate_batch(self.rows[:10])
+        assert np.allclose(outputs, compiled.activate_batch(normalize_features(*self.rows[:10].T)), atol=1e-5)
+
+    def test_rows_must_have_three_columns(self):
+        with pytest.raises(ValueError):
+            self.mmm.evaluate_batch(np.zeros((4, 2)))
+
+
+class TestSentimentScorer:
+    def setup_method(self):
+        self.analyzer = MagicMock(spec=["polarity_scores"])
+        self.analyzer.polarity_scores.side_effect = lambda text: {"compound": len(text) / 100}
+        self.scorer = SentimentScorer(lambda: self.analyzer, max_entries=2)
+
+    def test_repeated_messages_are_scored_once(self):
+        assert self.scorer.score("hello") == self.scorer.score("hello") == 0.05
+        self.analyzer.polarity_scores.assert_called_once_with("hello")
+        assert self.scorer.stats() == {"entries": 1, "hits": 1, "misses": 1, "hit_rate": 0.5,
+                                       "warm_up_seconds": self.scorer.warm_up_seconds}
+
+    def test_least_recently_used_scores_are_evicted(self):
+        for text in ("a", "b", "a", "c", "a", "b"):
+            self.scorer.score(text)
+        assert [call.args[0] for call in self.analyzer.polarity_scores.call_args_list] == ["a", "b", "c", "b"]
+
+    def test_batch_scores_each_distinct_message_once(self):
+        self.scorer.score("hi")
+        scores = self.scorer.score_batch(["hi", "there", "hi", "there", "you"])
+        assert np.allclose(scores, [0.02, 0.05, 0.02, 0.05, 0.03])
+        assert self.analyzer.polarity_scores.call_count == 3
+
+    def test_analyzer_is_built_once_on_first_use(self):
+        factory = MagicMock(return_value=self.analyzer)
+        scorer = SentimentScorer(factory)
+        factory.assert_not_called()
+        scorer.warm_up_in_background().join(timeout=5)
+        scorer.warm_up()
+        scorer.score("hello")
+        factory.assert_called_once()
+        assert scorer.warm_up_seconds is not None
+
+    def test_manager_scores_through_the_cache(self):
+        mmm = MediatorManagementModule(MagicMock())
+        mmm.sentiment_scorer = self.scorer
+        assert mmm.perform_sentiment_analysis("hello") == mmm.perform_sentiment_analysis("hello")
+        assert mmm.perform_sentiment_analysis(None) == 0.0
+        self.analyzer.polarity_scores.assert_called_once_with("hello")
+
+
+CHAT_MESSAGES = [
+    "I love this so much!", "This is not good at all.", "I really HATE waiting, but the food was AMAZING!!",
+    "meh", "", "Why would you say that??", "You are the worst bot ever", "Thanks, that was kind of helpful",
+    "I don't think that's funny", "Absolutely fantastic work, thank you :)", "not bad", "at least it works",
+    "least helpful answer ever", "I am so sad and lonely today", "Stop ignoring me!!!", "never so happy",
+    "This is GREAT but slow", "I hardly like it", "What a terrible, horrible, no good day", "good good good bad",
+    "the shit is great", "yeah right, very funny", "it was kind of good and sort of nice", "This is never this bad",
+    "I'm not NOT happy", "\"awesome\" job", "Could you please explain that again?", "NO NO NO",
+]
+
+
+class TestLexiconSentimentEngine:
+    @classmethod
+    def setup_class(cls):
+        cls.vader = load_vader()
+        cls.engine = LexiconSentimentEngine.from_vader(cls.vader)
+
+    def test_compound_scores_match_vader(self):
+        expected = np.array([self.vader.polarity_scores(text)["compound"] for text in CHAT_MESSAGES])
+        assert np.abs(self.engine.compound_batch(CHAT_MESSAGES) - expected).max() <= TOLERANCE
+
+    def test_single_scores_match_the_batch(self):
+        batch = self.engine.compound_batch(CHAT_MESSAGES)
+        assert [self.engine.polarity_scores(text)["compound"] for text in CHAT_MESSAGES] == batch.tolist()
+
+    def test_backend_is_selected_through_configure(self):
+        mmm = MediatorManagementModule(MagicMock())
+        mmm.configure({"sentiment_backend": "lexicon"})
+        assert mmm.sentiment_scorer.analyzer_factory is load_lexicon_engine
+        assert mmm.score_messages(["I love it", "I hate it"]).tolist() == self.engine.compound_batch(
+            ["I love it", "I hate it"]).tolist()
+        with pytest.raises(ValueError):
+            mmm.configure({"sentiment_backend": "unknown"})
+
+
+class TestFeatureStore:
+    def test_window_wraps_around_and_keeps_the_newest(self):
+        store = FeatureStore(capacity=4)
+        for i in range(6):
+            store.append(100.0 + i, i / 10, latency=float(i), unanswered=i)
+        assert len(store) == 4
+        assert store.window(store.unanswered).tolist() == [2, 3, 4, 5]
+        assert store.window(store.sentiments, 2).tolist() == [0.4, 0.5]
+        assert np.isclose(store.mean_sentiment(3), 0.4)
+        assert store.latest() == {"timestamp": 105.0, "sentiment": 0.5, "latency": 5.0, "unanswered": 5}
+
+    def test_unwrapped_windows_are_views(self):
+        store = FeatureStore(capacity=8)
+        for i in range(5):
+            store.append(float(i), 0.0)
+        assert np.shares_memory(store.window(store.timestamps, 3), store.timestamps)
+
+    def test_rates_and_latencies(self):
+        store = FeatureStore()
+        assert store.mean_sentiment() == 0.0 and store.latest() is None
+        store.append(10.0, 0.1)
+        store.append(50.0, 0.2, latency=4.0)
+        store.append(70.0, 0.3, latency=2.0)
+        assert store.mean_latency() == 3.0
+        assert store.message_rate(seconds=30.0, now=75.0) == 4.0
+
+    def test_manager_records_messages(self):
+        mmm = MediatorManagementModule(MagicMock())
+        mmm.sentiment_scorer = SentimentScorer(lambda: MagicMock(spec=["polarity_scores"], polarity_scores=MagicMock(
+            return_value={"compound": 0.5})))
+        mmm.record_chatbot_message({"last_response": "hi", "last_response_time": 100.0, "message_mode": "public"})
+        mmm.record_chatbot_message({"last_response": "hello?", "last_response_time": 110.0, "message_mode": "public"})
+        mmm.record_user_message({"last_message": "hey", "last_message_time": 115.0})
+        assert mmm.feature_store.latest() == {"timestamp": 115.0, "sentiment": 0.5, "latency": 5.0, "unanswered": 2}
+        assert mmm.unanswered_count == 0
+
+
+class TestEvaluationScheduler:
+    def test_idle_ticks_back_off_and_activity_resets(self):
+        scheduler = EvaluationScheduler(base_interval=10.0, max_interval=40.0)
+        assert [scheduler.next_interval() for _ in range(4)] == [20.0, 40.0, 40.0, 40.0]
+        scheduler.activity()
+        assert scheduler.next_interval() == 10.0
+        assert scheduler.next_interval() == 20.0
+
+    def test_unchanged_inputs_are_skipped_per_mediator(self):
+        scheduler = EvaluationScheduler(tolerance=1e-3)
+        first, second = object(), object()
+        assert scheduler.should_evaluate(first, [0.5, 0.1, 1.0])
+        assert not scheduler.should_evaluate(first, [0.5, 0.1005, 1.0])
+        assert scheduler.should_evaluate(first, [0.5, 0.2, 1.0])
+        assert scheduler.should_evaluate(second, [0.5, 0.2, 1.0])
+        assert scheduler.stats() == {"executed": 3, "skipped": 1, "immediate": 0, "predicted": 0,
+                                     "interval": 10.0}
+
+    def test_messages_trigger_an_immediate_evaluation(self):
+        mmm = MediatorManagementModule(MagicMock())
+        mmm.timer_thread = MagicMock()
+        mmm.sentiment_scorer = SentimentScorer(lambda: MagicMock(spec=["polarity_scores"], polarity_scores=MagicMock(
+            return_value={"compound": 0.5})))
+        mmm.record_user_message({"last_message": "hey", "last_message_time": 115.0})
+        mmm.timer_thread.schedule.assert_called_once_with(0)
+        mmm.update_mediator()
+        mmm.timer_thread.schedule.assert_called_with(mmm.scheduler.base_interval)
+        assert mmm.evaluation_stats()["immediate"] == 1
+
+    def test_manager_skips_repeated_inputs(self):
+        mmm = MediatorManagementModule(MagicMock())
+        mmm.current_mediator = MagicMock()
+        mmm.current_mediator.process_input.return_value = (0.1, 0)
+        mmm.current_mediator.evaluate_batch.return_value = (np.zeros((1, 4)), np.zeros(1))
+        mmm.normalize_input_data = MagicMock(return_value=[0.5, 0.1, 1.0])
+        data = UserData(genome_id=1, time_since_startup=5.0, user_rating=0, last_message="hey",
+                        last_message_time=115.0)
+        mmm.process_input(data)
+        mmm.process_input(data)
+        mmm.current_mediator.process_input.assert_called_once()
+        assert mmm.evaluation_stats()["skipped"] == 1
+
+    def test_predicted_crossing_replaces_polling_until_activity(self):
+        scheduler = EvaluationScheduler(base_interval=10.0)
+        scheduler.predict(3.0)
+        assert 2.9 < scheduler.next_interval() <= 3.0
+        scheduler.activity()
+        assert scheduler.next_interval() == 10.0
+        assert scheduler.stats()["predicted"] == 1
+
+    def test_manager_arms_the_timer_for_the_first_crossing(self):
+        mmm = MediatorManagementModule(MagicMock())
+        mmm.timer_thread = MagicMock()
+        # the output reaches 0.5 once the normalized time reaches 0.2, i.e. after 60 s of silence
+        network = FeedForwardNetwork([-1, -2, -3], [0], [(0, sigmoid_activation, sum_aggregation, -0.2, 1.0,
+                                                          [(-2, 1.0)])])
+        mmm.set_mediator(Mediator(1, network))
+        mmm.timer_thread.reset_mock()
+        mmm.normalize_input_data = MagicMock(return_value=normalize_features(0.3, 30.0, 1).tolist())
+        mmm.process_input(UserData(genome_id=1, time_since_startup=5.0, user_rating=0, last_message="hey",
+                                   last_message_time=115.0))
+        (seconds,), _ = mmm.timer_thread.schedule.call_args
+        assert 30.0 <= seconds <= 30.25
+        mmm.scheduler.lookahead_horizon = 30.0
+        assert mmm.predict_crossing(normalize_features(0.3, 0.0, 1).tolist()) is None  # beyond the horizon
+
+
+class TestMediatorCache:
+    def test_payloads_are_content_addressed_and_survive_restart(self, tmp_path):
+        cache = MediatorCache(directory=str(tmp_path))
+        etag = cache.store("application/json", b"payload", genome_id=3)
+        cache.store("application/json", b"payload", etag='"other"')
+        assert len(list(tmp_path.glob("*.bin"))) == 1
+        restarted = MediatorCache(directory=str(tmp_path))
+        assert restarted.payload(etag) == ("application/json", b"payload")
+        assert restarted.etag_for(3) == etag
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = MediatorCache(directory=str(tmp_path), max_bytes=20)
+        first = cache.store("application/json", b"a" * 10)
+        second = cache.store("application/json", b"b" * 10)
+        cache.payload(first)  # first is now the most recently used
+        cache.store("application/json", b"c" * 10)
+        assert cache.payload(second) is None
+        assert cache.payload(first) is not None
+        assert cache.stats()["evicted"] == 1
+
+    def test_decoded_mediators_are_reused(self, tmp_path):
+        mmm = MediatorManagementModule(MagicMock())
+        cache = MediatorCache(directory=str(tmp_path))
+        mmm.attach_mediator_cache(cache)
+        frame = encode_frame(4, make_network())
+        etag = cache.store("application/x-mediator-frame", frame)
+        data = MediatorData(new_mediator="", message="", frame=frame, etag=etag)
+        assert mmm.decode_mediator(data) is mmm.decode_mediator(data)
+        assert cache.stats()["decode_hits"] == 1
+
+    def test_invalidate_drops_a_genome(self, tmp_path):
+        cache = MediatorCache(directory=str(tmp_path))
+        etag = cache.store("application/json", b"payload", genome_id=3)
+        assert cache.invalidate(3) == 1
+        assert cache.payload(etag) is None
@@ -1,8 +1,22 @@
 # tests/test_network_handler.py
 
+import gzip
+import json
+import os
+import time
 import pytest
+import requests
 from unittest.mock import MagicMock
 from src.network_handler.handler import NetworkHandler
+from src.interfaces.data_models import UserData
+from src.network_handler.uploader import BatchUploader
+from src.network_handler.outbox import Outbox
+from src.network_handler.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from src.mediator_manager.genome_codec import FRAME_CONTENT_TYPE, decode_frame, encode_frame
+from src.mediator_manager.genome_schema import decode_genome
+from neat.activations import sigmoid_activation
+from neat.aggregations import sum_aggregation
+from neat.nn import FeedForwardNetwork
 
 class TestNetworkHandler:
     def setup_method(self, method):
@@ -28,4 +42,436 @@ class TestNetworkHandler:
     def test_disconnect_calls_disconnect_once(self):
         self.nh.disconnect = MagicMock()
         self.nh.disconnect()
-        self.nh.disconnect.assert_called_once()
\ No newline at end of file
+        self.nh.disconnect.assert_called_once()
+
+class TestNetworkHandlerSession:
+    def setup_method(self, method):
+        self.nh = NetworkHandler()
+        self.nh.set_mock_mode(True)  # skip the warm-up request
+
+    def teardown_method(self, method):
+        self.nh.disconnect()
+
+    def test_connect_creates_pooled_session(self):
+        self.nh.configure({"pool_maxsize": 8})
+        self.nh.connect(self.nh.endpoint)
+        adapter = self.nh.session.get_adapter(self.nh.endpoint)
+        assert self.nh.connection_status
+        assert adapter._pool_maxsize == 8
+
+    def test_session_reused_across_requests(self):
+        self.nh.connect(self.nh.endpoint)
+        session = self.nh.session
+        session.post = MagicMock(return_value=MagicMock(status_code=200))
+        self.nh._post("user_data", data="{}")
+        self.nh._post("user_data", data="{}")
+        assert self.nh.session is session
+        assert session.post.call_count == 2
+
+    def test_post_uses_per_route_timeout(self):
+        self.nh.configure({"timeouts": {"user_data": (1.0, 2.0)}})
+        self.nh.connect(self.nh.endpoint)
+        self.nh.session.post = MagicMock(return_value=MagicMock(status_code=200))
+        self.nh._post("user_data", data="{}")
+        self.nh.session.post.assert_called_with(self.nh.endpoint + "/user_data", data="{}", timeout=(1.0, 2.0))
+
+    def test_disconnect_closes_session(self):
+        self.nh.connect(self.nh.endpoint)
+        session = self.nh.session
+        session.close = MagicMock()
+        self.nh.disconnect()
+        session.close.assert_called_once()
+        assert self.nh.session is None
+        assert not self.nh.connection_status
+
+    def test_post_after_disconnect_fails_instead_of_reconnecting(self):
+        self.nh.connect(self.nh.endpoint)
+        self.nh.disconnect()
+        with pytest.raises(requests.exceptions.ConnectionError):
+            self.nh._post("user_data", data="{}")
+        assert self.nh.session is None
+
+    def test_json_list_timeouts_become_tuples(self):
+        self.nh.configure({"default_timeout": [1.0, 5.0], "timeouts": {"user_data": [2.0, 3.0]}})
+        assert self.nh.default_timeout == (1.0, 5.0)
+        assert self.nh.get_timeout("user_data") == (2.0, 3.0)
+
+    def test_swap_timeout_override_keeps_connect_timeout(self):
+        self.nh.connect(self.nh.endpoint)
+        self.nh.set_mock_mode(False)
+        self.nh.session.post = MagicMock(return_value=MagicMock(status_code=200))
+        self.nh.request_mediator_swap(MagicMock(), timeout=7.0)
+        assert self.nh.session.post.call_args.kwargs["timeout"] == (3.05, 7.0)
+
+
+class TestBatchUploader:
+    def setup_method(self, method):
+        self.sent = []
+        self.uploader = BatchUploader(self.send, max_count=3, max_bytes=10_000, max_interval=60.0)
+
+    def send(self, body):
+        self.sent.append(json.loads(gzip.decompress(body)))
+        return True
+
+    def test_flush_sends_one_compressed_array(self):
+        self.uploader.add({"a": 1})
+        self.uploader.add({"b": 2})
+        assert self.uploader.flush()
+        assert self.sent == [[{"a": 1}, {"b": 2}]]
+        assert self.uploader.pending() == 0
+
+    def test_count_limit_triggers_background_flush(self):
+        self.uploader.start()
+        for i in range(3):
+            self.uploader.add({"i": i})
+        deadline = time.monotonic() + 5
+        while not self.sent and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.uploader.stop()
+        assert self.sent == [[{"i": 0}, {"i": 1}, {"i": 2}]]
+
+    def test_interval_triggers_background_flush(self):
+        self.uploader.max_interval = 0.05
+        self.uploader.start()
+        self.uploader.add({"late": True})
+        deadline = time.monotonic() + 5
+        while not self.sent and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.uploader.stop()
+        assert self.sent == [[{"late": True}]]
+
+    def test_stop_flushes_remaining_records(self):
+        self.uploader.start()
+        self.uploader.add({"a": 1})
+        self.uploader.stop()
+        assert self.sent == [[{"a": 1}]]
+
+    def test_failed_batch_is_requeued_in_order(self):
+        self.uploader.send = MagicMock(return_value=False)
+        self.uploader.add({"a": 1})
+        self.uploader.add({"b": 2})
+        assert not self.uploader.flush()
+        self.uploader.send = self.send
+        assert self.uploader.flush()
+        assert self.sent == [[{"a": 1}, {"b": 2}]]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestOutbox:
+    def setup_method(self, method):
+        self.sent = []
+        self.online = True
+
+    def send(self, route, body, headers):
+        if not self.online:
+            return False
+        self.sent.append((route, body, headers["Idempotency-Key"]))
+        return True
+
+    def make_outbox(self, tmp_path, **kwargs):
+        return Outbox(self.send, directory=str(tmp_path), base_delay=0.01, max_delay=0.05, **kwargs)
+
+    def test_records_replay_in_order_with_their_keys(self, tmp_path):
+        outbox = self.make_outbox(tmp_path)
+        outbox.start()
+        keys = [outbox.append("user_data", f"{i}".encode()) for i in range(5)]
+        assert wait_for(lambda: len(self.sent) == 5)
+        outbox.stop()
+        assert [body for _, body, _ in self.sent] == [b"0", b"1", b"2", b"3", b"4"]
+        assert [key for _, _, key in self.sent] == keys
+        assert outbox.pending() == 0
+
+    def test_replay_retries_until_the_server_answers(self, tmp_path):
+        self.online = False
+        outbox = self.make_outbox(tmp_path)
+        outbox.start()
+        outbox.append("user_data", b"late")
+        assert wait_for(lambda: outbox.stats()["appended"] == 1)
+        assert outbox.pending() == 1
+        self.online = True
+        assert wait_for(lambda: self.sent)
+        outbox.stop()
+        assert self.sent[0][1] == b"late"
+
+    def test_restart_resumes_after_the_last_delivered_record(self, tmp_path):
+        self.online = False
+        outbox = self.make_outbox(tmp_path)
+        outbox.start()
+        outbox.append("user_data", b"a", key="key-a")
+        outbox.append("user_data", b"b", key="key-b")
+        outbox.stop()
+        self.online = True
+        restarted = self.make_outbox(tmp_path)
+        assert restarted._count_unsent() == 2
+        restarted.start()
+        assert wait_for(lambda: len(self.sent) == 2)
+        restarted.stop()
+        assert [key for _, _, key in self.sent] == ["key-a", "key-b"]
+
+    def test_corrupted_record_stops_the_read(self, tmp_path):
+        self.online = False
+        outbox = self.make_outbox(tmp_path)
+        outbox.start()
+        outbox.append("user_data", b"intact")
+        outbox.append("user_data", b"damaged")
+        outbox.stop()
+        segment = outbox._segments()[0]
+        with open(segment, "r+b") as f:
+            f.seek(-1, 2)
+            f.write(b"X")
+        records = outbox._read_records(segment, 0)
+        assert [body for _, _, body in records] == [b"intact"]
+
+    def test_oldest_segments_are_evicted_over_the_size_bound(self, tmp_path):
+        self.online = False
+        outbox = self.make_outbox(tmp_path, max_bytes=300, segment_bytes=100)
+        outbox.start()
+        for i in range(20):
+            outbox.append("user_data", b"x" * 40)
+            assert wait_for(lambda: outbox.stats()["appended"] == i + 1)
+        outbox.stop()
+        assert outbox.stats()["evicted"] > 0
+        assert sum(os.path.getsize(s) for s in outbox._segments()) <= 300 + 100
+
+
+class TestNetworkHandlerOutbox:
+    def setup_method(self, method):
+        self.nh = NetworkHandler()
+
+    def test_failed_batch_is_spooled_with_a_key(self, tmp_path):
+        self.nh.outbox = Outbox(MagicMock(return_value=False), directory=str(tmp_path))
+        self.nh._post = MagicMock(side_effect=requests.exceptions.ConnectionError("down"))
+        assert self.nh.send_batch(b"batch")
+        assert self.nh.outbox.pending() == 1
+        sent_key = self.nh._post.call_args.kwargs["headers"]["Idempotency-Key"]
+        self.nh.outbox.start()
+        self.nh.outbox.stop()
+        _, header, body = self.nh.outbox._read_records(self.nh.outbox._segments()[0], 0)[0]
+        assert body == b"batch"
+        assert header["key"] == sent_key
+
+    def test_batches_queue_behind_spooled_records(self, tmp_path):
+        self.nh.outbox = Outbox(MagicMock(return_value=False), directory=str(tmp_path))
+        self.nh.outbox.append("user_data", b"older")
+        self.nh._post = MagicMock()
+        assert self.nh.send_batch(b"newer")
+        self.nh._post.assert_not_called()
+        assert self.nh.outbox.pending() == 2
+
+    def test_replay_record_retries_only_transient_failures(self):
+        self.nh._post = MagicMock(return_value=MagicMock(status_code=503, ok=False))
+        assert not self.nh._replay_record("user_data", b"{}", {})
+        self.nh._post.return_value = MagicMock(status_code=400, ok=False)
+        assert self.nh._replay_record("user_data", b"{}", {})
+        self.nh._post.return_value = MagicMock(status_code=200, ok=True)
+        assert self.nh._replay_record("user_data", b"{}", {})
+
+
+class TestResilience:
+    def setup_method(self, method):
+        self.nh = NetworkHandler()
+        self.nh.set_mock_mode(True)  # skip the warm-up request
+        self.nh.connect(self.nh.endpoint)
+        self.nh.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.001)
+
+    def teardown_method(self, method):
+        self.nh.disconnect()
+
+    def test_idempotent_call_is_retried(self):
+        ok = MagicMock(status_code=200)
+        self.nh.session.post = MagicMock(side_effect=[requests.exceptions.ConnectionError("reset"), ok])
+        response = self.nh._post("user_data", data=b"{}", headers={"Idempotency-Key": "k"})
+        assert response is ok
+        assert self.nh.status()["retries"] == 1
+
+    def test_non_idempotent_call_is_sent_once(self):
+        self.nh.session.post = MagicMock(side_effect=requests.exceptions.ConnectionError("reset"))
+        with pytest.raises(requests.exceptions.ConnectionError):
+            self.nh._post("request_new_mediator", data=b"{}")
+        assert self.nh.session.post.call_count == 1
+
+    def test_server_errors_are_retried_then_returned(self):
+        self.nh.session.post = MagicMock(return_value=MagicMock(status_code=503))
+        response = self.nh._post("user_data", data=b"{}", headers={"Idempotency-Key": "k"})
+        assert response.status_code == 503
+        assert self.nh.session.post.call_count == 3
+
+    def test_attempt_timeout_is_capped_by_the_deadline(self):
+        self.nh.session.post = MagicMock(return_value=MagicMock(status_code=200))
+        self.nh._post("request_new_mediator", deadline=1.0, data=b"{}")
+        connect, read = self.nh.session.post.call_args.kwargs["timeout"]
+        assert connect <= 1.0 and read <= 1.0
+
+    def test_expired_deadline_fails_without_sending(self):
+        self.nh.session.post = MagicMock()
+        with pytest.raises(requests.exceptions.Timeout):
+            self.nh._post("user_data", deadline=0, data=b"{}")
+        self.nh.session.post.assert_not_called()
+        assert self.nh.status()["deadlines_exceeded"] == 1
+
+    def test_open_circuit_fails_fast(self):
+        self.nh.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+        self.nh.session.post = MagicMock(side_effect=requests.exceptions.ConnectionError("down"))
+        for _ in range(2):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                self.nh._post("request_new_mediator", data=b"{}")
+        with pytest.raises(CircuitOpenError):
+            self.nh._post("request_new_mediator", data=b"{}")
+        assert self.nh.session.post.call_count == 2
+        assert self.nh.status()["circuit"]["state"] == "open"
+
+
+class TestCircuitBreaker:
+    def test_half_open_trial_closes_or_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+        breaker.record_failure()
+        assert breaker.state == "half-open"
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # only one trial call at a time
+        breaker.record_failure()
+        assert breaker.stats()["opened"] == 2
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_retry_delays_are_jittered_and_bounded(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+        delays = [policy.delay(attempt) for attempt in range(1, 10)]
+        assert all(0 <= d <= 0.3 for d in delays)
+
+
+class TestMediatorWireFormat:
+    @pytest.fixture(autouse=True)
+    def setup_handler(self, tmp_path):
+        self.nh = NetworkHandler()
+        self.nh.mediator_cache.directory = str(tmp_path)
+        self.nh._post = MagicMock()
+
+    def test_swap_advertises_binary_frames(self):
+        self.nh.request_mediator_swap(MagicMock())
+        accept = self.nh._post.call_args.kwargs["headers"]["Accept"]
+        assert accept.startswith(FRAME_CONTENT_TYPE)
+
+    def test_frame_response_is_kept_binary(self):
+        frame = encode_frame(9, FeedForwardNetwork([-1], [0], [(0, sigmoid_activation, sum_aggregation, 0.0, 1.0, [(-1, 1.0)])]), "hi")
+        response = MagicMock(status_code=200, headers={"Content-Type": FRAME_CONTENT_TYPE}, content=frame)
+        data = self.nh.parse_mediator_response(response)
+        assert data.frame == frame
+        assert data.message == "hi"
+        response.json.assert_not_called()
+
+    def test_json_response_falls_back_to_the_genome_schema(self):
+        response = MagicMock(status_code=200, headers={"Content-Type": "application/json"},
+                             content=b'{"genome": {"genome_id": 4}, "message": "ok"}')
+        data = self.nh.parse_mediator_response(response)
+        assert data.genome == {"genome_id": 4} and data.frame is None
+        assert self.nh.mediator_cache.etag_for(4) == data.etag
+
+    def test_repeat_assignment_is_a_conditional_hit(self):
+        frame = encode_frame(9, FeedForwardNetwork([-1], [0], [(0, sigmoid_activation, sum_aggregation, 0.0, 1.0, [(-1, 1.0)])]))
+        first = self.nh.parse_mediator_response(
+            MagicMock(status_code=200, headers={"Content-Type": FRAME_CONTENT_TYPE}, content=frame))
+        self.nh.request_mediator_swap(MagicMock())
+        assert self.nh._post.call_args.kwargs["headers"]["If-None-Match"] == first.etag
+        again = self.nh.parse_mediator_response(MagicMock(status_code=304, headers={"ETag": first.etag}, content=b""))
+        assert again.frame == frame
+        assert self.nh.mediator_cache.etag_for(9) == first.etag
+        assert self.nh.mediator_cache.stats()["hits"] == 1
+
+    def test_not_modified_for_unknown_entry_is_an_error(self):
+        with pytest.raises(ValueError):
+            self.nh.parse_mediator_response(MagicMock(status_code=304, headers={"ETag": '"gone"'}, content=b""))
+
+
+class TestMockServer:
+    @pytest.fixture(autouse=True)
+    def setup_handler(self, tmp_path):
+        self.nh = NetworkHandler()
+        self.nh.set_mock_mode(True)
+        self.nh.configure({"mediator_cache": {"directory": str(tmp_path)}, "mock_server": {"population": 2}})
+        self.blank = UserData(genome_id=0, time_since_startup=0.0, user_rating=0)
+        yield
+        self.nh.stop()
+
+    def test_mock_mode_serves_real_mediators(self):
+        self.nh.start()
+        response = self.nh.request_mediator_swap(self.blank)
+        assert response.status_code == 200
+        genome_id, network = decode_frame(self.nh.parse_mediator_response(response).frame)
+        assert genome_id == 1
+        assert len(network.activate([0.1, 0.2, 0.3])) == 4
+
+    def test_repeat_genome_is_not_modified(self):
+        self.nh.start()
+        first = [self.nh.fetch_mediator(self.blank) for _ in range(2)]
+        again = [self.nh.fetch_mediator(self.blank) for _ in range(2)]
+        assert [m.frame for m in again] == [m.frame for m in first]
+        assert self.nh.mock_server.stats()["not_modified"] == 2
+
+    def test_json_only_server_falls_back_to_the_genome_schema(self):
+        self.nh.mock_server_config = {"binary_frames": False}
+        self.nh.start()
+        mediator_data = self.nh.fetch_mediator(self.blank)
+        assert mediator_data.frame is None and not mediator_data.new_mediator
+        assert decode_genome(mediator_data.genome)[0] == mediator_data.genome["genome_id"]
+
+    def test_uploads_reach_the_mock_server(self):
+        self.nh.start()
+        assert self.nh.send_data({"genome_id": 1})["status"] == "success"
+        assert self.nh.send_batch(gzip.compress(b'[{"a": 1}, {"b": 2}]'))
+        assert self.nh.mock_server.stats()["records"] == 3
+
+    def test_injected_latency_delays_requests(self):
+        self.nh.mock_server_config = {"latency": 0.1}
+        self.nh.start()
+        start = time.monotonic()
+        self.nh.fetch_mediator(self.blank)
+        assert time.monotonic() - start >= 0.1
+
+
+class TestPushChannel:
+    @pytest.fixture(autouse=True)
+    def setup_handler(self, tmp_path):
+        self.nh = NetworkHandler()
+        self.nh.set_mock_mode(True)
+        self.nh.configure({
+            "mediator_cache": {"directory": str(tmp_path)},
+            "mock_server": {"population": 3},
+            "push": {"enabled": True, "base_delay": 0.05, "max_delay": 0.1},
+        })
+        self.pushed = []
+        self.nh.set_push_listener(self.pushed.append)
+        self.nh.start()
+        assert wait_for(lambda: self.nh.push_channel.connects == 1)
+        yield
+        self.nh.stop()
+
+    def test_pushed_mediator_reaches_the_listener_and_cache(self):
+        self.nh.mock_server.push_mediator(1)
+        assert wait_for(lambda: self.pushed)
+        genome_id, _ = decode_frame(self.pushed[0].frame)
+        assert genome_id == 2
+        assert self.nh.mediator_cache.etag_for(2) == self.pushed[0].etag
+
+    def test_stream_resumes_after_reconnect(self):
+        self.nh.mock_server.push_mediator(0)
+        assert wait_for(lambda: len(self.pushed) == 1)
+        self.nh.mock_server.drop_push_clients()
+        self.nh.mock_server.push_mediator(1)  # published while the client is away
+        assert wait_for(lambda: len(self.pushed) == 2)
+        assert self.nh.push_channel.connects == 2
+        assert self.nh.push_channel.last_event_id == "2"
+        assert [decode_frame(m.frame)[0] for m in self.pushed] == [1, 2]
+
+    def test_invalidation_drops_the_cached_genome(self):
+        self.nh.mock_server.push_mediator(0)
+        assert wait_for(lambda: self.pushed)
+        self.nh.mock_server.push_invalidation(1)
+        assert wait_for(lambda: self.nh.mediator_cache.etag_for(1) is None)